@@ -1,18 +1,106 @@
 from .basis_reduction_2d import reduce_2d_basis
+from .basis_reduction_2d import reduce_2d_bases
 from .lll import lll_reduce
+from .lll import lll_reduce_fp
+from .lll import basis_quality
+from .bkz import bkz_reduce
+from .checkpoint import lll_reduce_budgeted
+from .checkpoint import lll_resume
+from .parallel import lll_reduce_many
+from .solver import babai_nearest_plane
+from .solver import shortest_vector
+from .solver import closest_vector
+from .solver import closest_vectors
+from .sieve import gauss_sieve
+from .ring import ring_multiply
+from .ring import ring_inverse
+from .ring import ring_multiply_many
+from .ring import SparseTernary
+from .ring import ProductForm
 from .utils import are_bases_equivalent
 from .utils import are_bases_equal_2d
 from .ntru import ntru_generate_keys
 from .ntru import ntru_encryption
 from .ntru import ntru_decryption
+from .ntru import ntru_encryption_many
+from .ntru import ntru_decryption_many
+from .keys import NTRUPublicKey
+from .keys import NTRUPrivateKey
+from .keys import load_public_key
+from .keys import load_private_key
+from .keygen import ntru_random_keys
+from .keygen import ntru_random_keys_many
+from .stream import ntru_encrypt_stream
+from .stream import ntru_decrypt_stream
+from .stream import ntru_encrypt_file
+from .stream import ntru_decrypt_file
+from .serialization import public_key_to_bytes
+from .serialization import public_key_from_bytes
+from .serialization import private_key_to_bytes
+from .serialization import private_key_from_bytes
+from .serialization import ciphertexts_to_bytes
+from .serialization import ciphertexts_from_bytes
+from .serialization import write_ciphertexts
+from .serialization import read_ciphertexts
+from .attack import ntru_lattice_basis
+from .attack import ntru_attack
+from .attack import ntru_attack_sweep
+from .failure import ntru_failure_estimate
+from .coppersmith import coppersmith_lattice
+from .coppersmith import small_roots
+from .coppersmith import rsa_stereotyped_roots
 
 
 __all__ = [
     "reduce_2d_basis",
+    "reduce_2d_bases",
     "lll_reduce",
+    "lll_reduce_fp",
+    "basis_quality",
+    "bkz_reduce",
+    "lll_reduce_budgeted",
+    "lll_resume",
+    "lll_reduce_many",
+    "babai_nearest_plane",
+    "shortest_vector",
+    "closest_vector",
+    "closest_vectors",
+    "gauss_sieve",
+    "ring_multiply",
+    "ring_inverse",
+    "ring_multiply_many",
+    "SparseTernary",
+    "ProductForm",
     "are_bases_equivalent",
     "ntru_encryption",
     "ntru_decryption",
+    "ntru_encryption_many",
+    "ntru_decryption_many",
+    "NTRUPublicKey",
+    "NTRUPrivateKey",
+    "load_public_key",
+    "load_private_key",
+    "ntru_random_keys",
+    "ntru_random_keys_many",
+    "ntru_encrypt_stream",
+    "ntru_decrypt_stream",
+    "ntru_encrypt_file",
+    "ntru_decrypt_file",
+    "public_key_to_bytes",
+    "public_key_from_bytes",
+    "private_key_to_bytes",
+    "private_key_from_bytes",
+    "ciphertexts_to_bytes",
+    "ciphertexts_from_bytes",
+    "write_ciphertexts",
+    "read_ciphertexts",
+    "ntru_lattice_basis",
+    "ntru_attack",
+    "ntru_attack_sweep",
+    "ntru_failure_estimate",
+    "coppersmith_lattice",
+    "small_roots",
+    "rsa_stereotyped_roots",
     "ntru_generate_keys"
 ]
 
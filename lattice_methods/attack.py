@@ -0,0 +1,268 @@
+"""
+Key-recovery lattice attack on NTRU.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+The public key ``h = p * Fq * g`` satisfies ``f * h' = g (mod q)`` for ``h' = h / p``, so
+the private pair ``(f, g)`` is an unusually short vector of the 2N-dimensional lattice
+spanned by the rows of
+
+    [[ I, H' ],
+     [ 0, qI ]]
+
+where ``H'`` is the circulant matrix of ``h'`` (row i holds the coefficients of
+``x^i * h'``). Reducing this basis with LLL (or BKZ for larger N) exposes ``(f, g)`` or
+one of its rotations ``(x^k f, x^k g)``, each of which decrypts like the real key. The
+basis is built directly as a NumPy matrix from the key's coefficient array, every
+candidate row is checked by decrypting test messages, and :func:`ntru_attack_sweep`
+measures the time to break over a range of N, which is the usual way to compare
+parameter sets.
+"""
+
+import time
+
+import numpy as np
+from sympy import Poly
+
+from lattice_methods.keygen import (_RandomStream, _check_parameters, _child_seed, _sample_ternary,
+                                    ntru_random_keys)
+from lattice_methods.keys import NTRUPrivateKey, load_public_key
+from lattice_methods.lll import lll_reduce
+from lattice_methods.ntru import ntru_decryption_many, ntru_encryption_many, x
+from lattice_methods.parallel import _iter_jobs
+from lattice_methods.ring import SparseTernary, ring_inverse
+
+# Number of test messages every candidate key has to decrypt.
+_TEST_MESSAGES = 8
+
+
+def _centered(coeffs, q):
+    """
+    Maps coefficients modulo q to the symmetric range (-q/2, q/2].
+    """
+    coeffs = coeffs % q
+    return np.where(coeffs > q // 2, coeffs - q, coeffs)
+
+
+def _test_ciphertexts(key, seed):
+    """
+    Encrypts random ternary test messages under the public key.
+
+    The blinding polynomials have one coefficient 1 and one -1, so the real key (and its
+    rotations) decrypt the test messages for any parameter set that decrypts at all, and
+    the check does not depend on the decryption failure rate of the parameters.
+    """
+    stream = _RandomStream(seed)
+    N, p = key.N, key.p
+
+    phis = np.array([_sample_ternary(stream, N, 1, 1).coefficients()[::-1]
+                     for _ in range(_TEST_MESSAGES)])
+    digits = np.frombuffer(stream.read(_TEST_MESSAGES * N), dtype=np.uint8)
+    messages = _centered(digits.reshape(_TEST_MESSAGES, N).astype(np.int64) % p, p)
+
+    return messages, ntru_encryption_many(key, phis, messages)
+
+
+def _candidate_key(key, f_coeffs):
+    """
+    Builds a private key from candidate coefficients of f (lowest degree first), or
+    returns None if they are not invertible modulo p.
+    """
+    N, p, q = key.N, key.p, key.q
+    if not f_coeffs.any():
+        return None
+
+    Fp = ring_inverse(f_coeffs, N, p)
+    if Fp is None:
+        return None
+    Fp = [int(c) for c in _centered(Fp, p)[::-1]]
+
+    if np.abs(f_coeffs).max() <= 1:
+        f = SparseTernary.from_coefficients(f_coeffs)
+    else:
+        f = Poly([int(c) for c in f_coeffs[::-1]], x)
+
+    return NTRUPrivateKey(N, p, q, f, Fp)
+
+
+def ntru_lattice_basis(pubkey):
+    """
+    Builds the 2N × 2N NTRU lattice basis ``[[I, H'], [0, qI]]`` of a public key.
+
+    ``H'`` is the circulant matrix of ``h' = h * p^(-1) mod q``; its rows are gathered
+    from the coefficient array of the key with one index computation, so no Python lists
+    are built. The vector ``(f, g)`` of the private polynomials (lowest degree first) is
+    an integer combination of the rows.
+
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+
+    :return: The basis, one vector per row (int64, or Python integers for very large q).
+    :rtype: numpy.ndarray
+
+    :raises ValueError: If p is not invertible modulo q.
+    """
+    key = load_public_key(pubkey)
+    N, p, q = key.N, key.p, key.q
+
+    h = (key.h_coeffs * pow(p, -1, q)) % q
+    rotations = (np.arange(N)[None, :] - np.arange(N)[:, None]) % N
+
+    basis = np.zeros((2 * N, 2 * N), dtype=h.dtype)
+    basis[:N, :N] = np.eye(N, dtype=h.dtype)
+    basis[:N, N:] = h[rotations]
+    basis[N:, N:] = q * np.eye(N, dtype=h.dtype)
+
+    return basis
+
+
+def ntru_attack(pubkey, reducer=lll_reduce, max_candidates=None, seed=0, **kwargs):
+    """
+    Recovers an NTRU private key from the public key by lattice reduction.
+
+    The basis of :func:`ntru_lattice_basis` is reduced with ``reducer``, and the rows of
+    the reduced basis are tried in order as candidates ``(f, g)``: the first half of a
+    row is taken as ``f``, its inverse modulo p is computed and the candidate is
+    accepted if it decrypts all test messages with
+    :func:`lattice_methods.ntru.ntru_decryption_many`.
+
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+    :param reducer: Lattice reduction function, e.g. :func:`lattice_methods.lll.lll_reduce`
+                    (default) or :func:`lattice_methods.bkz.bkz_reduce`.
+    :type reducer: callable
+    :param max_candidates: Number of reduced rows tried; by default all 2N.
+    :type max_candidates: int or None
+    :param seed: Seed of the test messages.
+    :type seed: int or str or bytes
+    :param kwargs: Additional keyword arguments for the reducer, e.g. ``delta`` or
+                   ``block_size``.
+
+    :return: Dictionary containing:
+             - ``'success'`` (bool): Whether a working private key was found.
+             - ``'private_key'`` (NTRUPrivateKey or None): The recovered key.
+             - ``'f'``, ``'g'`` (numpy.ndarray or None): The recovered short vector
+               (lowest degree first).
+             - ``'dimension'`` (int): Dimension of the lattice, 2N.
+             - ``'candidates'`` (int): Number of rows tried.
+             - ``'basis_time'``, ``'reduction_time'``, ``'verification_time'``,
+               ``'time'`` (float): Seconds spent per phase and in total.
+    :rtype: dict
+    """
+    key = load_public_key(pubkey)
+    N = key.N
+    start = time.perf_counter()
+
+    basis = ntru_lattice_basis(key)
+    basis_time = time.perf_counter() - start
+
+    reduced = np.asarray(reducer(basis, **kwargs))
+    reduction_time = time.perf_counter() - start - basis_time
+
+    messages, ciphertexts = _test_ciphertexts(key, seed)
+    result = {"success": False, "private_key": None, "f": None, "g": None,
+              "dimension": 2 * N, "candidates": 0}
+
+    limit = 2 * N if max_candidates is None else min(max_candidates, 2 * N)
+    for row in reduced[:limit]:
+        result["candidates"] += 1
+        candidate = _candidate_key(key, row[:N])
+        if candidate is None:
+            continue
+
+        if np.array_equal(ntru_decryption_many(key, candidate, ciphertexts), messages):
+            result.update(success=True, private_key=candidate, f=row[:N], g=row[N:])
+            break
+
+    total = time.perf_counter() - start
+    result.update(basis_time=basis_time, reduction_time=reduction_time,
+                  verification_time=total - basis_time - reduction_time, time=total)
+    return result
+
+
+def _attack_job(job, p, d, reducer, kwargs):
+    """
+    Generates one random key pair and attacks it (one run of a sweep).
+    """
+    N, q, seed = job
+    pubkey, _ = ntru_random_keys(N, p, q, d=d, seed=seed)
+    result = ntru_attack(pubkey, reducer=reducer, seed=seed, **kwargs)
+    del result["private_key"]
+    return result
+
+
+def ntru_attack_sweep(Ns, p, q, d=None, trials=1, seed=None, workers=None, timeout=None,
+                      reducer=lll_reduce, **kwargs):
+    """
+    Measures the time to break random NTRU keys over a range of ring dimensions.
+
+    For every N, ``trials`` key pairs are generated with
+    :func:`lattice_methods.keygen.ntru_random_keys` and attacked with :func:`ntru_attack`.
+    The runs are distributed over a process pool; a run exceeding ``timeout`` counts as
+    a failure.
+
+    :param Ns: Ring dimensions to test.
+    :type Ns: list[int]
+    :param p: Small modulus.
+    :type p: int
+    :param q: Large modulus, or a function mapping N to the modulus used for it.
+    :type q: int or callable
+    :param d: Weight parameter of the keys, or None for ``N // 3``.
+    :type d: int or None
+    :param trials: Number of keys attacked per N.
+    :type trials: int
+    :param seed: Seed of the keys and test messages, or None for fresh random keys.
+    :type seed: int or str or bytes or None
+    :param workers: Number of worker processes. Defaults to the number of CPUs; with a
+                    single worker everything runs in the calling process.
+    :type workers: int or None
+    :param timeout: Time limit per run in seconds (requires ``signal.setitimer``).
+    :type timeout: float or None
+    :param reducer: Picklable lattice reduction function (see :func:`ntru_attack`).
+    :type reducer: callable
+    :param kwargs: Additional keyword arguments for the reducer.
+
+    :return: One dictionary per N, in order, containing:
+             - ``'N'``, ``'q'``, ``'dimension'`` (int): Parameters and lattice dimension.
+             - ``'trials'``, ``'successes'`` (int): Runs and broken keys.
+             - ``'success_rate'`` (float): Fraction of broken keys.
+             - ``'mean_time'``, ``'median_time'``, ``'max_time'`` (float or None):
+               Time to break over the successful runs.
+             - ``'reduction_time'`` (float or None): Mean time spent in the reducer.
+             - ``'times'`` (list[float or None]): Time of every run (None if timed out).
+    :rtype: list[dict]
+
+    :raises ValueError: If the parameters are invalid for an N.
+    """
+    moduli = [q(N) if callable(q) else q for N in Ns]
+    for N, modulus in zip(Ns, moduli):
+        _check_parameters(N, p, modulus, d)
+
+    jobs = [(N, modulus, None if seed is None else _child_seed(seed, i * trials + t))
+            for i, (N, modulus) in enumerate(zip(Ns, moduli)) for t in range(trials)]
+    results = [result for _, result in _iter_jobs(_attack_job, jobs, workers=workers,
+                                                  timeout=timeout, p=p, d=d, reducer=reducer,
+                                                  kwargs=kwargs)]
+
+    report = []
+    for i, (N, modulus) in enumerate(zip(Ns, moduli)):
+        runs = results[i * trials:(i + 1) * trials]
+        broken = [run["time"] for run in runs if run is not None and run["success"]]
+        finished = [run for run in runs if run is not None]
+
+        report.append({
+            "N": N,
+            "q": modulus,
+            "dimension": 2 * N,
+            "trials": trials,
+            "successes": len(broken),
+            "success_rate": len(broken) / trials,
+            "mean_time": float(np.mean(broken)) if broken else None,
+            "median_time": float(np.median(broken)) if broken else None,
+            "max_time": max(broken) if broken else None,
+            "reduction_time": float(np.mean([run["reduction_time"] for run in finished]))
+            if finished else None,
+            "times": [run["time"] if run is not None else None for run in runs],
+        })
+
+    return report
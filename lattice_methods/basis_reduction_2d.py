@@ -45,18 +45,19 @@ def reduce_2d_basis(basis1, basis2, verbose=False):
 
     while True:
 
-        if np.linalg.norm(basis2) < np.linalg.norm(basis1):
+        if np.dot(basis2, basis2) < np.dot(basis1, basis1):
             basis1, basis2 = basis2, basis1
             continue
 
 
         t = round(np.dot(basis1, basis2) / np.dot(basis1, basis1))
 
-        data.append({
-            'step': steps,
-            'b1': basis1.copy(),
-            'b2': basis2.copy(),
-        })
+        if verbose:
+            data.append({
+                'step': steps,
+                'b1': basis1.copy(),
+                'b2': basis2.copy(),
+            })
 
         steps += 1
 
@@ -66,7 +67,10 @@ def reduce_2d_basis(basis1, basis2, verbose=False):
 
         basis2 = basis2 - t * basis1
 
-    shortest = basis1 if np.linalg.norm(basis1) <= np.linalg.norm(basis2) else basis2
+    if not verbose:
+        return [basis1, basis2]
+
+    shortest = basis1 if np.dot(basis1, basis1) <= np.dot(basis2, basis2) else basis2
 
     ###TODO reducing the basis not includes short vector, might have to remove
     data.append({
@@ -75,4 +79,132 @@ def reduce_2d_basis(basis1, basis2, verbose=False):
         'b2': shortest if np.array_equal(shortest, basis2) else ''
     })
 
-    return data if verbose else [basis1, basis2]
\ No newline at end of file
+    return data
+
+
+def _exact_pairs(bases):
+    """
+    Copies a stack of 2D bases into an array whose dot products are computed exactly.
+
+    Integer entries stay in int64 while all dot products fit, and are promoted to
+    Python integers (``dtype=object``) otherwise.
+    """
+    bases = np.array(bases)
+
+    if bases.ndim != 3 or bases.shape[1:] != (2, 2):
+        raise ValueError("Expected an array of 2D bases with shape (M, 2, 2).")
+
+    if bases.dtype.kind in "iu":
+        bound = int(np.abs(bases).max()) if bases.size else 0
+        bases = bases.astype(object if 2 * bound * bound >= 2 ** 62 else np.int64)
+
+    return bases
+
+
+def _round_quotient(num, den):
+    """
+    Rounds ``num / den`` element-wise to the nearest integer (ties to even, like :func:`round`).
+
+    Integer arrays are divided exactly; ``den`` must be positive.
+    """
+    if num.dtype.kind == "f":
+        return np.rint(num / den)
+
+    q = num // den
+    r = num - q * den
+    return q + ((2 * r > den) | ((2 * r == den) & (q % 2 == 1)))
+
+
+def _gauss_rounds(b1, b2):
+    """
+    Runs Gauss reduction on all pairs ``(b1[i], b2[i])`` at once, in place.
+
+    Every round first swaps the pairs whose second vector is shorter, then subtracts the
+    rounded projection coefficient ``t`` from the pairs where it is nonzero. Pairs with
+    ``t == 0`` are finished and drop out of the following rounds.
+
+    Yields ``(step, active, t)`` after each round's swap, where ``active`` holds the
+    indices of the pairs still being reduced and ``t`` their coefficients.
+    """
+    active = np.arange(len(b1))
+    step = 0
+
+    while active.size:
+        u, v = b1[active], b2[active]
+
+        swap = np.einsum("ij,ij->i", v, v) < np.einsum("ij,ij->i", u, u)
+        u[swap], v[swap] = v[swap], u[swap].copy()
+
+        t = _round_quotient(np.einsum("ij,ij->i", u, v), np.einsum("ij,ij->i", u, u))
+        b1[active], b2[active] = u, v
+
+        yield step, active, t
+
+        moving = t != 0
+        active, u, v, t = active[moving], u[moving], v[moving], t[moving]
+        b2[active] = v - t[:, None] * u
+        step += 1
+
+
+def reduce_2d_bases(bases, verbose=False):
+    """
+    Performs Gauss-style reduction of many 2D lattice bases at once.
+
+    This is the batched form of :func:`reduce_2d_basis`: all bases are reduced together
+    with masked NumPy updates, and in every round only the bases that are not yet
+    reduced are touched. Squared norms and dot products of integer bases are computed
+    exactly (in int64, or with Python integers for large entries), so the result does not
+    depend on floating-point rounding.
+
+    :param bases: Array of shape (M, 2, 2), where ``bases[i]`` holds the two vectors of
+                  the i-th basis as rows.
+    :type bases: numpy.ndarray
+    :param verbose: If True, returns a generator over the reduction steps instead.
+    :type verbose: bool
+
+    :return:
+        If verbose is False, an array of shape (M, 2, 2) with the reduced bases.
+        If verbose is True, a generator that performs the reduction while it is iterated
+        and yields one dictionary per round:
+
+            - 'step' (int): Round index
+            - 'index' (numpy.ndarray): Indices of the bases still being reduced
+            - 'b1' (numpy.ndarray): Their current first vectors
+            - 'b2' (numpy.ndarray): Their current second vectors
+
+        followed by a final ``{'step': '→ reduced', 'bases': reduced}`` entry.
+    :rtype: numpy.ndarray or generator
+
+    :raises ValueError: If the input does not have shape (M, 2, 2).
+
+    .. note::
+       As for :func:`reduce_2d_basis`, the bases must be linearly independent.
+    """
+    bases = _exact_pairs(bases)
+    b1, b2 = bases[:, 0].copy(), bases[:, 1].copy()
+
+    if verbose:
+        return _logged_rounds(b1, b2)
+
+    for _ in _gauss_rounds(b1, b2):
+        pass
+
+    return np.stack([b1, b2], axis=1)
+
+
+def _logged_rounds(b1, b2):
+    """
+    Generator behind ``reduce_2d_bases(..., verbose=True)``; copies only what it yields.
+    """
+    for step, active, _ in _gauss_rounds(b1, b2):
+        yield {
+            'step': step,
+            'index': active,
+            'b1': b1[active],
+            'b2': b2[active],
+        }
+
+    yield {
+        'step': '→ reduced',
+        'bases': np.stack([b1, b2], axis=1),
+    }
@@ -0,0 +1,200 @@
+"""
+Implementation of the BKZ (Block Korkine–Zolotarev) lattice basis reduction algorithm.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+This module provides the Schnorr–Euchner variant of BKZ. The basis is first reduced
+with LLL; each tour then walks over all projected blocks of a given size, finds a
+shortest vector of each block by enumeration and inserts it into the basis whenever
+it is shorter than the current first vector of the block.
+"""
+
+import time
+
+import numpy as np
+
+from lattice_methods.lll import (_as_matrix, _exact_rows, _finish, _gso_quality, _identity,
+                                  _integer_matrix, _reduce_rows)
+from lattice_methods.solver import _enumerate, _gso
+from lattice_methods.utils import _extended_gcd
+
+
+def _insert_vector(rows, U, start, coefficients):
+    """
+    Transforms ``rows[start:start + len(coefficients)]`` unimodularly in place so that its
+    first vector becomes the lattice vector with the given coefficients.
+
+    Neighbouring pairs are combined from the end of the block with 2 × 2 unimodular
+    matrices built from the extended Euclidean algorithm, which moves the whole
+    combination into the first vector without creating linear dependencies. The same
+    operations are applied to the transformation matrix ``U`` (if not None).
+    """
+    x = list(coefficients)
+    g = 0
+    for value in x:
+        g = _extended_gcd(g, value)[0]
+    x = [value // g for value in x]
+
+    for i in range(len(x) - 1, 0, -1):
+        a, b = x[i - 1], x[i]
+        if b == 0:
+            continue
+
+        g, s, t = _extended_gcd(a, b)
+        for matrix in (rows, U):
+            if matrix is None:
+                continue
+            first = matrix[start + i - 1].copy()
+            second = matrix[start + i].copy()
+
+            matrix[start + i - 1] = (a // g) * first + (b // g) * second
+            matrix[start + i] = s * second - t * first
+        x[i - 1], x[i] = g, 0
+
+    if x[0] < 0:
+        rows[start] *= -1
+        if U is not None:
+            U[start] *= -1
+
+
+def _update_gso(rows, mu, B, stop):
+    """
+    Updates the Gram-Schmidt data ``mu``, ``B`` of a basis matrix in place after
+    ``rows[:stop]`` has been transformed unimodularly.
+
+    The prefix still spans the same space, so ``B[i]`` and ``mu[i, j]`` with ``i, j >= stop``
+    do not change. Only the data of the prefix and the coefficients ``mu[i, :stop]`` of the
+    later rows are computed again, from the inner products of all rows with the prefix.
+    """
+    exact = _exact_rows(rows)
+    gram = (exact @ exact[:stop].T).astype(float)
+
+    try:
+        L = np.linalg.cholesky(gram[:stop])
+    except np.linalg.LinAlgError:
+        mu[:], B[:] = _gso(rows)
+        return
+
+    diag = np.diagonal(L)
+    mu[:stop, :stop] = np.tril(L / diag, -1)
+    B[:stop] = diag ** 2
+    if stop < len(B):
+        # The rows of the Cholesky factor below the prefix solve L_s L^T = G[stop:, :stop].
+        mu[stop:, :stop] = np.linalg.solve(L, gram[stop:].T).T / diag
+
+
+def bkz_reduce(basis, block_size, delta=0.99, max_tours=None, time_limit=None, verbose=False,
+               return_transform=False):
+    """
+    Performs BKZ (Block Korkine–Zolotarev) lattice basis reduction.
+
+    The basis is LLL-reduced first with :func:`lattice_methods.lll.lll_reduce`. A tour
+    then processes the projected blocks ``[k, k + block_size)`` for every ``k``: a
+    shortest vector of the block is found by exact enumeration and, if it is shorter than
+    ``delta`` times the current ``b*_k``, it is inserted at position ``k`` and the prefix
+    of the basis up to the block end is LLL-reduced again. The Gram-Schmidt data is kept
+    for the whole tour and only updated for the changed prefix after an insertion. Tours
+    are repeated until a tour makes no change, or until the given number of tours or the
+    time budget is exhausted; a final LLL pass over the whole basis makes the result
+    size-reduced.
+
+    :param basis: A list of NumPy vectors or a 2-D array whose rows are the basis vectors.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+    :param block_size: Block size, at least 2. Larger blocks give shorter vectors at a
+                       cost that grows exponentially with the block size.
+    :type block_size: int
+    :param delta: Lovász parameter for LLL and the insertion threshold. Default is 0.99.
+    :type delta: float
+    :param max_tours: Maximum number of tours, or None to run until no more changes.
+    :type max_tours: int or None
+    :param time_limit: Wall-clock budget in seconds, checked after every block.
+    :type time_limit: float or None
+    :param verbose: If True, also returns the per-tour quality report.
+    :type verbose: bool
+    :param return_transform: If True, also returns the unimodular matrix ``U`` with
+                             ``reduced = U @ basis``.
+    :type return_transform: bool
+
+    :return:
+        The BKZ-reduced basis in the same form as the input (list of vectors or 2-D array),
+        followed by ``U`` if ``return_transform`` is True. If verbose is True, the per-tour
+        report is appended as well, a list of dictionaries, one per tour (the entry with
+        ``'tour': 0`` describes the LLL-reduced input), containing:
+
+            - 'tour' (int): Tour index
+            - 'insertions' (int): Number of vectors inserted during the tour
+            - 'time' (float): Seconds elapsed since the start of the reduction
+            - 'b1_norm' (float): Length of the first basis vector
+            - 'root_hermite_factor' (float): ``(||b_1|| / vol^(1/n))^(1/n)``
+            - 'gsa_slope' (float): Slope of ``log2 ||b*_i||`` over ``i``
+            - 'log_potential' (float): ``log2`` of the LLL potential of the basis
+    :rtype: list[numpy.ndarray] or numpy.ndarray or tuple
+
+    :raises ValueError: If ``block_size`` is smaller than 2.
+
+    .. note::
+       This function assumes all basis vectors are linearly independent.
+    """
+    if block_size < 2:
+        raise ValueError("block_size must be at least 2.")
+
+    start_time = time.perf_counter()
+
+    rows, is_array = _as_matrix(basis)
+    dtype = rows.dtype
+    n = rows.shape[0]
+
+    exact = n > 1 and _exact_rows(rows).dtype == object
+    if exact:
+        rows = _integer_matrix(rows)
+
+    U = _identity(n, rows) if return_transform else None
+
+    if n > 1:
+        _reduce_rows(rows, U, delta, exact)
+
+    mu, B = _gso(rows)
+    tours = [dict(tour=0, insertions=0, time=time.perf_counter() - start_time,
+                  **_gso_quality(0.5 * np.log2(B)))]
+
+    tour = 0
+    out_of_time = False
+
+    while n > 1 and not out_of_time and (max_tours is None or tour < max_tours):
+        tour += 1
+        insertions = 0
+
+        for k in range(n - 1):
+            end = min(k + block_size, n)
+            found = _enumerate(mu[k:end, k:end], B[k:end], delta * B[k])
+
+            if found is not None and any(found[0][1:]):
+                _insert_vector(rows, U, k, found[0])
+                # Row ``end`` is included so that it is size-reduced against the new block;
+                # the rows before ``k`` are unchanged and still reduced.
+                stop = min(end + 1, n)
+                _reduce_rows(rows[:stop], None if U is None else U[:stop], delta, exact, k=max(k, 1))
+                _update_gso(rows, mu, B, stop)
+                insertions += 1
+
+            if time_limit is not None and time.perf_counter() - start_time > time_limit:
+                out_of_time = True
+                break
+
+        tours.append(dict(tour=tour, insertions=insertions,
+                          time=time.perf_counter() - start_time,
+                          **_gso_quality(0.5 * np.log2(B))))
+
+        if insertions == 0:
+            break
+
+    # The rows after a reduced prefix are not size-reduced against its new vectors.
+    if n > 1:
+        _reduce_rows(rows, U, delta, exact)
+
+    result = _finish(rows, U, is_array, dtype)
+
+    if not verbose:
+        return result
+
+    return (*result, tours) if return_transform else (result, tours)
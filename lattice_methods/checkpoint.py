@@ -0,0 +1,225 @@
+"""
+Time-budgeted LLL reduction with checkpoints on disk.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+This module runs the LLL engines of :mod:`lattice_methods.lll` under a wall-clock or
+iteration budget. When the budget is exhausted the partially reduced basis is returned
+(every intermediate basis of LLL generates the same lattice and only gets better), and
+the run can be continued later. During the run the complete state — the basis matrix,
+the current index ``k``, the transformation matrix and the parameters — is written to a
+JSON checkpoint at regular intervals, so a killed process can be resumed from the last
+checkpoint with :func:`lll_resume`.
+"""
+
+import json
+import os
+import time
+from fractions import Fraction
+
+import numpy as np
+
+from lattice_methods.lll import (_as_matrix, _exact_rows, _finish, _identity, _integer_matrix,
+                                 _reduce_rows)
+
+_CHECKPOINT_VERSION = 1
+
+
+def _write_checkpoint(path, state):
+    """
+    Writes a checkpoint atomically: a reader never sees a partially written file.
+    """
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+
+def _read_checkpoint(path):
+    """
+    Reads a checkpoint written by :func:`_write_checkpoint`.
+
+    :raises ValueError: If the file is not a checkpoint of a supported version.
+    """
+    with open(path) as f:
+        state = json.load(f)
+
+    if not isinstance(state, dict) or state.get("version") != _CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a supported LLL checkpoint.")
+
+    return state
+
+
+def _parse_delta(text):
+    """
+    Restores a Lovász parameter saved with ``str(delta)``.
+    """
+    return Fraction(text) if "/" in text else float(text)
+
+
+def _run(rows, U, state, time_limit, max_iterations, checkpoint_path, checkpoint_interval):
+    """
+    Continues an LLL run on ``rows`` (and ``U``) from the index stored in ``state``.
+
+    The run is interrupted when the time or iteration budget is exhausted. The state is
+    saved to ``checkpoint_path`` every ``checkpoint_interval`` seconds and when the run
+    ends.
+
+    :return: True if the basis is fully reduced, False if the budget ran out first.
+    """
+    start_time = time.perf_counter()
+    last_checkpoint = start_time
+    start_iterations = state["iterations"]
+
+    def save(k):
+        state.update(basis=rows.tolist(), k=k,
+                     transform=None if U is None else U.tolist())
+        _write_checkpoint(checkpoint_path, state)
+
+    def stop(k):
+        nonlocal last_checkpoint
+        now = time.perf_counter()
+
+        if max_iterations is not None and state["iterations"] - start_iterations >= max_iterations:
+            return True
+        if time_limit is not None and now - start_time >= time_limit:
+            return True
+
+        if checkpoint_path is not None and now - last_checkpoint >= checkpoint_interval:
+            save(k)
+            last_checkpoint = now
+
+        state["iterations"] += 1
+        return False
+
+    n = rows.shape[0]
+    k = state["k"]
+
+    if n > 1 and k < n:
+        k = _reduce_rows(rows, U, _parse_delta(state["delta"]), state["exact"], k, stop)
+
+    state["k"] = k
+
+    if checkpoint_path is not None:
+        save(k)
+
+    return k >= n
+
+
+def lll_reduce_budgeted(basis, delta=0.75, exact=None, return_transform=False, time_limit=None,
+                        max_iterations=None, checkpoint_path=None, checkpoint_interval=60.0):
+    """
+    Performs LLL reduction under a time or iteration budget, with optional checkpoints.
+
+    The reduction is the same as in :func:`lattice_methods.lll.lll_reduce`, but it is
+    interrupted once ``time_limit`` seconds or ``max_iterations`` iterations of the main
+    loop have been spent. The basis reached at that point is returned together with a
+    flag telling whether the reduction is complete.
+
+    If ``checkpoint_path`` is given, the state of the run is saved there as JSON every
+    ``checkpoint_interval`` seconds and once more when the run ends, so that it can be
+    continued with :func:`lll_resume`. The file is replaced atomically.
+
+    :param basis: A list of NumPy vectors or a 2-D array whose rows are the basis vectors.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+    :param delta: Lovász parameter, typically in the range (0.5, 1). Default is 0.75.
+    :type delta: float or fractions.Fraction
+    :param exact: True for the integral mode, False for the floating-point mode, None to
+                  choose automatically (see :func:`lattice_methods.lll.lll_reduce`).
+    :type exact: bool or None
+    :param return_transform: If True, also returns the unimodular matrix ``U`` with
+                             ``reduced = U @ basis``.
+    :type return_transform: bool
+    :param time_limit: Wall-clock budget in seconds, or None for no limit.
+    :type time_limit: float or None
+    :param max_iterations: Budget of main-loop iterations, or None for no limit.
+    :type max_iterations: int or None
+    :param checkpoint_path: File to save checkpoints to, or None to disable them.
+    :type checkpoint_path: str or None
+    :param checkpoint_interval: Seconds between two checkpoints. Default is 60.
+    :type checkpoint_interval: float
+
+    :return: A tuple (reduced, done), or (reduced, U, done) if ``return_transform`` is
+             True, where reduced is in the same form as the input and done tells whether
+             the basis is fully LLL-reduced.
+    :rtype: tuple
+
+    :raises ValueError: If the exact mode is requested for a non-integer basis.
+
+    .. note::
+       In floating-point mode a resumed run recomputes the Gram-Schmidt data from the
+       saved basis, so it may take a slightly different path than an uninterrupted run.
+       In exact mode the result is identical.
+    """
+    rows, is_array = _as_matrix(basis)
+    dtype = rows.dtype
+    n = rows.shape[0]
+
+    if exact is None:
+        exact = n > 1 and _exact_rows(rows).dtype == object
+
+    if exact:
+        rows = _integer_matrix(rows)
+
+    U = _identity(n, rows) if return_transform else None
+
+    state = dict(version=_CHECKPOINT_VERSION, delta=str(delta), exact=bool(exact),
+                 is_array=is_array, dtype=rows.dtype.str, output_dtype=dtype.str,
+                 k=1, iterations=0)
+
+    done = _run(rows, U, state, time_limit, max_iterations, checkpoint_path, checkpoint_interval)
+
+    result = _finish(rows, U, is_array, np.dtype(state["output_dtype"]))
+    return (*result, done) if return_transform else (result, done)
+
+
+def lll_resume(checkpoint_path, return_transform=False, time_limit=None, max_iterations=None,
+               checkpoint_interval=60.0):
+    """
+    Continues an LLL reduction from a checkpoint written by :func:`lll_reduce_budgeted`.
+
+    The run starts from the saved basis and index ``k`` with the saved parameters, keeps
+    writing checkpoints to the same file and can again be limited by a budget.
+
+    :param checkpoint_path: The checkpoint file to resume from.
+    :type checkpoint_path: str
+    :param return_transform: If True, also returns the unimodular matrix ``U`` relating
+                             the reduced basis to the original input. Requires that the
+                             transformation was tracked in the interrupted run.
+    :type return_transform: bool
+    :param time_limit: Wall-clock budget in seconds, or None for no limit.
+    :type time_limit: float or None
+    :param max_iterations: Budget of main-loop iterations, or None for no limit.
+    :type max_iterations: int or None
+    :param checkpoint_interval: Seconds between two checkpoints. Default is 60.
+    :type checkpoint_interval: float
+
+    :return: A tuple (reduced, done), or (reduced, U, done) if ``return_transform`` is
+             True, as for :func:`lll_reduce_budgeted`.
+    :rtype: tuple
+
+    :raises ValueError: If the file is not a supported checkpoint, or if the transform
+                        is requested but was not saved.
+    """
+    state = _read_checkpoint(checkpoint_path)
+
+    dtype = np.dtype(state["dtype"])
+    rows = np.array(state["basis"], dtype=dtype)
+    if state["exact"]:
+        rows = _integer_matrix(rows)
+
+    U = None
+    if state["transform"] is not None:
+        U = np.array(state["transform"], dtype=object if dtype == object else np.int64)
+    elif return_transform:
+        raise ValueError("The checkpoint does not contain the transformation matrix.")
+
+    done = _run(rows, U, state, time_limit, max_iterations, checkpoint_path, checkpoint_interval)
+
+    result = _finish(rows, U if return_transform else None, state["is_array"],
+                     np.dtype(state["output_dtype"]))
+    return (*result, done) if return_transform else (result, done)
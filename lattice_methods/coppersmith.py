@@ -0,0 +1,406 @@
+"""
+Small roots of univariate polynomials modulo an integer (Coppersmith's method).
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+Given a polynomial ``f`` of degree ``delta`` and a modulus ``n``, every root ``x0`` of
+``f`` modulo ``n`` with ``|x0| <= X`` is also a root modulo ``n^m`` of the shifted
+polynomials
+
+    g_ij(x) = x^j * n^(m - i) * f(x)^i      (0 <= i < m, 0 <= j < delta)
+    h_k(x)  = x^k * f(x)^m                   (0 <= k < t)
+
+and of all their integer combinations. Following Howgrave-Graham, the coefficient
+vectors of ``g(x X)`` span a lattice whose LLL-reduced rows are polynomials with small
+coefficients; if such a polynomial is short enough, ``x0`` is one of its roots over the
+integers. The lattice is reduced with the exact integral LLL and the integer roots of
+the reduced polynomials are found by Hensel lifting modulo a prime, so no symbolic
+solving is involved.
+
+The RSA attack on stereotyped messages (``m = B + x`` with a known part ``B``, see
+``notebooks/lll_attack.ipynb``) is the case ``f(x) = (B + x)^e - c``;
+:func:`rsa_stereotyped_roots` solves many such instances for one modulus with one shared
+lattice layout.
+"""
+
+import math
+
+import numpy as np
+from sympy import Poly
+
+from lattice_methods.lll import lll_reduce
+from lattice_methods.parallel import _iter_jobs
+
+# Largest lattice dimension tried when m and t are chosen automatically.
+_MAX_DIMENSION = 64
+
+# Primes used to lift integer roots; a simple root is missed only if both divide f'(x0).
+_LIFTING_PRIMES = (1009, 1013)
+
+
+def _coefficients(polynomial):
+    """
+    Converts a polynomial (SymPy Poly or list, highest degree first) into a list of
+    Python integers, lowest degree first.
+
+    :raises ValueError: If a coefficient is not an integer.
+    """
+    if isinstance(polynomial, Poly):
+        polynomial = polynomial.all_coeffs()
+
+    coeffs = [int(c) for c in polynomial[::-1]]
+    if any(c != original for c, original in zip(coeffs, polynomial[::-1])):
+        raise ValueError("The polynomial must have integer coefficients.")
+
+    while len(coeffs) > 1 and coeffs[-1] == 0:
+        coeffs.pop()
+    return coeffs
+
+
+def _multiply(a, b, modulus):
+    """
+    Multiplies two coefficient lists (lowest degree first) modulo an integer.
+    """
+    product = [0] * (len(a) + len(b) - 1)
+    for i, ai in enumerate(a):
+        if ai:
+            for j, bj in enumerate(b):
+                product[i + j] += ai * bj
+    return [c % modulus for c in product]
+
+
+def _evaluate(coeffs, x, modulus=None):
+    """
+    Evaluates a coefficient list (lowest degree first) at x, optionally modulo an integer.
+    """
+    value = 0
+    for c in reversed(coeffs):
+        value = value * x + c
+        if modulus is not None:
+            value %= modulus
+    return value
+
+
+def _monic(coeffs, n):
+    """
+    Scales a polynomial modulo n so that its leading coefficient is 1.
+
+    :raises ValueError: If the leading coefficient is not invertible modulo n.
+    """
+    coeffs = [c % n for c in coeffs]
+    while len(coeffs) > 1 and coeffs[-1] == 0:
+        coeffs.pop()
+
+    if math.gcd(coeffs[-1], n) != 1:
+        raise ValueError("The leading coefficient of the polynomial must be invertible modulo n.")
+
+    inverse = pow(coeffs[-1], -1, n)
+    return [c * inverse % n for c in coeffs]
+
+
+def _log_determinant(delta, m, t, log_n, log_X):
+    """
+    Returns the natural logarithm of the determinant of the lattice for given m and t.
+    """
+    rows = sum((m - i) * log_n + (delta * i + j) * log_X for i in range(m) for j in range(delta))
+    return rows + sum((delta * m + k) * log_X for k in range(t))
+
+
+def _parameters(delta, n, X):
+    """
+    Chooses the smallest lattice (m, t) for which LLL provably finds the roots below X.
+
+    The first reduced vector has norm at most ``2^((D - 1) / 4) * det^(1 / D)``, and a
+    root is guaranteed once that is below ``n^m / sqrt(D)`` (Howgrave-Graham).
+
+    :raises ValueError: If no lattice of dimension up to ``_MAX_DIMENSION`` suffices.
+    """
+    log_n, log_X = math.log(n), math.log(max(X, 1))
+
+    for D in range(delta + 1, _MAX_DIMENSION + 1):
+        for m in range(1, D // delta + 1):
+            t = D - delta * m
+            if t < 1:
+                continue
+            bound = (D - 1) / 4 * math.log(2) + 0.5 * math.log(D)
+            if _log_determinant(delta, m, t, log_n, log_X) / D + bound < m * log_n:
+                return m, t
+
+    raise ValueError(f"The root bound X is too large for lattices of dimension up to {_MAX_DIMENSION}.")
+
+
+def _choose_parameters(delta, n, X, m, t):
+    """
+    Completes the lattice parameters: both chosen by :func:`_parameters` if m is None,
+    ``m = 1`` if only t is given and ``t = delta`` if only m is given.
+    """
+    if m is None:
+        return _parameters(delta, n, X) if t is None else (1, t)
+    return m, delta if t is None else t
+
+
+def _prepare(polynomial, n, X, m, t):
+    """
+    Returns the monic coefficients (lowest degree first) of a polynomial modulo n and
+    the lattice parameters (m, t).
+
+    :raises ValueError: If the polynomial cannot be used (see :func:`coppersmith_lattice`).
+    """
+    coeffs = _monic(_coefficients(polynomial), n)
+    if len(coeffs) < 2:
+        raise ValueError("The polynomial must not be constant modulo n.")
+
+    return (coeffs,) + _choose_parameters(len(coeffs) - 1, n, X, m, t)
+
+
+def _shifts(delta, m, t):
+    """
+    Returns the shifts (i, j) of the lattice rows ``x^j * n^(m - i) * f^i``, with the
+    rows ``x^k * f^m`` given as ``(m, k)``.
+    """
+    return [(i, j) for i in range(m) for j in range(delta)] + [(m, k) for k in range(t)]
+
+
+def _layout(delta, n, X, m, t):
+    """
+    Returns the part of the lattice that does not depend on the coefficients of f: the
+    shifts (i, j) of the rows, the weights ``n^(m - i) * X^k`` of their entries and the
+    moduli ``n^i`` of the powers ``f^i``.
+    """
+    D = delta * m + t
+    scales = [X ** k for k in range(D)]
+    moduli = [n ** i for i in range(m + 1)]
+
+    shifts = _shifts(delta, m, t)
+    weights = np.zeros((D, D), dtype=object)
+    for row, (i, j) in enumerate(shifts):
+        for k in range(j, j + delta * i + 1):
+            weights[row, k] = moduli[m - i] * scales[k]
+
+    return shifts, weights, moduli
+
+
+def _lattice(coeffs, n, X, m, t, layout=None):
+    """
+    Builds the lattice basis of a monic polynomial (lowest degree first), with the layout
+    of :func:`_layout` if it is given.
+    """
+    shifts, weights, moduli = layout or _layout(len(coeffs) - 1, n, X, m, t)
+
+    powers = [[1]]
+    for _ in range(m):
+        powers.append(_multiply(powers[-1], coeffs, moduli[m]))
+
+    # n^(m - i) * f^i only matters modulo n^m, so f^i is reduced modulo n^i.
+    basis = np.zeros(weights.shape, dtype=object)
+    for row, (i, j) in enumerate(shifts):
+        for k, c in enumerate(powers[i]):
+            basis[row, k + j] = weights[row, k + j] * (c % moduli[i] if i else c)
+
+    return basis
+
+
+def _integer_roots(coeffs, bound):
+    """
+    Finds the integer roots ``x`` with ``|x| <= bound`` of an integer polynomial (lowest
+    degree first).
+
+    The roots modulo a small prime are found by evaluating at every residue; every simple
+    root is lifted by Newton (Hensel) iteration to a modulus larger than ``2 * bound`` and
+    checked over the integers. Multiple roots are roots of the derivative and are found
+    recursively.
+    """
+    while len(coeffs) > 1 and coeffs[-1] == 0:
+        coeffs = coeffs[:-1]
+    if len(coeffs) < 2:
+        return set()
+
+    content = 0
+    for c in coeffs:
+        content = math.gcd(content, c)
+    coeffs = [c // content for c in coeffs]
+    derivative = [k * c for k, c in enumerate(coeffs)][1:]
+
+    roots = set()
+    for prime in _LIFTING_PRIMES:
+        residues = np.arange(prime, dtype=np.int64)
+        values = np.zeros(prime, dtype=np.int64)
+        for c in reversed(coeffs):
+            values = (values * residues + c % prime) % prime
+
+        for start in np.flatnonzero(values == 0):
+            slope = _evaluate(derivative, int(start), prime)
+            if slope == 0:
+                continue
+
+            root, modulus = int(start), prime
+            while modulus <= 2 * bound:
+                modulus *= modulus
+                slope = _evaluate(derivative, root, modulus)
+                root = (root - _evaluate(coeffs, root, modulus) * pow(slope, -1, modulus)) % modulus
+
+            root = root - modulus if root > modulus // 2 else root
+            if abs(root) <= bound and _evaluate(coeffs, root) == 0:
+                roots.add(root)
+
+    roots |= {r for r in _integer_roots(derivative, bound) if _evaluate(coeffs, r) == 0}
+    return roots
+
+
+def _roots_from_basis(reduced, coeffs, n, X, m):
+    """
+    Collects the roots of the reduced polynomials that are roots of f modulo n.
+
+    All rows that satisfy Howgrave-Graham's bound ``||b|| < n^m / sqrt(D)`` are tried
+    (and the first row in any case).
+    """
+    D = len(reduced)
+    roots = set()
+
+    for index, row in enumerate(reduced):
+        row = [int(c) for c in row]
+        if index > 0 and sum(c * c for c in row) * D >= n ** (2 * m):
+            break
+
+        polynomial = [c // X ** k for k, c in enumerate(row)]
+        roots |= {r for r in _integer_roots(polynomial, X) if _evaluate(coeffs, r, n) == 0}
+
+    return sorted(roots)
+
+
+def coppersmith_lattice(polynomial, n, X, m=None, t=None):
+    """
+    Builds the Howgrave-Graham lattice for the small roots of a polynomial modulo n.
+
+    The polynomial is first made monic modulo n. Row ``x^j * n^(m - i) * f^i`` (and
+    ``x^k * f^m``) holds the coefficients of that polynomial evaluated at ``x X``, so the
+    basis is lower triangular with dimension ``deg(f) * m + t``.
+
+    :param polynomial: The polynomial, as SymPy Poly or list of integer coefficients
+                       (highest degree first).
+    :type polynomial: sympy.Poly or list[int]
+    :param n: The modulus.
+    :type n: int
+    :param X: Bound on the absolute value of the roots.
+    :type X: int
+    :param m: Multiplicity of the roots (power of n). Chosen automatically with ``t``
+              if None.
+    :type m: int or None
+    :param t: Number of extra shifts ``x^k * f^m``. Chosen automatically with ``m`` if
+              None; defaults to ``deg(f)`` if only ``m`` is given.
+    :type t: int or None
+
+    :return: Tuple (basis, (m, t)) with the basis as 2-D array of Python integers, one
+             vector per row.
+    :rtype: tuple[numpy.ndarray, tuple[int, int]]
+
+    :raises ValueError: If the polynomial is constant or its leading coefficient is not
+                        invertible modulo n, or if no lattice of dimension up to 64
+                        works for the bound X.
+    """
+    coeffs, m, t = _prepare(polynomial, n, X, m, t)
+    return _lattice(coeffs, n, X, m, t), (m, t)
+
+
+def small_roots(polynomial, n, X, m=None, t=None, delta=0.75):
+    """
+    Finds all roots ``x0`` of a polynomial modulo n with ``|x0| <= X`` (Coppersmith).
+
+    The lattice of :func:`coppersmith_lattice` is reduced with the exact integral LLL of
+    :func:`lattice_methods.lll.lll_reduce`; the integer roots of the short reduced
+    polynomials are computed and kept if they are roots of the polynomial modulo n.
+    With the automatic choice of m and t, all roots below X are found; the method works
+    up to about ``X = n^(1 / deg(f))``.
+
+    :param polynomial: The polynomial, as SymPy Poly or list of integer coefficients
+                       (highest degree first).
+    :type polynomial: sympy.Poly or list[int]
+    :param n: The modulus.
+    :type n: int
+    :param X: Bound on the absolute value of the roots.
+    :type X: int
+    :param m: Multiplicity parameter, as for :func:`coppersmith_lattice`.
+    :type m: int or None
+    :param t: Number of extra shifts, as for :func:`coppersmith_lattice`.
+    :type t: int or None
+    :param delta: Lovász parameter of the reduction.
+    :type delta: float or fractions.Fraction
+
+    :return: The roots, in increasing order.
+    :rtype: list[int]
+
+    :raises ValueError: If the lattice cannot be built (see :func:`coppersmith_lattice`).
+    """
+    coeffs, m, t = _prepare(polynomial, n, X, m, t)
+    reduced = lll_reduce(_lattice(coeffs, n, X, m, t), delta=delta, exact=True)
+
+    return _roots_from_basis(reduced, coeffs, n, X, m)
+
+
+def _stereotyped_polynomial(c, B, n, e):
+    """
+    Returns the monic coefficients (lowest degree first) of ``(B + x)^e - c`` modulo n.
+    """
+    coeffs = [math.comb(e, k) * pow(B, e - k, n) % n for k in range(e + 1)]
+    coeffs[0] = (coeffs[0] - c) % n
+    return coeffs
+
+
+def _stereotyped_root(instance, n, e, X, m, t, delta, layout):
+    """
+    Solves one stereotyped-message instance (c, B) with the shared lattice layout and
+    returns the message, or None.
+    """
+    c, B = instance
+    coeffs = _stereotyped_polynomial(c, B, n, e)
+    reduced = lll_reduce(_lattice(coeffs, n, X, m, t, layout), delta=delta, exact=True)
+
+    for x0 in _roots_from_basis(reduced, coeffs, n, X, m):
+        if pow(B + x0, e, n) == c % n:
+            return B + x0
+    return None
+
+
+def rsa_stereotyped_roots(n, e, instances, X, m=None, t=None, delta=0.75, workers=None,
+                          chunksize=None):
+    """
+    Recovers RSA messages of the form ``B + x`` with a known part B and a small unknown x.
+
+    Every instance ``(c, B)`` with ciphertext ``c = (B + x)^e mod n`` gives the monic
+    polynomial ``(B + x)^e - c``. All instances share the modulus, the degree e and the
+    bound X, so the lattice parameters and layout (shifts and the weights built from the
+    powers of n and of X) are computed once and passed to the workers; only the
+    coefficients of ``f`` change between instances. The instances are solved in a
+    process pool.
+
+    :param n: RSA modulus.
+    :type n: int
+    :param e: Public exponent.
+    :type e: int
+    :param instances: Pairs (c, B) of ciphertext and known part of the message.
+    :type instances: list[tuple[int, int]]
+    :param X: Bound on the unknown part, ``|x| <= X``.
+    :type X: int
+    :param m: Multiplicity parameter, as for :func:`coppersmith_lattice`.
+    :type m: int or None
+    :param t: Number of extra shifts, as for :func:`coppersmith_lattice`.
+    :type t: int or None
+    :param delta: Lovász parameter of the reduction.
+    :type delta: float or fractions.Fraction
+    :param workers: Number of worker processes. Defaults to the number of CPUs; with a
+                    single worker everything runs in the calling process.
+    :type workers: int or None
+    :param chunksize: Number of instances sent to a worker at once.
+    :type chunksize: int or None
+
+    :return: The recovered message ``B + x`` of every instance, or None if no small
+             root was found.
+    :rtype: list[int or None]
+
+    :raises ValueError: If no lattice of dimension up to 64 works for the bound X.
+    """
+    m, t = _choose_parameters(e, n, X, m, t)
+    layout = _layout(e, n, X, m, t)
+    jobs = _iter_jobs(_stereotyped_root, instances, workers=workers, chunksize=chunksize,
+                      n=n, e=e, X=X, m=m, t=t, delta=delta, layout=layout)
+    return [message for _, message in jobs]
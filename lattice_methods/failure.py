@@ -0,0 +1,213 @@
+"""
+Monte Carlo estimation of the NTRU decryption failure rate.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+Decryption computes ``a = f * e = p * phi * g + f * m`` modulo q and centers it; it
+recovers the message only if the centered coefficients equal those of ``a`` over the
+integers. This module samples the private polynomials ``f`` (``d + 1`` ones, ``d``
+minus ones), ``g`` and ``phi`` (``d`` of each) and uniformly random messages ``m`` in
+batches, computes ``a`` for a whole batch with one FFT pass, and counts the samples
+whose centering goes wrong exactly as :func:`lattice_methods.ntru.ntru_decryption_many`
+would. Batches run in a process pool, and the partial estimates (failure probability
+with a Wilson confidence interval and the distribution of the coefficients of ``a``)
+can be streamed as the batches complete.
+
+.. note::
+   The samples are drawn from NumPy's PCG64 generator, which is adequate for a
+   statistical estimate but not for key generation. Whether ``f`` is invertible does
+   not change the distribution of ``a``, so it is not checked.
+"""
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+from lattice_methods.keygen import _check_parameters
+from lattice_methods.parallel import _iter_jobs
+from lattice_methods.ring import _fold, _spectrum_size
+
+# Number of samples drawn and multiplied at once by a worker.
+_BATCH_SIZE = 2048
+
+
+def _ternary_many(rng, count, N, ones, minus_ones):
+    """
+    Samples ``count`` ternary polynomials with the given numbers of 1 and -1 coefficients.
+    """
+    keys = rng.random((count, N))
+    order = np.argpartition(keys, (ones, ones + minus_ones), axis=1) if ones + minus_ones < N \
+        else np.argsort(keys, axis=1)
+    order = order[:, :ones + minus_ones]
+    rows = np.arange(count)[:, None]
+
+    polynomials = np.zeros((count, N), dtype=np.int64)
+    polynomials[rows, order[:, :ones]] = 1
+    polynomials[rows, order[:, ones:]] = -1
+    return polynomials
+
+
+def _coefficient_bound(N, p, d):
+    """
+    Bounds the absolute value of the coefficients of ``a = p * phi * g + f * m``.
+    """
+    return p * 2 * d + (2 * d + 1) * (p // 2)
+
+
+def _failure_batch(job, N, p, q, d):
+    """
+    Samples one batch and returns its failure count and coefficient statistics.
+    """
+    seed, count = job
+    rng = np.random.default_rng(seed)
+
+    f = _ternary_many(rng, count, N, d + 1, d)
+    g = _ternary_many(rng, count, N, d, d)
+    phi = _ternary_many(rng, count, N, d, d)
+    m = rng.integers(0, p, (count, N)) - p // 2
+
+    size = _spectrum_size(N)
+    spectra = [np.fft.rfft(poly, size, axis=-1) for poly in (phi, g, f, m)]
+    product = np.fft.irfft(p * spectra[0] * spectra[1] + spectra[2] * spectra[3], size, axis=-1)
+    a = _fold(np.rint(product[:, :2 * N - 1]).astype(np.int64), N)
+
+    residues = a % q
+    outside = (residues > q / 2).any(axis=1)
+    centered = np.where(outside[:, None], (residues + q // 2) % q - q // 2, residues)
+
+    bound = _coefficient_bound(N, p, d)
+    return {
+        "samples": count,
+        "failures": int((centered != a).any(axis=1).sum()),
+        "coefficients": np.bincount((a + bound).ravel(), minlength=2 * bound + 1),
+        "maxima": np.bincount(np.abs(a).max(axis=1), minlength=bound + 1),
+    }
+
+
+def _wilson_interval(failures, samples, confidence):
+    """
+    Returns the Wilson score interval of a binomial proportion.
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    phat = failures / samples
+    denominator = 1 + z * z / samples
+    center = (phat + z * z / (2 * samples)) / denominator
+    spread = z * math.sqrt(phat * (1 - phat) / samples + z * z / (4 * samples * samples)) / denominator
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+def _report(totals, N, p, q, d, confidence):
+    """
+    Turns the accumulated batch statistics into an estimate.
+    """
+    bound = _coefficient_bound(N, p, d)
+    samples, failures = totals["samples"], totals["failures"]
+
+    values = np.arange(-bound, bound + 1)
+    counts = totals["coefficients"]
+    mean = float(values @ counts / counts.sum())
+    std = float(math.sqrt(((values - mean) ** 2) @ counts / counts.sum()))
+
+    # Union bound over the N coefficients with a normal approximation of one coefficient;
+    # useful once failures are too rare to be observed.
+    scale = std * math.sqrt(2)
+    tail = (math.erfc((q / 2 - mean) / scale) + math.erfc((q / 2 + mean) / scale)) / 2 if std else 0.0
+
+    return {
+        "samples": samples,
+        "failures": failures,
+        "probability": failures / samples,
+        "confidence": confidence,
+        "interval": _wilson_interval(failures, samples, confidence),
+        "gaussian_estimate": min(1.0, N * tail),
+        "mean": mean,
+        "std": std,
+        "coefficient_counts": {int(v): int(c) for v, c in zip(values, counts) if c},
+        "max_counts": {int(v): int(c) for v, c in enumerate(totals["maxima"]) if c},
+    }
+
+
+def _estimates(N, p, q, d, samples, batch_size, seed, workers, confidence):
+    """
+    Yields the estimate after every completed batch.
+    """
+    batches = [min(batch_size, samples - start) for start in range(0, samples, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+
+    totals = None
+    jobs = _iter_jobs(_failure_batch, list(zip(seeds, batches)), workers=workers, chunksize=1,
+                      ordered=False, N=N, p=p, q=q, d=d)
+    for _, batch in jobs:
+        if totals is None:
+            totals = batch
+        else:
+            for name in totals:
+                totals[name] = totals[name] + batch[name]
+
+        yield _report(totals, N, p, q, d, confidence)
+
+
+def ntru_failure_estimate(N, p, q, samples=1000000, d=None, batch_size=_BATCH_SIZE, seed=None,
+                          workers=None, confidence=0.95, stream=False):
+    """
+    Estimates the probability that NTRU decryption fails for a parameter set.
+
+    Every sample draws ``f`` with ``d + 1`` coefficients 1 and ``d`` coefficients -1,
+    ``g`` and ``phi`` with ``d`` of each, and a message with uniformly random
+    coefficients in the symmetric range modulo p. The coefficients of
+    ``a = p * phi * g + f * m`` are computed over the integers for a whole batch at once;
+    a sample fails if centering ``a mod q`` does not give back ``a``. The batches are
+    distributed over a process pool.
+
+    :param N: Degree of the polynomials and ring dimension.
+    :type N: int
+    :param p: Small modulus.
+    :type p: int
+    :param q: Large modulus, coprime to p.
+    :type q: int
+    :param samples: Number of sampled (f, g, phi, m) tuples.
+    :type samples: int
+    :param d: Weight parameter. Default is ``N // 3``.
+    :type d: int or None
+    :param batch_size: Number of samples per batch (a job of one worker).
+    :type batch_size: int
+    :param seed: Seed of the sampling, or None for fresh randomness. A seeded estimate is
+                 reproducible independently of the number of workers.
+    :type seed: int or None
+    :param workers: Number of worker processes. Defaults to the number of CPUs; with a
+                    single worker everything runs in the calling process.
+    :type workers: int or None
+    :param confidence: Confidence level of the interval. Default is 0.95.
+    :type confidence: float
+    :param stream: If True, returns a generator yielding the partial estimate after every
+                   completed batch (the last one covers all samples).
+    :type stream: bool
+
+    :return: The estimate (or a generator of partial estimates), a dictionary containing:
+             - ``'samples'``, ``'failures'`` (int): Samples drawn so far and failures.
+             - ``'probability'`` (float): Observed failure probability.
+             - ``'confidence'`` (float), ``'interval'`` (tuple[float, float]): Wilson
+               score interval of the failure probability.
+             - ``'gaussian_estimate'`` (float): Union bound with a normal approximation of
+               the coefficients, for failure rates too small to observe.
+             - ``'mean'``, ``'std'`` (float): Moments of the coefficients of ``a``.
+             - ``'coefficient_counts'`` (dict[int, int]): Distribution of the coefficients
+               of ``a`` before centering.
+             - ``'max_counts'`` (dict[int, int]): Distribution of the largest absolute
+               coefficient of ``a`` per sample.
+    :rtype: dict or Iterator[dict]
+
+    :raises ValueError: If the parameters are invalid or ``samples`` is not positive.
+    """
+    d = _check_parameters(N, p, q, d)
+    if samples < 1:
+        raise ValueError("The number of samples must be positive.")
+
+    estimates = _estimates(N, p, q, d, samples, batch_size, seed, workers, confidence)
+    if stream:
+        return estimates
+
+    for estimate in estimates:
+        pass
+    return estimate
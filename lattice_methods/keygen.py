@@ -0,0 +1,252 @@
+"""
+Random NTRU key generation.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+:func:`lattice_methods.ntru.ntru_generate_keys` expects the caller to supply the private
+polynomials. This module samples them: ``f`` with ``d + 1`` coefficients equal to 1 and
+``d`` equal to -1, and ``g`` with ``d`` of each, from a cryptographically secure random
+stream (SHAKE-256 over a secret or user-supplied seed, so runs can be reproduced).
+Candidates for ``f`` divisible by a low-degree factor of ``x^N - 1`` are rejected before
+the full inversion, and many key pairs can be generated in parallel over a process pool.
+"""
+
+import functools
+import hashlib
+import secrets
+
+import numpy as np
+from sympy import Poly, cyclotomic_poly, divisors, gcd, primefactors
+from sympy.ntheory import n_order
+
+from lattice_methods.keys import NTRUPrivateKey, NTRUPublicKey
+from lattice_methods.ntru import poly_inv_mod_ring, poly_mult_mod_ring, x
+from lattice_methods.parallel import _iter_jobs
+from lattice_methods.ring import SparseTernary
+
+# Number of candidates for f tried before giving up.
+_MAX_ATTEMPTS = 100
+
+# Irreducible factors of x^N - 1 up to this degree are checked before the full inversion.
+_FILTER_DEGREE = 16
+
+
+class _RandomStream:
+    """
+    A deterministic cryptographically secure byte stream: SHAKE-256 in counter mode.
+    """
+
+    __slots__ = ("_seed", "_counter")
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = secrets.token_bytes(32)
+        elif not isinstance(seed, bytes):
+            seed = str(seed).encode()
+
+        self._seed = seed
+        self._counter = 0
+
+    def read(self, n):
+        """
+        Returns the next n bytes of the stream.
+        """
+        block = hashlib.shake_256(self._seed + self._counter.to_bytes(8, "little")).digest(n)
+        self._counter += 1
+        return block
+
+    def permutation(self, n):
+        """
+        Returns a uniformly random permutation of ``range(n)``: the positions sorted by
+        independent 64-bit random keys (ties are negligible).
+        """
+        keys = np.frombuffer(self.read(8 * n), dtype="<u8")
+        return np.argsort(keys, kind="stable")
+
+
+def _child_seed(seed, index):
+    """
+    Derives the seed of the index-th key pair of a batch from the batch seed.
+    """
+    return hashlib.sha256(f"{seed}:{index}".encode()).digest()
+
+
+def _sample_ternary(stream, N, ones, minus_ones):
+    """
+    Samples a ternary polynomial with the given numbers of 1 and -1 coefficients.
+    """
+    positions = stream.permutation(N)
+    return SparseTernary(N, positions[:ones], positions[ones:ones + minus_ones])
+
+
+@functools.lru_cache(maxsize=None)
+def _factor_powers(N, r):
+    """
+    Returns, for every irreducible factor u of ``x^N - 1`` over GF(r) of degree at most
+    ``_FILTER_DEGREE``, the matrix whose row i holds ``x^i mod u`` (lowest degree first).
+    """
+    M = N
+    while M % r == 0:  # x^(r M) - 1 = (x^M - 1)^r over GF(r)
+        M //= r
+
+    matrices = []
+    for k in divisors(M):
+        # The irreducible factors of the k-th cyclotomic polynomial have degree ord_k(r).
+        if k > 1 and n_order(r, k) > _FILTER_DEGREE:
+            continue
+        for factor, _ in Poly(cyclotomic_poly(k, x), x, modulus=r).factor_list()[1]:
+            u = [int(c) % r for c in factor.all_coeffs()[::-1]]
+            degree = len(u) - 1
+
+            powers = np.zeros((N, degree), dtype=np.int64)
+            row = np.zeros(degree, dtype=np.int64)
+            row[0] = 1
+            for i in range(N):
+                powers[i] = row
+                top = row[-1]
+                row = np.roll(row, 1)
+                row[0] = 0
+                row = (row - top * np.array(u[:-1])) % r
+
+            matrices.append(powers)
+
+    return tuple(matrices)
+
+
+def _maybe_invertible(f, N, primes):
+    """
+    Cheap necessary condition for f to be invertible modulo every prime in ``primes``.
+
+    f is invertible modulo r exactly if it has no common factor with ``x^N - 1`` over
+    GF(r), so f is rejected if one of the irreducible factors of low degree divides it.
+    The remainder modulo a factor of degree k costs O(d k) with the precomputed powers
+    of x, instead of the O(N^2) of the full inversion.
+    """
+    for r in primes:
+        for powers in _factor_powers(N, r):
+            remainder = powers[f.plus].sum(axis=0) - powers[f.minus].sum(axis=0)
+            if not (remainder % r).any():
+                return False
+
+    return True
+
+
+def _check_parameters(N, p, q, d):
+    """
+    Validates NTRU parameters and returns the weight d (default ``N // 3``).
+
+    :raises ValueError: If p and q are not coprime, p >= q, or d does not fit into N.
+    """
+    if gcd(p, q) != 1 or p >= q:
+        raise ValueError("p and q must be coprime with p < q.")
+
+    d = N // 3 if d is None else d
+    if d < 1 or 2 * d + 1 > N:
+        raise ValueError(f"The weight d must satisfy 1 <= d and 2 d + 1 <= N (d = {d}, N = {N}).")
+
+    return d
+
+
+def _random_keys(seed, N, p, q, d, max_attempts):
+    """
+    Samples one key pair from the stream given by ``seed`` (d already validated).
+    """
+    stream = _RandomStream(seed)
+    primes = primefactors(p * q)
+
+    for _ in range(max_attempts):
+        f = _sample_ternary(stream, N, d + 1, d)
+        if not _maybe_invertible(f, N, primes):
+            continue
+
+        f_coeffs = [int(c) for c in f.coefficients()[::-1]]
+        Fp = poly_inv_mod_ring(f_coeffs, N, p)
+        if Fp is None:
+            continue
+        Fq = poly_inv_mod_ring(f_coeffs, N, q)
+        if Fq is None:
+            continue
+
+        g = _sample_ternary(stream, N, d, d)
+        h = poly_mult_mod_ring([p * c for c in Fq], [int(c) for c in g.coefficients()[::-1]], N, q)
+
+        return NTRUPublicKey(N, p, q, h), NTRUPrivateKey(N, p, q, f, Fp)
+
+    raise ValueError(f"No invertible f found in {max_attempts} attempts; check N, p, q and d.")
+
+
+def ntru_random_keys(N, p, q, d=None, seed=None, max_attempts=_MAX_ATTEMPTS):
+    """
+    Generates a random NTRU key pair.
+
+    The private polynomial ``f`` is sampled with ``d + 1`` coefficients equal to 1 and
+    ``d`` equal to -1, and ``g`` with ``d`` of each. A candidate ``f`` is rejected at
+    once if it vanishes at 1 (or -1 for even N) modulo a prime factor of p or q, and
+    otherwise after a failed inversion modulo p or q; then a new one is drawn.
+
+    :param N: Degree of the polynomials and ring dimension.
+    :type N: int
+    :param p: Small modulus.
+    :type p: int
+    :param q: Large modulus, coprime to p.
+    :type q: int
+    :param d: Weight parameter. Default is ``N // 3``.
+    :type d: int or None
+    :param seed: Seed of the SHAKE-256 random stream (int, str or bytes). None draws a
+                 fresh secret seed from the operating system.
+    :type seed: int or str or bytes or None
+    :param max_attempts: Number of candidates for f tried before giving up.
+    :type max_attempts: int
+
+    :return: Tuple `(pub_key, prv_key)` as returned by :func:`lattice_methods.ntru.ntru_generate_keys`;
+             the private polynomial is a :class:`lattice_methods.ring.SparseTernary`.
+    :rtype: tuple[NTRUPublicKey, NTRUPrivateKey]
+
+    :raises ValueError: If the parameters are invalid or no invertible f was found.
+    """
+    d = _check_parameters(N, p, q, d)
+    return _random_keys(seed, N, p, q, d, max_attempts)
+
+
+def ntru_random_keys_many(count, N, p, q, d=None, seed=None, workers=None, chunksize=None,
+                          max_attempts=_MAX_ATTEMPTS):
+    """
+    Generates many random NTRU key pairs in parallel.
+
+    Every key pair gets its own random stream whose seed is derived from ``seed`` and the
+    index of the pair, so a seeded batch is reproducible and independent of the number
+    of workers.
+
+    :param count: Number of key pairs.
+    :type count: int
+    :param N: Degree of the polynomials and ring dimension.
+    :type N: int
+    :param p: Small modulus.
+    :type p: int
+    :param q: Large modulus, coprime to p.
+    :type q: int
+    :param d: Weight parameter, as for :func:`ntru_random_keys`.
+    :type d: int or None
+    :param seed: Seed of the batch, or None for a fresh secret seed.
+    :type seed: int or str or bytes or None
+    :param workers: Number of worker processes. Defaults to the number of CPUs; with a
+                    single worker everything runs in the calling process.
+    :type workers: int or None
+    :param chunksize: Number of key pairs sent to a worker at once.
+    :type chunksize: int or None
+    :param max_attempts: Number of candidates for f tried per key pair.
+    :type max_attempts: int
+
+    :return: The key pairs, in order.
+    :rtype: list[tuple[NTRUPublicKey, NTRUPrivateKey]]
+
+    :raises ValueError: If the parameters are invalid or no invertible f was found.
+    """
+    d = _check_parameters(N, p, q, d)
+    seed = secrets.token_hex(32) if seed is None else seed
+    seeds = [_child_seed(seed, i) for i in range(count)]
+
+    jobs = _iter_jobs(_random_keys, seeds, workers=workers, chunksize=chunksize, N=N, p=p,
+                      q=q, d=d, max_attempts=max_attempts)
+
+    return [keys for _, keys in jobs]
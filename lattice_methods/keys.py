@@ -0,0 +1,291 @@
+"""
+NTRU key objects with precomputed data and a cache of loaded keys.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+The functions of :mod:`lattice_methods.ntru` historically take keys as plain lists
+(``[N, p, q, h]`` and ``[polynomial_f, Fp]``), so every call converted the key
+polynomials again. The classes of this module hold everything an encryption or
+decryption needs, computed once when the key is loaded: the coefficient arrays (lowest
+degree first), their FFT spectra for batch products and the centering constants. They
+still unpack like the old lists.
+
+Keys are identified by a fingerprint (SHA-256 of the parameters and coefficients). The
+loaders :func:`load_public_key` and :func:`load_private_key` keep the most recently used
+keys in an LRU cache, so a service that handles the keys of many users does not repeat
+the precomputation on every request. Keys given as lists are first looked up by the
+identity of the lists, so loading the same list again does not even convert and hash its
+coefficients; such lists must not be modified in place after they have been loaded.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from numbers import Integral
+
+import numpy as np
+from sympy import Poly
+
+from lattice_methods.ring import ProductForm, SparseTernary, _ring_operand, ring_spectrum
+
+# Number of loaded keys kept by load_public_key and load_private_key.
+_KEY_CACHE_SIZE = 256
+
+_key_cache = OrderedDict()
+_key_cache_lock = threading.Lock()
+
+# Keys loaded from lists, by the ids of those lists (see _by_identity).
+_identity_cache = OrderedDict()
+
+
+def _fingerprint(kind, N, p, q, *polynomials):
+    """
+    Computes the SHA-256 fingerprint of key parameters and coefficient arrays.
+    """
+    digest = hashlib.sha256(f"{kind}:{N}:{p}:{q}".encode())
+    for coeffs in polynomials:
+        if coeffs.dtype == object:
+            digest.update(",".join(map(str, coeffs.tolist())).encode())
+        else:
+            digest.update(coeffs.astype("<i8").tobytes())
+        digest.update(b";")
+    return digest.hexdigest()
+
+
+def _coefficients(polynomial, N):
+    """
+    Converts a key polynomial (highest degree first list or SymPy Poly) into an array of
+    N integer coefficients, lowest degree first.
+
+    :raises ValueError: If a coefficient is not an integer.
+    """
+    if isinstance(polynomial, Poly):
+        # Over ZZ the dense representation holds plain integers; skip the SymPy wrappers.
+        polynomial = [int(c) for c in polynomial.rep.to_list()] if polynomial.domain.is_ZZ \
+            else polynomial.all_coeffs()
+
+    coeffs = np.array(polynomial[::-1])
+    if coeffs.dtype.kind not in "iu":
+        coeffs = coeffs.tolist()
+        if not all(isinstance(c, Integral) or int(c) == c for c in coeffs):
+            raise ValueError("Key polynomials must have integer coefficients.")
+        coeffs = [int(c) for c in coeffs]
+
+    return _ring_operand(coeffs, N, None)
+
+
+class NTRUPublicKey:
+    """
+    An NTRU public key with precomputed data.
+
+    Unpacks like the list ``[N, p, q, h]`` returned by earlier versions, where ``h`` is
+    the list of coefficients (highest degree first).
+
+    :param N: Degree of the polynomials and ring dimension.
+    :type N: int
+    :param p: Small modulus.
+    :type p: int
+    :param q: Large modulus.
+    :type q: int
+    :param h: Public polynomial (highest degree first).
+    :type h: list[int]
+
+    :raises ValueError: If ``h`` does not have integer coefficients.
+    """
+
+    __slots__ = ("N", "p", "q", "h", "h_coeffs", "h_spectrum", "fingerprint")
+
+    def __init__(self, N, p, q, h):
+        self.N = N
+        self.p = p
+        self.q = q
+        self.h = [int(c) for c in h]
+        self.h_coeffs = _ring_operand(_coefficients(h, N), N, q)
+        self.h_spectrum = ring_spectrum(self.h_coeffs, N)
+        self.fingerprint = _fingerprint("public", N, p, q, self.h_coeffs)
+
+    def __iter__(self):
+        return iter((self.N, self.p, self.q, self.h))
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __len__(self):
+        return 4
+
+    def __repr__(self):
+        return f"NTRUPublicKey(N={self.N}, p={self.p}, q={self.q}, fingerprint={self.fingerprint[:16]})"
+
+
+class NTRUPrivateKey:
+    """
+    An NTRU private key with precomputed data.
+
+    Unpacks like the list ``[polynomial_f, Fp]`` returned by earlier versions. The
+    private polynomial is kept as given (SymPy Poly or sparse); its coefficients and
+    those of ``Fp`` are also held as arrays together with their FFT spectra, and the
+    centering constants ``q // 2`` and ``p // 2`` are stored for decryption.
+
+    :param N: Degree of the polynomials and ring dimension.
+    :type N: int
+    :param p: Small modulus.
+    :type p: int
+    :param q: Large modulus.
+    :type q: int
+    :param f: Private polynomial.
+    :type f: sympy.Poly or SparseTernary or ProductForm
+    :param Fp: Inverse of ``f`` modulo p (highest degree first).
+    :type Fp: list[int]
+
+    :raises ValueError: If a polynomial does not have integer coefficients.
+    """
+
+    __slots__ = ("N", "p", "q", "f", "Fp", "f_coeffs", "f_spectrum", "Fp_coeffs",
+                 "Fp_spectrum", "q_half", "p_half", "fingerprint")
+
+    def __init__(self, N, p, q, f, Fp):
+        self.N = N
+        self.p = p
+        self.q = q
+        self.f = f
+        self.Fp = [int(c) for c in Fp]
+        self.q_half = q // 2
+        self.p_half = p // 2
+
+        if isinstance(f, (SparseTernary, ProductForm)):
+            self.f_coeffs = f.coefficients()
+            self.f_spectrum = None
+        else:
+            self.f_coeffs = _coefficients(f, N)
+            self.f_spectrum = ring_spectrum(self.f_coeffs, N)
+
+        self.Fp_coeffs = _ring_operand(_coefficients(Fp, N), N, p)
+        self.Fp_spectrum = ring_spectrum(self.Fp_coeffs, N)
+        self.fingerprint = _fingerprint(f"private:{type(f).__name__}", N, p, q,
+                                        self.f_coeffs, self.Fp_coeffs)
+
+    def __iter__(self):
+        return iter((self.f, self.Fp))
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        return f"NTRUPrivateKey(N={self.N}, p={self.p}, q={self.q}, fingerprint={self.fingerprint[:16]})"
+
+
+def _cached(fingerprint, build):
+    """
+    Returns the cached key with the given fingerprint, building and caching it if needed.
+    """
+    with _key_cache_lock:
+        key = _key_cache.get(fingerprint)
+        if key is not None:
+            _key_cache.move_to_end(fingerprint)
+            return key
+
+    key = build()
+
+    with _key_cache_lock:
+        _key_cache[fingerprint] = key
+        while len(_key_cache) > _KEY_CACHE_SIZE:
+            _key_cache.popitem(last=False)
+
+    return key
+
+
+def _by_identity(sources, load):
+    """
+    Returns the key loaded from the given lists, looking them up by identity before
+    calling ``load``.
+
+    A hit costs O(1) instead of the O(N) conversion and hashing of the coefficients: the
+    entry keeps the lists alive, so their ids cannot be reused by other objects, and
+    checks that they still hold the same items.
+    """
+    ids = tuple(id(source) for source in sources)
+    items = tuple(item for source in sources for item in source)
+
+    with _key_cache_lock:
+        entry = _identity_cache.get(ids)
+        if entry is not None and len(entry[1]) == len(items) \
+                and all(a is b for a, b in zip(entry[1], items)):
+            _identity_cache.move_to_end(ids)
+            return entry[2]
+
+    key = load()
+
+    with _key_cache_lock:
+        _identity_cache[ids] = (sources, items, key)
+        while len(_identity_cache) > _KEY_CACHE_SIZE:
+            _identity_cache.popitem(last=False)
+
+    return key
+
+
+def load_public_key(pubkey):
+    """
+    Returns the :class:`NTRUPublicKey` for a public key, using the cache of loaded keys.
+
+    :param pubkey: A public key object, or a list ``[N, p, q, h]`` that is not modified
+                   in place afterwards.
+    :type pubkey: NTRUPublicKey or list
+
+    :return: The public key object.
+    :rtype: NTRUPublicKey
+
+    :raises ValueError: If ``h`` does not have integer coefficients.
+    """
+    if isinstance(pubkey, NTRUPublicKey):
+        return pubkey
+
+    def load():
+        N, p, q, h = pubkey
+        h_coeffs = _ring_operand(_coefficients(h, N), N, q)
+        return _cached(_fingerprint("public", N, p, q, h_coeffs), lambda: NTRUPublicKey(N, p, q, h))
+
+    return _by_identity((pubkey,), load)
+
+
+def load_private_key(pubkey, prvkey):
+    """
+    Returns the :class:`NTRUPrivateKey` for a private key, using the cache of loaded keys.
+
+    :param pubkey: The matching public key (object or list ``[N, p, q, h]``), which
+                   provides the parameters.
+    :type pubkey: NTRUPublicKey or list
+    :param prvkey: A private key object, or a list ``[polynomial_f, Fp]`` that is not
+                   modified in place afterwards.
+    :type prvkey: NTRUPrivateKey or list
+
+    :return: The private key object.
+    :rtype: NTRUPrivateKey
+
+    :raises ValueError: If a polynomial does not have integer coefficients.
+    """
+    if isinstance(prvkey, NTRUPrivateKey):
+        return prvkey
+
+    def load():
+        N, p, q, h = pubkey
+        f, Fp = prvkey
+
+        f_coeffs = f.coefficients() if isinstance(f, (SparseTernary, ProductForm)) \
+            else _coefficients(f, N)
+        Fp_coeffs = _ring_operand(_coefficients(Fp, N), N, p)
+        fingerprint = _fingerprint(f"private:{type(f).__name__}", N, p, q, f_coeffs, Fp_coeffs)
+        return _cached(fingerprint, lambda: NTRUPrivateKey(N, p, q, f, Fp))
+
+    return _by_identity((pubkey, prvkey), load)
+
+
+def clear_key_cache():
+    """
+    Removes all keys from the cache of loaded keys.
+    """
+    with _key_cache_lock:
+        _key_cache.clear()
+        _identity_cache.clear()
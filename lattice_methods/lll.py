@@ -4,29 +4,604 @@ Implementation of the classical LLL lattice basis reduction algorithm.
 Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
 
 This module provides an implementation of the Lenstra–Lenstra–Lovász (LLL) algorithm
-for lattice basis reduction. It uses Gram-Schmidt orthogonalization to iteratively
-reduce a given basis to a shorter and more orthogonal form.
+for lattice basis reduction. The Gram-Schmidt data (coefficients ``mu`` and squared
+norms ``B``) is computed once and then kept up to date incrementally, so every size
+reduction and every swap only touches the rows it actually changes. All engines work
+in place on a single basis matrix (one basis vector per row) and can track the
+unimodular transformation applied to it.
+
+Two engines are available: a floating-point one for bases with moderate entries and
+a fraction-free integral one (de Weger) for bases with cryptographic-size entries,
+which works on Python integers only and therefore never loses precision. In addition,
+:func:`lll_reduce_fp` provides an L2-style floating-point variant that escalates to
+higher precision when it detects a loss of accuracy.
 """
 
+import math
+import time
+from fractions import Fraction
+
 import numpy as np
-from lattice_methods.utils import gram_schmidt
 
-def lll_reduce(basis, delta=0.75, verbose=False):
+# Once a size-reduction multiplier exceeds this bound the floating-point row of ``mu``
+# is no longer trustworthy and is recomputed from the (exact) basis vectors.
+_REFRESH_BOUND = 2 ** 26
+
+
+def _exact_rows(basis):
+    """
+    Stacks the basis vectors into a matrix whose dot products do not overflow.
+
+    Integer bases with large entries are promoted to Python integers (``dtype=object``),
+    so that Gram matrix entries are always computed exactly.
+    """
+    rows = np.array(basis)
+
+    if rows.dtype.kind in "iu":
+        bound = int(np.abs(rows).max()) if rows.size else 0
+        if rows.shape[1] * bound * bound >= 2 ** 52:
+            rows = rows.astype(object)
+
+    return rows
+
+
+def _gso_from_gram(gram):
+    """
+    Computes the Gram-Schmidt coefficients and squared norms from a Gram matrix.
+
+    The data is read off the Cholesky factor ``G = L L^T``: ``mu[i, j] = L[i, j] / L[j, j]``
+    and ``B[i] = L[i, i]^2``. If the factorization fails because the matrix is not
+    numerically positive definite, the recurrence is evaluated row by row instead.
+
+    :param gram: Gram matrix of the basis, i.e. ``G[i, j] = <b_i, b_j>``.
+    :type gram: numpy.ndarray
+
+    :return: A tuple (mu, B) with the lower-triangular coefficient matrix and the
+             squared norms of the orthogonalized vectors.
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    try:
+        L = np.linalg.cholesky(gram)
+    except np.linalg.LinAlgError:
+        return _gso_recurrence(gram)
+
+    diag = np.diagonal(L)
+    return np.tril(L / diag, -1), diag ** 2
+
+
+def _gso_recurrence(gram):
+    """
+    Row-by-row version of :func:`_gso_from_gram` for matrices that are not numerically
+    positive definite.
+    """
+    n = gram.shape[0]
+    mu = np.zeros((n, n), dtype=gram.dtype)
+    B = np.zeros(n, dtype=gram.dtype)
+    r = np.zeros((n, n), dtype=gram.dtype)
+
+    for i in range(n):
+        for j in range(i):
+            r[i, j] = gram[i, j] - np.dot(mu[j, :j], r[i, :j])
+            mu[i, j] = r[i, j] / B[j]
+        B[i] = gram[i, i] - np.dot(mu[i, :i], r[i, :i])
+
+    return mu, B
+
+
+def _as_matrix(basis):
+    """
+    Copies a basis (list of vectors or 2-D array) into a 2-D array, one vector per row.
+
+    :return: Tuple (rows, is_array) where ``is_array`` tells whether the input was a 2-D array.
+    :rtype: tuple[numpy.ndarray, bool]
+    """
+    return np.array(basis), isinstance(basis, np.ndarray)
+
+
+def _integer_matrix(rows):
+    """
+    Converts a basis matrix into an object array of Python integers.
+
+    :raises ValueError: If the matrix has non-integer entries.
+    """
+    values = np.vectorize(int, otypes=[object])(rows) if rows.size else rows.astype(object)
+
+    if np.any(values != rows):
+        raise ValueError("Exact LLL reduction requires an integer basis.")
+
+    return values
+
+
+def _identity(n, rows):
+    """
+    Returns an identity matrix for tracking the transformation of ``rows``.
+    """
+    return np.eye(n, dtype=object if rows.dtype == object else np.int64)
+
+
+def _finish(rows, transform, is_array, dtype):
+    """
+    Converts a reduced basis matrix back into the caller's representation.
+
+    :return: The reduced basis as a 2-D array (if the input was one) or a list of
+             vectors, followed by the transformation matrix if it was tracked.
+    """
+    rows = rows.astype(dtype)
+    basis = rows if is_array else list(rows)
+    return basis if transform is None else (basis, transform)
+
+
+def _swap_rows(matrix, k):
+    """
+    Swaps rows ``k - 1`` and ``k`` of a matrix in place.
+    """
+    matrix[[k - 1, k]] = matrix[[k, k - 1]]
+
+
+def _size_reduce(rows, U, mu, k, j):
+    """
+    Size-reduces ``rows[k]`` against ``rows[j]`` and updates row ``k`` of ``mu``.
+
+    Only the coefficients ``mu[k, :j + 1]`` change, all other Gram-Schmidt data
+    (including the squared norms) stays valid. Returns the multiplier that was applied
+    (0 if the vectors were already size-reduced).
+    """
+    if abs(mu[k, j]) <= 0.5:
+        return 0
+
+    r = round(mu[k, j])
+    rows[k] -= r * rows[j]
+    if U is not None:
+        U[k] -= r * U[j]
+    mu[k, j] -= r
+    mu[k, :j] -= r * mu[j, :j]
+
+    return r
+
+
+def _refresh_row(rows, mu, B, k):
+    """
+    Recomputes row ``k`` of ``mu`` and ``B[k]`` from the current basis vectors.
+
+    Used after size reductions with very large multipliers, where the incremental
+    update has lost too many significant bits.
+    """
+    exact_rows = _exact_rows(rows[:k + 1])
+    gram_row = np.array([float(v) for v in exact_rows @ exact_rows[k]])
+
+    for j in range(k):
+        mu[k, j] = (gram_row[j] - np.dot(mu[j, :j] * mu[k, :j], B[:j])) / B[j]
+
+    B[k] = gram_row[k] - np.dot(mu[k, :k] * mu[k, :k], B[:k])
+
+
+def _swap(rows, U, mu, B, k):
+    """
+    Swaps ``rows[k - 1]`` and ``rows[k]`` and updates the Gram-Schmidt data.
+
+    Only the squared norms ``B[k - 1]``, ``B[k]``, the rows ``k - 1`` and ``k`` of ``mu``
+    and the columns ``k - 1`` and ``k`` below them are affected.
+    """
+    m = mu[k, k - 1]
+    B_new = B[k] + m * m * B[k - 1]
+
+    mu[k, k - 1] = m * B[k - 1] / B_new
+    B[k] = B[k - 1] * B[k] / B_new
+    B[k - 1] = B_new
+
+    _swap_rows(rows, k)
+    if U is not None:
+        _swap_rows(U, k)
+    mu[[k - 1, k], :k - 1] = mu[[k, k - 1], :k - 1]
+
+    t = mu[k + 1:, k].copy()
+    mu[k + 1:, k] = mu[k + 1:, k - 1] - m * t
+    mu[k + 1:, k - 1] = t + mu[k, k - 1] * mu[k + 1:, k]
+
+
+def _round_div(a, b):
+    """
+    Rounds the rational number ``a / b`` (with ``b > 0``) to the nearest integer.
+
+    Ties are rounded to the even neighbour, exactly like :func:`round` does for
+    :class:`fractions.Fraction`, so the integral engine reproduces a rational reference.
+    """
+    q, r = divmod(a, b)
+    if 2 * r > b or (2 * r == b and q % 2 == 1):
+        q += 1
+    return q
+
+
+def _integral_gso(gram):
+    """
+    Computes the integral Gram-Schmidt data of an integer Gram matrix.
+
+    Returns the denominators ``d`` with ``d[0] = 1`` and ``d[i + 1] = d[i] * B_i`` and the
+    integers ``lam[i, j] = d[j + 1] * mu[i, j]``; all divisions are exact.
+
+    :param gram: Integer Gram matrix (``dtype=object``).
+    :type gram: numpy.ndarray
+
+    :return: A tuple (d, lam) of object arrays holding Python integers.
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    n = gram.shape[0]
+    d = np.zeros(n + 1, dtype=object)
+    lam = np.zeros((n, n), dtype=object)
+    d[0] = 1
+
+    for i in range(n):
+        for j in range(i + 1):
+            u = int(gram[i, j])
+            for l in range(j):
+                u = (d[l + 1] * u - lam[i, l] * lam[j, l]) // d[l]
+
+            if j < i:
+                lam[i, j] = u
+            else:
+                d[i + 1] = u
+
+    return d, lam
+
+
+def _integral_size_reduce(rows, U, d, lam, k, j):
+    """
+    Size-reduces ``rows[k]`` against ``rows[j]`` using integral Gram-Schmidt data.
+
+    Returns the multiplier that was applied (0 if the vectors were already size-reduced).
+    """
+    if 2 * abs(lam[k, j]) <= d[j + 1]:
+        return 0
+
+    r = _round_div(lam[k, j], d[j + 1])
+    rows[k] -= r * rows[j]
+    if U is not None:
+        U[k] -= r * U[j]
+    lam[k, j] -= r * d[j + 1]
+    lam[k, :j] -= r * lam[j, :j]
+
+    return r
+
+
+def _integral_swap(rows, U, d, lam, k):
+    """
+    Swaps ``rows[k - 1]`` and ``rows[k]`` and updates the integral Gram-Schmidt data.
+    """
+    l = lam[k, k - 1]
+    d_new = (d[k - 1] * d[k + 1] + l * l) // d[k]
+
+    _swap_rows(rows, k)
+    if U is not None:
+        _swap_rows(U, k)
+    lam[[k - 1, k], :k - 1] = lam[[k, k - 1], :k - 1]
+
+    t = lam[k + 1:, k].copy()
+    lam[k + 1:, k] = (d[k + 1] * lam[k + 1:, k - 1] - l * t) // d[k]
+    lam[k + 1:, k - 1] = (d_new * t + l * lam[k + 1:, k]) // d[k + 1]
+    d[k] = d_new
+
+
+def _new_stats():
+    """
+    Returns the counters and per-phase timings filled in by the LLL engines.
+    """
+    return dict(iterations=0, size_reductions=0, swaps=0, gso_updates=0, k=1,
+                gso_time=0.0, size_reduction_time=0.0, swap_time=0.0)
+
+
+def _tick(stats, phase, since):
+    """
+    Adds the time elapsed since ``since`` to ``stats[phase]`` and returns the current time.
+    """
+    now = time.perf_counter()
+    stats[phase] += now - since
+    return now
+
+
+def _lll_float(rows, U, delta, k=1, stop=None, stats=None):
+    """
+    Floating-point LLL engine with incrementally updated Gram-Schmidt data.
+
+    Reduces the basis matrix ``rows`` in place and applies the same row operations to
+    the transformation matrix ``U`` (if not None). The run starts at index ``k``; if
+    ``stop`` is given, it is called with the current index before every iteration and
+    the run is interrupted once it returns True. If ``stats`` (see :func:`_new_stats`)
+    is given, the counters and timings in it are updated during the run and
+    ``stats["B"]`` refers to the live array of squared Gram-Schmidt norms.
+
+    :return: The index at which the run ended (``n`` if the basis is reduced).
+    """
+    n = rows.shape[0]
+    if stats is not None:
+        since = time.perf_counter()
+
+    exact_rows = _exact_rows(rows)
+    mu, B = _gso_from_gram((exact_rows @ exact_rows.T).astype(float))
+
+    if stats is not None:
+        stats["B"] = B
+        stats["gso_updates"] += n
+        _tick(stats, "gso_time", since)
+
+    while k < n:
+        if stop is not None and stop(k):
+            return k
+
+        if stats is not None:
+            stats["iterations"] += 1
+            stats["k"] = k
+            since = time.perf_counter()
+
+        while True:
+            refresh = False
+            for j in range(k - 1, -1, -1):  # j < k
+                r = _size_reduce(rows, U, mu, k, j)
+                refresh |= abs(r) > _REFRESH_BOUND
+                if r and stats is not None:
+                    stats["size_reductions"] += 1
+
+            if not refresh:
+                break
+
+            if stats is not None:
+                since = _tick(stats, "size_reduction_time", since)
+                stats["gso_updates"] += 1
+            _refresh_row(rows, mu, B, k)
+            if stats is not None:
+                since = _tick(stats, "gso_time", since)
+
+        if stats is not None:
+            since = _tick(stats, "size_reduction_time", since)
+
+        lhs = delta * B[k - 1]
+        rhs = B[k] + mu[k, k - 1]**2 * B[k - 1]
+
+        if lhs > rhs:
+            _swap(rows, U, mu, B, k)
+            if stats is not None:
+                stats["swaps"] += 1
+
+            k = max(k - 1, 1)
+        else:
+            k += 1
+
+        if stats is not None:
+            _tick(stats, "swap_time", since)
+
+    return k
+
+
+def _lll_integral(rows, U, delta, k=1, stop=None, stats=None):
+    """
+    Fraction-free integral LLL engine (de Weger), using Python integers only.
+
+    Reduces the object matrix ``rows`` in place (and ``U``, if not None). The Lovász
+    condition ``B_k < (delta - mu^2) * B_{k-1}`` is tested in the equivalent integral
+    form ``den * d[k+1] * d[k-1] < num * d[k]^2 - den * lam[k, k-1]^2``. ``k``, ``stop``
+    and ``stats`` have the same meaning as in :func:`_lll_float`, except that
+    ``stats["d"]`` refers to the live array of Gram-Schmidt denominators.
+
+    :return: The index at which the run ended (``n`` if the basis is reduced).
+    """
+    n = rows.shape[0]
+    if stats is not None:
+        since = time.perf_counter()
+
+    d, lam = _integral_gso(rows @ rows.T)
+    num, den = delta.numerator, delta.denominator
+
+    if stats is not None:
+        stats["d"] = d
+        stats["gso_updates"] += n
+        _tick(stats, "gso_time", since)
+
+    while k < n:
+        if stop is not None and stop(k):
+            return k
+
+        if stats is not None:
+            stats["iterations"] += 1
+            stats["k"] = k
+            since = time.perf_counter()
+
+        for j in range(k - 1, -1, -1):  # j < k
+            r = _integral_size_reduce(rows, U, d, lam, k, j)
+            if r and stats is not None:
+                stats["size_reductions"] += 1
+
+        if stats is not None:
+            since = _tick(stats, "size_reduction_time", since)
+
+        lhs = den * d[k + 1] * d[k - 1]
+        rhs = num * d[k] * d[k] - den * lam[k, k - 1]**2
+
+        if lhs < rhs:
+            _integral_swap(rows, U, d, lam, k)
+            if stats is not None:
+                stats["swaps"] += 1
+
+            k = max(k - 1, 1)
+        else:
+            k += 1
+
+        if stats is not None:
+            _tick(stats, "swap_time", since)
+
+    return k
+
+
+def _exact_delta(delta):
+    """
+    Returns the Lovász parameter as the rational number it is written as.
+    """
+    return delta if isinstance(delta, Fraction) else Fraction(str(delta))
+
+
+def _reduce_rows(rows, U, delta, exact, k=1, stop=None, stats=None):
+    """
+    Runs the float or the integral LLL engine on a basis matrix in place.
+
+    ``rows`` must be an object matrix of Python integers for the integral engine.
+
+    :return: The index at which the run ended (``n`` if the basis is reduced).
+    """
+    if exact:
+        return _lll_integral(rows, U, _exact_delta(delta), k, stop, stats)
+    return _lll_float(rows, U, delta, k, stop, stats)
+
+
+def _gso_quality(log_norms, log_lengths=None):
+    """
+    Computes quality metrics of a basis from the logarithms of its Gram-Schmidt norms.
+
+    :param log_norms: The values ``log2 ||b*_i||`` of the orthogonalized vectors.
+    :type log_norms: numpy.ndarray
+    :param log_lengths: The values ``log2 ||b_i||`` of the basis vectors, needed for the
+                        orthogonality defect.
+    :type log_lengths: numpy.ndarray or None
+
+    :return: Dictionary with the length of the first vector, the root Hermite factor,
+             the slope of ``log2 ||b*_i||`` (GSA slope), the base-2 logarithm of the LLL
+             potential ``prod_i ||b*_i||^(2(n - i))`` and, if ``log_lengths`` is given,
+             the base-2 logarithm of the orthogonality defect.
+    :rtype: dict
+    """
+    n = len(log_norms)
+    log_volume = float(np.sum(log_norms))
+
+    with np.errstate(over="ignore"):
+        quality = {
+            "b1_norm": float(np.exp2(log_norms[0])),
+            "root_hermite_factor": float(np.exp2((log_norms[0] - log_volume / n) / n)),
+            "gsa_slope": float(np.polyfit(np.arange(n), log_norms, 1)[0]) if n > 1 else 0.0,
+            "log_potential": float(np.dot(2 * (n - np.arange(n)), log_norms)),
+        }
+
+    if log_lengths is not None:
+        quality["log_orthogonality_defect"] = float(np.sum(log_lengths)) - log_volume
+
+    return quality
+
+
+def _log_lengths(rows):
+    """
+    Returns ``log2 ||b_i||`` for every row of a basis matrix, exactly for big integers.
+    """
+    if rows.dtype == object:
+        return np.array([0.5 * math.log2(sum(int(x) * int(x) for x in row)) for row in rows])
+    return 0.5 * np.log2((rows.astype(float) ** 2).sum(axis=1))
+
+
+def _stats_log_norms(stats):
+    """
+    Returns ``log2 ||b*_i||`` from the live Gram-Schmidt data referenced by ``stats``.
+    """
+    if "B" in stats:
+        return 0.5 * np.log2(stats["B"])
+    return 0.5 * np.diff([math.log2(x) for x in stats["d"]])
+
+
+def _report(stats, rows, start_time):
+    """
+    Builds the progress report passed to the callback of :func:`lll_reduce`.
+    """
+    report = {key: value for key, value in stats.items() if key not in ("B", "d")}
+    report["n"] = rows.shape[0]
+    report["time"] = time.perf_counter() - start_time
+    report.update(_gso_quality(_stats_log_norms(stats), _log_lengths(rows)))
+    return report
+
+
+def _print_report(report):
+    """
+    Default callback of :func:`lll_reduce` in verbose mode.
+    """
+    print(f"[LLL] k={report['k']}/{report['n']} iterations={report['iterations']} "
+          f"swaps={report['swaps']} size_reductions={report['size_reductions']} "
+          f"rhf={report['root_hermite_factor']:.5f} gsa_slope={report['gsa_slope']:.5f} "
+          f"log_potential={report['log_potential']:.2f} time={report['time']:.3f}s")
+
+
+def basis_quality(basis):
+    """
+    Computes quality metrics of a lattice basis.
+
+    The Gram-Schmidt data is computed exactly (fraction-free) for integer bases whose dot
+    products do not fit into float64, and in floating point otherwise.
+
+    :param basis: A list of NumPy vectors or a 2-D array whose rows are the basis vectors.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+
+    :return: Dictionary containing:
+             - ``'b1_norm'``: Euclidean length of the first basis vector.
+             - ``'root_hermite_factor'``: ``(||b_1|| / vol(L)^(1/n))^(1/n)``.
+             - ``'gsa_slope'``: Slope of the least-squares line through ``log2 ||b*_i||``.
+             - ``'log_potential'``: ``log2`` of the LLL potential ``prod_i d_i``.
+             - ``'log_orthogonality_defect'``: ``log2`` of ``prod_i ||b_i|| / vol(L)``.
+    :rtype: dict
+    """
+    rows = _exact_rows(basis)
+
+    if rows.dtype == object:
+        rows = _integer_matrix(rows)
+        d, _ = _integral_gso(rows @ rows.T)
+        log_norms = _stats_log_norms({"d": d})
+    else:
+        _, B = _gso_from_gram((rows @ rows.T).astype(float))
+        log_norms = _stats_log_norms({"B": B})
+
+    return _gso_quality(log_norms, _log_lengths(rows))
+
+
+def lll_reduce(basis, delta=0.75, verbose=False, exact=None, return_transform=False,
+               callback=None, callback_interval=1000):
     """
     Performs LLL (Lenstra–Lenstra–Lovász) lattice basis reduction.
 
     This function applies the classical LLL algorithm to reduce a given lattice basis
-    to a shorter and nearly orthogonal form.
+    to a shorter and nearly orthogonal form. The Gram-Schmidt orthogonalization is
+    computed once up front; afterwards a size reduction only updates the affected
+    row and a swap only updates the data of rows ``k - 1`` and ``k``.
+
+    Two modes are available. The floating-point mode keeps ``mu`` and the squared
+    norms in float64. The exact mode is fraction-free: it keeps the Gram-Schmidt
+    denominators ``d_i`` and the numerators ``lambda_ij = d_{j+1} * mu_ij`` as Python
+    integers, so its output is identical to a reduction in exact rational arithmetic.
 
-    :param basis: A list of NumPy vectors representing the lattice basis.
-    :type basis: list[numpy.ndarray]
+    The basis is copied once into a matrix (one basis vector per row) and all size
+    reductions and swaps are carried out in place on its rows.
+
+    :param basis: A list of NumPy vectors or a 2-D array whose rows are the basis vectors.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
     :param delta: Lovász parameter, typically in the range (0.5, 1). Default is 0.75.
-    :type delta: float
-    :param verbose: If True, enables step-by-step debug output (currently unused).
+                  In exact mode it is taken as the rational number it is written as.
+    :type delta: float or fractions.Fraction
+    :param verbose: If True, prints a progress line every ``callback_interval`` iterations
+                    and at the end of the run (unless a ``callback`` is given).
     :type verbose: bool
+    :param exact: True for the integral mode, False for the floating-point mode. By
+                  default the integral mode is chosen for integer bases whose dot
+                  products do not fit into float64 without rounding.
+    :type exact: bool or None
+    :param return_transform: If True, also returns the unimodular matrix ``U`` with
+                             ``reduced = U @ basis``.
+    :type return_transform: bool
+    :param callback: Called with a progress report every ``callback_interval``
+                     iterations and once at the end of the run. The report is a
+                     dictionary with the counters ``iterations``, ``size_reductions``,
+                     ``swaps``, ``gso_updates``, the current index ``k`` and dimension
+                     ``n``, the phase timings ``gso_time``, ``size_reduction_time``,
+                     ``swap_time``, the elapsed ``time`` and the metrics of
+                     :func:`basis_quality`. No counters are kept if it is None.
+    :type callback: callable or None
+    :param callback_interval: Number of iterations between two reports. Default is 1000.
+    :type callback_interval: int
 
-    :return: A list of NumPy vectors representing the LLL-reduced lattice basis.
-    :rtype: list[numpy.ndarray]
+    :return: The LLL-reduced basis in the same form as the input (list of vectors or
+             2-D array); if ``return_transform`` is True, a tuple (reduced, U).
+    :rtype: list[numpy.ndarray] or numpy.ndarray or tuple
+
+    :raises ValueError: If the exact mode is requested for a non-integer basis.
 
     .. note::
        This function assumes all basis vectors are linearly independent.
@@ -38,38 +613,292 @@ def lll_reduce(basis, delta=0.75, verbose=False):
        :func:`lattice_methods.utils.gram_schmidt` for orthogonalization.
     """
 
-    ##TODO verbose ..
+    rows, is_array = _as_matrix(basis)
+    dtype = rows.dtype
+    n = rows.shape[0]
 
-    basis = [b.copy() for b in basis]
-    n = len(basis)
-    k = 1
+    if exact is None:
+        exact = n > 1 and _exact_rows(rows).dtype == object
+
+    if exact:
+        rows = _integer_matrix(rows)
+
+    U = _identity(n, rows) if return_transform else None
+
+    if verbose and callback is None:
+        callback = _print_report
+
+    stats = stop = None
+    if callback is not None and n > 1:
+        start_time = time.perf_counter()
+        stats = _new_stats()
+
+        def stop(k):
+            if stats["iterations"] % callback_interval == 0:
+                callback(_report(stats, rows, start_time))
+            return False
+
+    if n > 1:
+        _reduce_rows(rows, U, delta, exact, stop=stop, stats=stats)
+
+    if stats is not None:
+        stats["k"] = n
+        callback(_report(stats, rows, start_time))
+
+    return _finish(rows, U, is_array, dtype)
 
 
+class _PrecisionLoss(Exception):
+    """
+    Raised by the floating-point L2 engine when its working precision is exhausted.
+    """
+
+
+# Working precisions tried by :func:`lll_reduce_fp` before it falls back to exact arithmetic.
+_FP_PRECISIONS = (np.float64, np.longdouble)
+
+
+def _int_to_float(value, dtype):
+    """
+    Converts a Python integer to ``dtype`` keeping its leading 63 bits.
+    """
+    shift = max(abs(value).bit_length() - 63, 0)
+    mantissa = dtype(np.int64(abs(value) >> shift))
+    return np.ldexp(mantissa if value >= 0 else -mantissa, shift)
+
+
+def _as_floats(values, dtype):
+    """
+    Converts exact integers to the working precision, rejecting values out of range.
+    """
+    values = np.asarray(values)
+    if values.dtype != object:
+        # Machine integers are always within the floating-point range.
+        return values.astype(dtype)
+
+    try:
+        with np.errstate(over="ignore"):
+            if values.dtype == object and np.finfo(dtype).nmant > np.finfo(np.float64).nmant:
+                # NumPy converts Python integers through float64; split off the leading
+                # 63 bits instead to keep the extra bits of the extended precision.
+                converted = np.array([_int_to_float(int(v), dtype) for v in values], dtype=dtype)
+            else:
+                converted = values.astype(dtype)
+    except OverflowError:
+        raise _PrecisionLoss("Gram matrix entries exceed the floating-point range.")
+
+    if not np.all(np.isfinite(converted)):
+        raise _PrecisionLoss("Gram matrix entries exceed the floating-point range.")
+
+    return converted
+
+
+def _cholesky_row(gram_row, r, mu, inverse, k):
+    """
+    Computes row ``k`` of ``r`` and ``mu`` from row ``k`` of the exact Gram matrix.
+
+    Rows ``0 .. k - 1`` must already be valid, including those of ``inverse``, the
+    inverse of the unit lower triangular matrix ``mu + I`` (see :func:`_extend_inverse`).
+    Its rows express the orthogonalized vectors in the basis, so
+    ``r[k, :k] = inverse[:k, :k] @ gram_row[:k]`` is a single matrix-vector product.
+    ``r[k, k]`` is the squared norm ``B_k``; it is only meaningful once row ``k`` is
+    size-reduced.
+
+    :return: ``B_k + mu[k, k - 1]^2 * B_{k-1}``, the right-hand side of the Lovász
+             condition, computed without the last (cancellation-prone) subtraction.
+    :rtype: float
+    """
+    if not k:
+        r[k, k] = gram_row[k]
+        return r[k, k]
+
+    r[k, :k] = inverse[:k, :k] @ gram_row[:k]
+    mu[k, :k] = r[k, :k] / r.diagonal()[:k]
+
+    lovasz = gram_row[k] - np.dot(mu[k, :k - 1], r[k, :k - 1])
+    r[k, k] = lovasz - mu[k, k - 1] * r[k, k - 1]
+
+    return lovasz
+
+
+def _extend_inverse(mu, inverse, k):
+    """
+    Computes row ``k`` of the inverse of ``mu + I`` once row ``k`` of ``mu`` is final.
+    """
+    inverse[k, :k] = -mu[k, :k] @ inverse[:k, :k]
+
+
+def _swap_bound(gram, delta):
+    """
+    Upper bound on the number of swaps of an LLL run on an integer basis.
+
+    Each swap decreases the potential ``prod d_i`` by at least a factor ``delta`` and the
+    potential of an integer lattice never drops below 1, so more swaps than this bound
+    can only be caused by floating-point errors.
+    """
+    n = gram.shape[0]
+    log_potential = sum((n - i) * int(gram[i, i]).bit_length() for i in range(n))
+    return int(log_potential / -np.log2(float(delta))) + n * n + 16
+
+
+def _lll_l2(rows, U, delta, eta, dtype):
+    """
+    Floating-point L2-style LLL engine working on the basis matrix ``rows`` in place.
+
+    The same row operations are applied to the transformation matrix ``U`` (if not None).
+
+    The Gram matrix is kept exactly (integers) and updated on every basis operation; only
+    the Gram-Schmidt data is approximated, recomputed row by row from the exact Gram
+    matrix in the working precision ``dtype``. Size reduction is lazy: row ``k`` is
+    reduced repeatedly until all ``|mu[k, j]| <= eta``. The basis is only changed by
+    unimodular row operations, so after a failure it is still a valid (partially
+    reduced) basis to continue from.
+
+    :raises _PrecisionLoss: If the size reduction stops making progress (``mu`` drift),
+                            the number of swaps exceeds the theoretical bound (stalled
+                            Lovász progress) or the final check of the result fails.
+    """
+    n = rows.shape[0]
+    gram = rows @ rows.T
+    r = np.zeros((n, n), dtype=dtype)
+    mu = np.zeros((n, n), dtype=dtype)
+    inverse = np.eye(n, dtype=dtype)
+
+    swaps_left = _swap_bound(gram, delta)
+    delta_f = dtype(delta)
+    eta_f = dtype(eta)
+
+    _cholesky_row(_as_floats(gram[0], dtype), r, mu, inverse, 0)
+    k = 1
+
     while k < n:
 
-        ortho, mu = gram_schmidt(basis)
+        previous_norm = None
 
-        for j in range(k - 1, -1, -1):  # j < k
+        while True:
+            lovasz = _cholesky_row(_as_floats(gram[k], dtype), r, mu, inverse, k)
 
-            if abs(mu[k, j]) > 0.5:
-                r = round(mu[k, j])
-                basis[k] -= r * basis[j]
-                ortho, mu = gram_schmidt(basis)
+            if (np.abs(mu[k, :k]) <= eta_f).all():
+                break
 
-        norm_sq_prev = np.dot(ortho[k - 1], ortho[k - 1])
-        norm_sq_curr = np.dot(ortho[k], ortho[k])
+            if previous_norm is not None and gram[k, k] >= previous_norm:
+                raise _PrecisionLoss("Size reduction of row %d stopped making progress." % k)
+            previous_norm = gram[k, k]
 
-        lhs = delta * norm_sq_prev
-        rhs = norm_sq_curr + mu[k, k - 1]**2 * norm_sq_prev
+            # Only the coefficients that round to a nonzero multiplier change the row.
+            indices, multipliers = [], []
+            row = mu[k]
+            for j in range(k - 1, -1, -1):  # j < k
+                if -0.5 <= row[j] <= 0.5:
+                    continue
+                X = round(row[j])
+                indices.append(j)
+                multipliers.append(X)
+                row[:j] -= X * mu[j, :j]
 
-        if lhs > rhs:
-            basis[k], basis[k - 1] = basis[k - 1], basis[k].copy()
+            if rows.dtype != object and max(map(abs, multipliers)) >= 2 ** 31:
+                raise _PrecisionLoss("Multipliers exceed the machine integer range.")
+
+            x = np.array(multipliers, dtype=rows.dtype)
+            rows[k] -= x @ rows[indices]
+            if U is not None:
+                U[k] -= x @ U[indices]
+            gram[k] = gram[:, k] = rows @ rows[k]
+
+        if delta_f * r[k - 1, k - 1] > lovasz:
+            swaps_left -= 1
+            if swaps_left < 0:
+                raise _PrecisionLoss("Lovász progress stalled.")
+
+            _swap_rows(rows, k)
+            if U is not None:
+                _swap_rows(U, k)
+            gram[[k - 1, k]] = gram[[k, k - 1]]
+            gram[:, [k - 1, k]] = gram[:, [k, k - 1]]
+
+            if k == 1:
+                _cholesky_row(_as_floats(gram[0], dtype), r, mu, inverse, 0)
 
             k = max(k - 1, 1)
         else:
+            if not r[k, k] > 0:
+                raise _PrecisionLoss("Non-positive Gram-Schmidt norm.")
+            _extend_inverse(mu, inverse, k)
             k += 1
 
-    return basis
+    # Fresh recomputation of the Gram-Schmidt data to catch accumulated drift.
+    for i in range(n):
+        lovasz = _cholesky_row(_as_floats(gram[i], dtype), r, mu, inverse, i)
+        _extend_inverse(mu, inverse, i)
+
+        if not r[i, i] > 0 or i and (np.any(np.abs(mu[i, :i]) > eta_f)
+                                     or delta_f * r[i - 1, i - 1] > lovasz):
+            raise _PrecisionLoss("Result is not LLL-reduced in the working precision.")
 
 
+def lll_reduce_fp(basis, delta=0.75, eta=0.51, return_transform=False):
+    """
+    Performs LLL reduction in floating-point arithmetic with adaptive precision.
+
+    This is an L2-style variant of :func:`lll_reduce` (after Nguyen and Stehlé): the Gram
+    matrix of the basis is kept exactly, while the Gram-Schmidt coefficients are computed
+    from it in float64 arithmetic, one row per matrix-vector product, and size reduction
+    is repeated lazily until every ``|mu[k, j]| <= eta``. For bases with moderate entries
+    it is about as fast as :func:`lll_reduce`; it pays off for large entries, for which
+    :func:`lll_reduce` has to use its exact integral engine.
+
+    Loss of precision is detected when a size reduction no longer shortens the vector,
+    when the number of swaps exceeds the bound implied by the lattice potential, or when
+    a final recomputation of the Gram-Schmidt data shows the result is not reduced. The
+    run is then continued from the current basis in extended precision
+    (``numpy.longdouble``) and, if that fails as well, with the exact integral engine, so
+    the result is always a reduced basis.
+
+    :param basis: A list of NumPy vectors or a 2-D array (one basis vector per row) with
+                  integer entries.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+    :param delta: Lovász parameter, typically in the range (0.5, 1). Default is 0.75.
+    :type delta: float
+    :param eta: Size-reduction parameter, slightly above 0.5. Default is 0.51.
+    :type eta: float
+    :param return_transform: If True, also returns the unimodular matrix ``U`` with
+                             ``reduced = U @ basis``.
+    :type return_transform: bool
+
+    :return: The LLL-reduced basis in the same form as the input (list of vectors or
+             2-D array); if ``return_transform`` is True, a tuple (reduced, U).
+    :rtype: list[numpy.ndarray] or numpy.ndarray or tuple
+
+    :raises ValueError: If the basis has non-integer entries or ``eta`` is out of range.
+
+    .. note::
+       This function assumes all basis vectors are linearly independent.
+
+    .. seealso::
+       :func:`lll_reduce` for the classical and the exact integral reduction.
+    """
+    if not 0.5 <= eta < np.sqrt(delta):
+        raise ValueError("eta must satisfy 0.5 <= eta < sqrt(delta).")
+
+    rows, is_array = _as_matrix(basis)
+    dtype = rows.dtype
+    n = rows.shape[0]
+
+    rows = _integer_matrix(rows)
+    if rows.size and rows.shape[1] * int(np.abs(rows).max())**2 < 2 ** 52:
+        rows = rows.astype(np.int64)
+
+    U = _identity(n, rows) if return_transform else None
+
+    if n > 1:
+        for precision in _FP_PRECISIONS:
+            try:
+                _lll_l2(rows, U, delta, eta, precision)
+                break
+            except _PrecisionLoss:
+                rows = rows.astype(object)
+                U = None if U is None else U.astype(object)
+        else:
+            _lll_integral(rows, U, _exact_delta(delta))
 
+    return _finish(rows, U, is_array, dtype)
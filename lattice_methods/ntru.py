@@ -8,9 +8,16 @@ It offers efficient lattice-based cryptographic primitives aimed at post-quantum
 supporting flexible parameter choices and secure message handling.
 """
 
-from sympy import Poly, symbols, invert, ZZ, gcd, GF, isprime
+from itertools import chain
+from numbers import Integral
+
+from sympy import Poly, symbols, ZZ, gcd, GF
 import numpy as np
 
+from lattice_methods.keys import NTRUPrivateKey, NTRUPublicKey, load_private_key, load_public_key
+from lattice_methods.ring import (ProductForm, SparseTernary, _ring_operand, ring_inverse,
+                                  ring_multiply, ring_multiply_many)
+
 x = symbols('x')
 
 def poly_inv_mod_ring(polynomial_f, N, q):
@@ -19,39 +26,38 @@ def poly_inv_mod_ring(polynomial_f, N, q):
 
     This function attempts to find the inverse of a given polynomial `polynomial_f` in the ring
     of polynomials modulo (pow(x,N) - 1) with coefficients reduced modulo `q`. It works both when `q`
-    is prime and composite by setting the appropriate polynomial domain.
+    is prime and composite: the inverse is computed with :func:`lattice_methods.ring.ring_inverse`
+    (extended Euclid modulo each prime factor of `q`, Newton lifting to prime powers such as
+    pow(2,k), and the Chinese remainder theorem).
 
-    :param polynomial_f: The polynomial to invert (as a SymPy Poly object).
-    :type polynomial_f: sympy.Poly
+    :param polynomial_f: The polynomial to invert (as a SymPy Poly object, or a list of
+                         integer coefficients with the highest degree first).
+    :type polynomial_f: sympy.Poly or list[int]
     :param N: The degree defining the modulus polynomial pow(x,N) - 1.
     :type N: int
     :param q: The modulus for coefficient arithmetic.
     :type q: int
 
-    :return: List of coefficients of the inverse polynomial if it exists; otherwise, None.
+    :return: List of coefficients of the inverse polynomial (highest degree first, in the
+             symmetric range (-q/2, q/2]) if it exists; otherwise, None.
     :rtype: list[int] or None
 
     .. note::
        The function returns None if `polynomial_f` is not invertible modulo (pow(x,N) - 1, q), i.e., if
-       the gcd of `polynomial_f` and the modulus polynomial is not constant.
+       the gcd of `polynomial_f` and the modulus polynomial modulo some prime factor of `q` is not constant.
     """
+    if isinstance(polynomial_f, Poly):
+        polynomial_f = polynomial_f.all_coeffs()
 
-    #f = Poly(f_coeffs, x, domain=GF(q))
-    if(isprime(q)):
-        mod_poly = Poly(x**N - 1, x, domain=GF(q))
-    else:
-        mod_poly = Poly(x ** N - 1, x, domain=ZZ).trunc(q)
-
-    polynomial_f = polynomial_f.set_domain(mod_poly.domain)
-
-    if gcd(polynomial_f, mod_poly).degree() != 0:
+    inverse = ring_inverse([int(c) for c in polynomial_f[::-1]], N, q)
+    if inverse is None:
         return None
 
-    try:
-        inv = invert(polynomial_f, mod_poly)
-        return inv.all_coeffs()
-    except Exception:
-        return None
+    coeffs = [c if c <= q // 2 else c - q for c in map(int, inverse[::-1])]
+    while len(coeffs) > 1 and coeffs[0] == 0:
+        coeffs.pop(0)
+
+    return coeffs
 
 def pad_left(poly, N):
     return [0] * (N - len(poly)) + poly
@@ -94,6 +100,23 @@ def poly_mult_mod_ring(p1, p2, N, q):
     .. note::
         The input polynomials are assumed to be represented as lists of coefficients with
         the highest degree coefficient first. The output is normalized to remove trailing zeros.
+
+    .. note::
+        Integer coefficients are multiplied with :func:`lattice_methods.ring.ring_multiply`
+        (vectorized convolution, FFT or exact big-integer product, chosen by size);
+        other coefficients (e.g. rationals) use the exact schoolbook product.
+    """
+    if len(p1) == 0 or len(p2) == 0 or not all(isinstance(c, Integral) for c in chain(p1, p2)):
+        return _poly_mult_schoolbook(p1, p2, N, q)
+
+    length = min(len(p1) + len(p2) - 1, N)
+    result = ring_multiply(p1[::-1], p2[::-1], N, q)[:length]
+
+    return [int(c) for c in result[::-1]]
+
+def _poly_mult_schoolbook(p1, p2, N, q):
+    """
+    Schoolbook version of :func:`poly_mult_mod_ring` for arbitrary coefficient types.
     """
     p1 = p1[::-1]
     p2 = p2[::-1]
@@ -119,6 +142,17 @@ def poly_mult_mod_ring(p1, p2, N, q):
 
     return [c % q for c in result[::-1]]
 
+def _is_sparse(polynomial):
+    return isinstance(polynomial, (SparseTernary, ProductForm))
+
+def _as_poly(polynomial):
+    """
+    Converts a sparse ternary or product-form polynomial into a SymPy Poly.
+    """
+    if _is_sparse(polynomial):
+        return Poly([int(c) for c in polynomial.coefficients()[::-1]], x, domain=ZZ)
+    return polynomial
+
 def check_coeff_range(poly_coeffs, bounds):
     """
     Checks whether all polynomial coefficients lie within specified bounds.
@@ -172,40 +206,39 @@ def ntru_generate_keys(N : int, p: int, q : int, polynomial_g : Poly, polynomial
     :type p: int
     :param q: Large modulus parameter for polynomial arithmetic.
     :type q: int
-    :param polynomial_g: Polynomial used in key generation (SymPy Poly).
-    :type polynomial_g: sympy.Poly
-    :param polynomial_f: Private polynomial used for key generation (SymPy Poly).
-    :type polynomial_f: sympy.Poly
+    :param polynomial_g: Polynomial used in key generation (SymPy Poly, or a sparse
+                         ternary / product-form polynomial).
+    :type polynomial_g: sympy.Poly or SparseTernary or ProductForm
+    :param polynomial_f: Private polynomial used for key generation (SymPy Poly, or a sparse
+                         ternary / product-form polynomial, which is then kept in the
+                         private key so that decryption uses the sparse product).
+    :type polynomial_f: sympy.Poly or SparseTernary or ProductForm
 
     :return: Tuple `(pub_key, prv_key)` where
-         - `pub_key` is a list `[N, p, q, h]` representing the public key parameters and polynomial,
-         - `prv_key` is a list `[polynomial_f, Fp]` representing the private key polynomial and its inverse modulo p.
-    :rtype: tuple[list, list]
+         - `pub_key` is an :class:`~lattice_methods.keys.NTRUPublicKey` that unpacks as `[N, p, q, h]`,
+         - `prv_key` is an :class:`~lattice_methods.keys.NTRUPrivateKey` that unpacks as `[polynomial_f, Fp]`,
+           the private key polynomial and its inverse modulo p.
+    :rtype: tuple[NTRUPublicKey, NTRUPrivateKey]
     """
 
     if(gcd(p, q) != 1 or p >= q):
         print("ERROR SMTH WRONG WITH p, q ")
         return
 
-    if(isprime(q)):
-        poly_f_over_q = Poly(polynomial_f, x, domain=GF(q))
-    else:
-        poly_f_over_q = Poly(polynomial_f, x, domain=ZZ).trunc(q)
-
-    poly_f_over_p = Poly(polynomial_f, x, domain=GF(p))
+    dense_f = _as_poly(polynomial_f)
 
-    Fp = poly_inv_mod_ring(poly_f_over_p, N, p)
-    Fq = poly_inv_mod_ring(poly_f_over_q, N, q)
+    Fp = poly_inv_mod_ring(dense_f, N, p)
+    Fq = poly_inv_mod_ring(dense_f, N, q)
 
     if Fp is None or Fq is None:
         print("ERROR SMTH WRONG WITH POLYNOMIALS Fq Fp")
         return
 
     Fqp = [p * x for x in Fq]
-    h = poly_mult_mod_ring(Fqp, polynomial_g.all_coeffs(), N, q)
+    h = poly_mult_mod_ring(Fqp, _as_poly(polynomial_g).all_coeffs(), N, q)
 
-    pub_key = [N, p, q, h]
-    prv_key = [polynomial_f, Fp]
+    pub_key = NTRUPublicKey(N, p, q, h)
+    prv_key = NTRUPrivateKey(N, p, q, polynomial_f, Fp)
 
     return pub_key, prv_key
 
@@ -217,23 +250,29 @@ def ntru_encryption(pubkey, polynomial_phi: Poly, polynomial_m: Poly):
     the sum of the product of the random polynomial `polynomial_phi` with the public key polynomial `h`,
     plus the message polynomial `polynomial_m`, all modulo `q`.
 
-    :param pubkey: Public key represented as a list `[N, p, q, h]`.
-    :type pubkey: list
-    :param polynomial_phi: Random polynomial used for encryption (SymPy Poly).
-    :type polynomial_phi: sympy.Poly
+    :param pubkey: Public key object, or a list `[N, p, q, h]` (loaded through the key cache).
+    :type pubkey: NTRUPublicKey or list
+    :param polynomial_phi: Random polynomial used for encryption (SymPy Poly, or a sparse
+                           ternary / product-form polynomial).
+    :type polynomial_phi: sympy.Poly or SparseTernary or ProductForm
     :param polynomial_m: Message polynomial to encrypt (SymPy Poly).
     :type polynomial_m: sympy.Poly
 
     :return: Ciphertext polynomial coefficients modulo q.
     :rtype: list[int]
     """
-    N, p, q, h = pubkey
+    key = load_public_key(pubkey)
+    N, p, q, h = key
 
-    phi_coeffs = polynomial_phi.all_coeffs()
     m_coeffs = polynomial_m.all_coeffs()
 
-    c = poly_mult_mod_ring(phi_coeffs, h, N, q)
-    ciphertext = poly_add_mod_ring(c, m_coeffs, q)
+    if _is_sparse(polynomial_phi):
+        c = polynomial_phi.multiply(key.h_coeffs, q)
+    else:
+        phi_coeffs = polynomial_phi.all_coeffs()
+        length = min(len(phi_coeffs) + len(h) - 1, N)
+        c = ring_multiply(phi_coeffs[::-1], key.h_coeffs, N, q)[:length]
+    ciphertext = poly_add_mod_ring([int(v) for v in c[::-1]], m_coeffs, q)
 
     return ciphertext
 
@@ -245,36 +284,109 @@ def ntru_decryption(pubkey, prvkey, ciphertext):
     polynomial `polynomial_f` modulo (pow(x,N) - 1, q), centering the coefficients if needed,
     and then multiplying by the inverse of `polynomial_f` modulo p to recover the original message polynomial.
 
-    :param pubkey: Public key represented as a list `[N, p, q, h]`.
-    :type pubkey: list
-    :param prvkey: Private key represented as a list `[polynomial_f, Fp]`,
-                   where `polynomial_f` is the private polynomial and `Fp` its inverse modulo p.
-    :type prvkey: list
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+    :param prvkey: Private key object, or a list `[polynomial_f, Fp]` (loaded through the key cache),
+                   where `polynomial_f` is the private polynomial (SymPy Poly, or a sparse
+                   ternary / product-form polynomial) and `Fp` its inverse modulo p.
+    :type prvkey: NTRUPrivateKey or list
     :param ciphertext: Ciphertext polynomial coefficients.
     :type ciphertext: list[int]
 
     :return: Decrypted message polynomial over GF(p).
     :rtype: sympy.Poly
     """
-    [polynomial_f, Fp] = prvkey
-    N, p, q, h = pubkey
+    key = load_private_key(pubkey, prvkey)
+    polynomial_f = key.f
+    N, p, q = key.N, key.p, key.q
 
-    f_coeffs = polynomial_f.all_coeffs()
-    a = poly_mult_mod_ring(f_coeffs, ciphertext, N, q)
+    c_coeffs = [int(c) for c in ciphertext[::-1]]
+    if _is_sparse(polynomial_f):
+        a = polynomial_f.multiply(c_coeffs, q)
+    else:
+        a = ring_multiply(key.f_coeffs, c_coeffs, N, q)
+    a = [int(c) for c in a[::-1]]
 
     cond = check_coeff_range(a, (-q/2, q/2))
     if not cond:
         a = center_poly_coeffs(a, q)
 
-    Fpa = poly_mult_mod_ring(Fp, a, N, p)
+    Fpa = ring_multiply(key.Fp_coeffs, a[::-1], N, p)
     #print(Poly(Fpa, x, domain=GF(p)))
 
-    return Poly(Fpa, x, domain=GF(p))
+    return Poly([int(c) for c in Fpa[::-1]], x, domain=GF(p))
 
+def _low_first(polynomials):
+    """
+    Converts polynomials given as rows (highest degree first) into a 2-D array with the
+    lowest degree first.
+    """
+    rows = np.atleast_2d(np.array(polynomials))
+    if rows.dtype.kind not in "iuO":
+        rows = rows.astype(np.int64)
+    return rows[:, ::-1]
 
+def ntru_encryption_many(pubkey, phis, messages):
+    """
+    Encrypts a batch of message polynomials using the NTRU public key.
+
+    This is the batch version of :func:`ntru_encryption`: row i of the result is the
+    ciphertext ``phis[i] * h + messages[i]`` modulo (pow(x,N) - 1, q). The transform of `h`
+    is computed once and all products are done in a single vectorized FFT pass
+    (see :func:`lattice_methods.ring.ring_multiply_many`).
+
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+    :param phis: Random polynomials used for encryption, one per row (highest degree first).
+    :type phis: numpy.ndarray
+    :param messages: Message polynomials to encrypt, one per row (highest degree first).
+    :type messages: numpy.ndarray
+
+    :return: Array of shape (B, N) with one ciphertext per row (highest degree first, modulo q).
+             A row can be passed to :func:`ntru_decryption` as a list.
+    :rtype: numpy.ndarray
+    """
+    key = load_public_key(pubkey)
+    N, p, q = key.N, key.p, key.q
 
+    c = ring_multiply_many(_low_first(phis), key.h_coeffs, N, q, spectrum=key.h_spectrum)
+    ciphertexts = (c + _ring_operand(_low_first(messages), N, q)) % q
 
+    return ciphertexts[:, ::-1]
 
+def ntru_decryption_many(pubkey, prvkey, ciphertexts):
+    """
+    Decrypts a batch of ciphertext polynomials using the NTRU private key.
+
+    This is the batch version of :func:`ntru_decryption`. The products with `polynomial_f`
+    and `Fp` are each computed for all ciphertexts at once with one transform of the key
+    polynomial (or with the shifted additions of a sparse `polynomial_f`), and rows whose
+    coefficients leave the range [-q/2, q/2] are centered exactly as in the scalar version.
+
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+    :param prvkey: Private key object, or a list `[polynomial_f, Fp]`.
+    :type prvkey: NTRUPrivateKey or list
+    :param ciphertexts: Ciphertext polynomials, one per row (highest degree first).
+    :type ciphertexts: numpy.ndarray
+
+    :return: Array of shape (B, N) with the decrypted messages (highest degree first), with
+             coefficients in the symmetric range (-p/2, p/2] as printed by a Poly over GF(p).
+    :rtype: numpy.ndarray
+    """
+    key = load_private_key(pubkey, prvkey)
+    N, p, q = key.N, key.p, key.q
+
+    ciphertexts = _low_first(ciphertexts)
+    if _is_sparse(key.f):
+        a = key.f.multiply(ciphertexts, q)
+    else:
+        a = ring_multiply_many(ciphertexts, key.f_coeffs, N, q, spectrum=key.f_spectrum)
 
+    outside = (a > q / 2).any(axis=1)
+    a = np.where(outside[:, None], (a + key.q_half) % q - key.q_half, a)
 
+    m = ring_multiply_many(a, key.Fp_coeffs, N, p, spectrum=key.Fp_spectrum)
+    m = np.where(m > key.p_half, m - p, m)
 
+    return m[:, ::-1]
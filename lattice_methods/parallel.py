@@ -0,0 +1,138 @@
+"""
+Parallel execution helpers for running lattice reductions over many bases.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+This module spreads independent jobs over a process pool. Jobs are scheduled in chunks
+so that small inputs are not dominated by inter-process communication, results can be
+collected in input order or streamed as they complete, and every job can be given a
+time limit after which it is stopped without affecting the others.
+"""
+
+import multiprocessing
+import os
+import signal
+from functools import partial
+
+from lattice_methods.lll import lll_reduce
+
+
+class _JobTimeout(Exception):
+    """
+    Raised inside a worker when a job exceeds its time limit.
+    """
+
+
+def _raise_timeout(signum, frame):
+    raise _JobTimeout()
+
+
+def _run_job(item, func, timeout, kwargs):
+    """
+    Runs ``func`` on one indexed item, returning ``(index, result)``.
+
+    If ``timeout`` is given, the job is interrupted with a real-time timer signal after
+    that many seconds and ``(index, None)`` is returned instead.
+    """
+    index, value = item
+
+    if timeout is None or not hasattr(signal, "setitimer"):
+        return index, func(value, **kwargs)
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            return index, func(value, **kwargs)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except _JobTimeout:
+        return index, None
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _default_chunksize(jobs, workers):
+    """
+    Chooses a chunk size giving every worker about four chunks.
+    """
+    return max(1, jobs // (4 * workers))
+
+
+def _iter_jobs(func, values, workers=None, chunksize=None, timeout=None, ordered=True, **kwargs):
+    """
+    Applies ``func`` to every value in a process pool and yields ``(index, result)`` pairs.
+
+    :param func: Picklable (module-level) function to apply.
+    :param values: Sequence of inputs.
+    :param workers: Number of worker processes; defaults to the number of CPUs. With a
+                    single worker the jobs run in the calling process.
+    :param chunksize: Number of jobs sent to a worker at once.
+    :param timeout: Per-job time limit in seconds; timed-out jobs yield None.
+    :param ordered: If True, results are yielded in input order, otherwise as they complete.
+    :param kwargs: Additional keyword arguments for ``func``.
+    """
+    values = list(values)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, max(len(values), 1))
+    job = partial(_run_job, func=func, timeout=timeout, kwargs=kwargs)
+
+    if workers == 1:
+        for item in enumerate(values):
+            yield job(item)
+        return
+
+    if chunksize is None:
+        chunksize = _default_chunksize(len(values), workers)
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        for result in mapper(job, enumerate(values), chunksize):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def lll_reduce_many(bases, workers=None, chunksize=None, timeout=None, stream=False,
+                    reducer=lll_reduce, **kwargs):
+    """
+    Reduces many independent lattice bases in parallel.
+
+    The bases are distributed over a pool of worker processes in chunks, so that many
+    small bases do not pay the inter-process overhead one by one. Each basis can be given
+    a time limit; a reduction exceeding it is stopped and reported as None while all other
+    bases are still processed.
+
+    :param bases: Lattice bases, each a list of NumPy vectors.
+    :type bases: list[list[numpy.ndarray]]
+    :param workers: Number of worker processes. Defaults to the number of CPUs; with a
+                    single worker everything runs in the calling process.
+    :type workers: int or None
+    :param chunksize: Number of bases sent to a worker at once. By default every worker
+                      gets about four chunks.
+    :type chunksize: int or None
+    :param timeout: Time limit per basis in seconds (requires ``signal.setitimer``,
+                    i.e. a POSIX system; ignored elsewhere).
+    :type timeout: float or None
+    :param stream: If True, returns a generator yielding ``(index, reduced)`` pairs in
+                   the order in which the reductions complete.
+    :type stream: bool
+    :param reducer: Picklable reduction function, e.g. :func:`lattice_methods.lll.lll_reduce_fp`
+                    or :func:`lattice_methods.bkz.bkz_reduce`. Default is ``lll_reduce``.
+    :type reducer: callable
+    :param kwargs: Additional keyword arguments for the reducer, e.g. ``delta``.
+
+    :return: The reduced bases in input order (None for bases that timed out), or a
+             generator of ``(index, reduced)`` pairs if ``stream`` is True.
+    :rtype: list[list[numpy.ndarray] or None] or Iterator[tuple[int, list[numpy.ndarray] or None]]
+    """
+    jobs = _iter_jobs(reducer, bases, workers=workers, chunksize=chunksize, timeout=timeout,
+                      ordered=not stream, **kwargs)
+
+    if stream:
+        return jobs
+
+    return [reduced for _, reduced in jobs]
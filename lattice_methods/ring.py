@@ -0,0 +1,580 @@
+"""
+Fast polynomial arithmetic in the NTRU ring Z_q[x]/(x^N - 1).
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+This module multiplies polynomials modulo ``x^N - 1`` (cyclic convolution) with one of
+three engines, chosen by the size of the operands and of their coefficients:
+
+- a direct NumPy convolution in int64 for short polynomials,
+- a floating-point FFT product for long polynomials, used only when the coefficients of
+  the result are small enough that rounding the FFT output is exact,
+- an exact big-integer product (Kronecker substitution: the polynomials are packed into
+  two Python integers, whose product is computed with CPython's Karatsuba multiplication)
+  whenever the coefficients could overflow int64 or the float mantissa.
+
+All engines produce the same exact result. Polynomials are coefficient arrays with the
+lowest degree first. Many polynomials multiplied by the same one (e.g. blinding
+polynomials by a public key) are handled in one vectorized FFT pass that reuses the
+transform of the common factor.
+
+Inverses in Z_q[x]/(x^N - 1) are computed natively as well: by the extended Euclidean
+algorithm modulo every prime dividing q, lifted to prime powers by Newton (Hensel)
+iteration and combined by the Chinese remainder theorem.
+
+The NTRU private and blinding polynomials are ternary and sparse. :class:`SparseTernary`
+stores only the positions of their +1 and -1 coefficients and multiplies by a dense
+polynomial with ``O(d N)`` shifted additions; :class:`ProductForm` represents
+``f1 * f2 + f3`` with three sparse factors, which is cheaper still.
+"""
+
+import numpy as np
+from sympy import factorint
+
+# Below this length the direct convolution is faster than the FFT.
+_FFT_THRESHOLD = 256
+
+# Above this number of nonzero coefficients a sparse product is computed densely.
+_SPARSE_THRESHOLD = 64
+
+# Coefficients of a product computed in int64 must stay below this bound.
+_INT64_BOUND = 2 ** 62
+
+# Coefficients of a product computed by FFT must stay below this bound divided by the
+# transform length, so that the accumulated rounding error stays well below 1/2.
+_FFT_BOUND = 2 ** 50
+
+
+def _as_integers(a):
+    """
+    Converts a coefficient sequence into an int64 array, or an object array of Python
+    integers if the coefficients do not fit into int64.
+    """
+    a = np.asarray(a)
+    if a.dtype.kind in "iu":
+        return a.astype(np.int64)
+
+    a = np.array([int(c) for c in a.ravel()], dtype=object).reshape(a.shape)
+    try:
+        return a.astype(np.int64)
+    except OverflowError:
+        return a
+
+
+def _max_abs(a):
+    """
+    Returns the largest absolute value of a coefficient array as a Python integer.
+    """
+    if a.size == 0:
+        return 0
+    if a.dtype != object:
+        return max(abs(int(a.min())), abs(int(a.max())))
+    return max(abs(int(c)) for c in a.ravel())
+
+
+def _mod(a, q):
+    """
+    Reduces an integer array into ``[0, q)``, switching to Python integers for huge q.
+    """
+    if a.dtype != object and q > np.iinfo(np.int64).max:
+        a = a.astype(object)
+    return _as_integers(a % q)
+
+
+def _product_bound(a, b, N):
+    """
+    Bounds the absolute value of every coefficient of ``a * b mod (x^N - 1)``.
+
+    Each coefficient of the linear product is a sum of at most ``min(len(a), len(b))``
+    terms, and folding modulo ``x^N - 1`` adds up at most ``ceil(length / N)`` of them.
+    """
+    length = len(a) + len(b) - 1
+    return -(-length // N) * min(len(a), len(b)) * _max_abs(a) * _max_abs(b)
+
+
+def _fold(product, N):
+    """
+    Reduces a linear product modulo ``x^N - 1`` by adding up its length-N pieces.
+
+    Works along the last axis, so a stack of polynomials is folded at once.
+    """
+    length = product.shape[-1]
+    pieces = max(-(-length // N), 1)
+    padded = np.zeros(product.shape[:-1] + (pieces * N,), dtype=product.dtype)
+    padded[..., :length] = product
+    return padded.reshape(product.shape[:-1] + (pieces, N)).sum(axis=-2)
+
+
+def _ring_operand(dense, N, q):
+    """
+    Prepares an operand (a polynomial or a stack of them) for a product with N coefficients.
+
+    The operand is folded to length N and reduced modulo q if q is given; the dtype is
+    int64 unless the coefficients are too large.
+    """
+    dense = _as_integers(dense)
+    if dense.shape[-1] != N:
+        dense = _fold(dense, N)
+    if q is not None:
+        dense = _mod(dense, q)
+    return dense
+
+
+def _convolve_fft(a, b):
+    """
+    Linear convolution of two int64 arrays via a real FFT, rounded to integers.
+    """
+    length = len(a) + len(b) - 1
+    size = 1 << (length - 1).bit_length()
+    product = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:length]
+    return np.rint(product).astype(np.int64)
+
+
+def _pack(a, width):
+    """
+    Packs non-negative integers into one integer, ``width`` bytes per coefficient.
+    """
+    return int.from_bytes(b"".join(int(c).to_bytes(width, "little") for c in a), "little")
+
+
+def _convolve_kronecker(a, b):
+    """
+    Exact linear convolution of two integer arrays by Kronecker substitution.
+
+    The coefficients are split into their positive and negative parts; each of the four
+    partial products is computed as a single product of packed Python integers, with
+    slots wide enough that no coefficient of the product can overflow into the next.
+    """
+    length = len(a) + len(b) - 1
+    bound = min(len(a), len(b)) * _max_abs(a) * _max_abs(b)
+    width = (bound.bit_length() + 8) // 8
+
+    a = a.astype(object)
+    b = b.astype(object)
+    result = np.zeros(length, dtype=object)
+
+    for a_part, a_sign in ((np.maximum(a, 0), 1), (np.maximum(-a, 0), -1)):
+        for b_part, b_sign in ((np.maximum(b, 0), 1), (np.maximum(-b, 0), -1)):
+            if not a_part.any() or not b_part.any():
+                continue
+            packed = _pack(a_part, width) * _pack(b_part, width)
+            data = packed.to_bytes(length * width, "little")
+            result += a_sign * b_sign * np.array(
+                [int.from_bytes(data[i * width:(i + 1) * width], "little")
+                 for i in range(length)], dtype=object)
+
+    return result
+
+
+def _convolve(a, b, bound):
+    """
+    Exact linear convolution of two integer arrays with the fastest suitable engine.
+
+    ``bound`` bounds the coefficients of the result (after folding).
+    """
+    if a.dtype == object or b.dtype == object or bound >= _INT64_BOUND:
+        return _convolve_kronecker(a, b)
+
+    if min(len(a), len(b)) >= _FFT_THRESHOLD and bound * (len(a) + len(b)) < _FFT_BOUND:
+        return _convolve_fft(a, b)
+
+    return np.convolve(a, b)
+
+
+def ring_multiply(a, b, N, q=None):
+    """
+    Multiplies two polynomials in Z[x]/(x^N - 1), or in Z_q[x]/(x^N - 1) if q is given.
+
+    The operands may be longer than N; the full product is reduced modulo ``x^N - 1``.
+    If q is given and the coefficients are large, the operands are reduced modulo q
+    first, which keeps the product in the fast int64 engines whenever possible.
+
+    :param a: Coefficients of the first polynomial (lowest degree first).
+    :type a: list[int] or numpy.ndarray
+    :param b: Coefficients of the second polynomial (lowest degree first).
+    :type b: list[int] or numpy.ndarray
+    :param N: Degree of the modulus polynomial ``x^N - 1``.
+    :type N: int
+    :param q: Modulus for the coefficients, or None to compute over the integers.
+    :type q: int or None
+
+    :return: The N coefficients of the product (lowest degree first), reduced into
+             ``[0, q)`` if q is given. The array is int64 if the values fit, otherwise
+             it holds Python integers.
+    :rtype: numpy.ndarray
+    """
+    a = _as_integers(a)
+    b = _as_integers(b)
+    bound = _product_bound(a, b, N)
+
+    if q is not None and bound >= _INT64_BOUND:
+        a = _mod(a, q)
+        b = _mod(b, q)
+        bound = _product_bound(a, b, N)
+
+    result = _fold(_convolve(a, b, bound), N)
+
+    if q is not None:
+        return _mod(result, q)
+
+    return _as_integers(result) if result.dtype == object else result
+
+
+def _spectrum_size(N):
+    """
+    Returns the FFT length used for batch products: the smallest power of two that holds
+    a linear product of two polynomials with N coefficients. Powers of two transform
+    much faster than a length-N cyclic FFT for the prime N used in NTRU.
+    """
+    return 1 << (2 * N - 2).bit_length()
+
+
+def ring_spectrum(b, N):
+    """
+    Precomputes the FFT of a polynomial for :func:`ring_multiply_many`.
+
+    :param b: Coefficients of the polynomial (lowest degree first).
+    :type b: list[int] or numpy.ndarray
+    :param N: Degree of the modulus polynomial ``x^N - 1``.
+    :type N: int
+
+    :return: The spectrum of ``b mod (x^N - 1)``.
+    :rtype: numpy.ndarray
+    """
+    return np.fft.rfft(np.array(_fold(_as_integers(b), N), dtype=float), _spectrum_size(N))
+
+
+def ring_multiply_many(a, b, N, q=None, spectrum=None):
+    """
+    Multiplies many polynomials by one common polynomial in Z[x]/(x^N - 1) or
+    Z_q[x]/(x^N - 1).
+
+    The rows of ``a`` are transformed together and multiplied with the transform of
+    ``b``, which is computed once (or passed in precomputed), so the whole batch costs
+    one vectorized pass; the linear products are then folded modulo ``x^N - 1``. If the
+    coefficients are too large for the FFT to be exact,
+    each row is multiplied with :func:`ring_multiply` instead.
+
+    :param a: Polynomials (lowest degree first), one per row.
+    :type a: numpy.ndarray
+    :param b: Coefficients of the common polynomial (lowest degree first).
+    :type b: list[int] or numpy.ndarray
+    :param N: Degree of the modulus polynomial ``x^N - 1``.
+    :type N: int
+    :param q: Modulus for the coefficients, or None to compute over the integers.
+    :type q: int or None
+    :param spectrum: The result of ``ring_spectrum(b, N)``, if already available.
+    :type spectrum: numpy.ndarray or None
+
+    :return: Array with the N coefficients of every product, one per row, reduced into
+             ``[0, q)`` if q is given.
+    :rtype: numpy.ndarray
+    """
+    a = _ring_operand(np.atleast_2d(a), N, q)
+    b = _ring_operand(b, N, q)
+
+    bound = N * _max_abs(a) * _max_abs(b)
+    if a.dtype == object or b.dtype == object or bound * N >= _FFT_BOUND:
+        return np.array([ring_multiply(row, b, N, q) for row in a]).reshape(a.shape)
+
+    if spectrum is None:
+        spectrum = ring_spectrum(b, N)
+
+    size = _spectrum_size(N)
+    product = np.fft.irfft(np.fft.rfft(a, size, axis=-1) * spectrum, size, axis=-1)
+    result = _fold(np.rint(product[..., :2 * N - 1]).astype(np.int64), N)
+
+    return result % q if q is not None else result
+
+
+def _degree(a, start):
+    """
+    Returns the degree of the polynomial ``a[:start + 1]``, or -1 if it is zero.
+    """
+    nonzero = np.flatnonzero(a[:start + 1])
+    return int(nonzero[-1]) if len(nonzero) else -1
+
+
+def _inverse_mod_prime(a, N, p):
+    """
+    Inverts a polynomial in GF(p)[x]/(x^N - 1) with the extended Euclidean algorithm.
+
+    The remainders are reduced one leading term at a time, which keeps every step a
+    single vectorized update of the remainder and of its Bezout coefficient.
+
+    :return: The N coefficients of the inverse, or None if it does not exist.
+    :rtype: numpy.ndarray or None
+    """
+    dtype = np.int64 if p < 2 ** 31 else object
+    size = 2 * N + 1
+
+    r0 = np.zeros(N + 1, dtype=dtype)
+    r0[0], r0[N] = p - 1, 1
+    r1 = np.zeros(N + 1, dtype=dtype)
+    r1[:N] = _mod(a, p)
+    s0 = np.zeros(size, dtype=dtype)
+    s1 = np.zeros(size, dtype=dtype)
+    s1[0] = 1
+
+    d0, d1 = N, _degree(r1, N)
+    if d1 < 0:
+        return None
+
+    while d1 > 0:
+        lead_inverse = pow(int(r1[d1]), -1, p)
+        while d0 >= d1:
+            c = int(r0[d0]) * lead_inverse % p
+            shift = d0 - d1
+            r0[shift:d0 + 1] = (r0[shift:d0 + 1] - c * r1[:d1 + 1]) % p
+            s0[shift:] = (s0[shift:] - c * s1[:size - shift]) % p
+            d0 = _degree(r0, d0)
+
+        r0, r1, s0, s1, d0, d1 = r1, r0, s1, s0, d1, d0
+        if d1 < 0:
+            return None
+
+    return _mod(_fold(s1 * pow(int(r1[0]), -1, p), N), p)
+
+
+def _inverse_mod_prime_power(a, N, p, k):
+    """
+    Inverts a polynomial in Z_{p^k}[x]/(x^N - 1) by Newton iteration from the inverse
+    modulo p: if ``a F = 1 mod m``, then ``F (2 - a F)`` is the inverse modulo ``m^2``.
+    """
+    inverse = _inverse_mod_prime(a, N, p)
+    if inverse is None:
+        return None
+
+    modulus, q = p, p ** k
+    while modulus < q:
+        modulus = min(modulus * modulus, q)
+        correction = -ring_multiply(a, inverse, N, modulus)
+        correction[0] += 2
+        inverse = ring_multiply(inverse, correction, N, modulus)
+
+    return inverse
+
+
+def ring_inverse(a, N, q):
+    """
+    Inverts a polynomial in Z_q[x]/(x^N - 1).
+
+    For every prime power ``p^k`` dividing q the polynomial is inverted modulo p with the
+    extended Euclidean algorithm and the inverse is lifted to ``p^k`` by Newton
+    iteration; the results are combined by the Chinese remainder theorem. A polynomial
+    is invertible modulo q exactly if it is invertible modulo every prime dividing q.
+
+    :param a: Coefficients of the polynomial (lowest degree first).
+    :type a: list[int] or numpy.ndarray
+    :param N: Degree of the modulus polynomial ``x^N - 1``.
+    :type N: int
+    :param q: Modulus for the coefficients (at least 2).
+    :type q: int
+
+    :return: The N coefficients of the inverse (lowest degree first) in ``[0, q)``, or
+             None if the polynomial is not invertible.
+    :rtype: numpy.ndarray or None
+
+    :raises ValueError: If q is smaller than 2.
+    """
+    if q < 2:
+        raise ValueError("The modulus q must be at least 2.")
+
+    a = _fold(_as_integers(a), N)
+    result = np.zeros(N, dtype=object)
+
+    for p, k in factorint(q).items():
+        inverse = _inverse_mod_prime_power(a, N, p, k)
+        if inverse is None:
+            return None
+
+        m = p ** k
+        cofactor = q // m
+        result += inverse.astype(object) * (cofactor * pow(cofactor, -1, m))
+
+    return _mod(result, q)
+
+
+class SparseTernary:
+    """
+    A ternary polynomial in Z[x]/(x^N - 1), stored as the positions of its nonzero
+    coefficients.
+
+    :param N: Degree of the modulus polynomial ``x^N - 1``.
+    :type N: int
+    :param plus: Exponents with coefficient +1.
+    :type plus: list[int] or numpy.ndarray
+    :param minus: Exponents with coefficient -1.
+    :type minus: list[int] or numpy.ndarray
+
+    :raises ValueError: If an exponent is outside ``[0, N)`` or occurs more than once.
+    """
+
+    __slots__ = ("N", "plus", "minus")
+
+    def __init__(self, N, plus, minus):
+        plus = np.unique(np.asarray(plus, dtype=np.int64))
+        minus = np.unique(np.asarray(minus, dtype=np.int64))
+        positions = np.concatenate([plus, minus])
+
+        if np.any(positions < 0) or np.any(positions >= N) \
+                or len(np.unique(positions)) != len(positions):
+            raise ValueError(f"Expected distinct exponents in [0, {N}).")
+
+        self.N = N
+        self.plus = plus
+        self.minus = minus
+
+    @classmethod
+    def from_coefficients(cls, coefficients, N=None):
+        """
+        Builds a sparse polynomial from its dense coefficients (lowest degree first).
+
+        :param coefficients: Coefficients in {-1, 0, 1}, at most N of them.
+        :type coefficients: list[int] or numpy.ndarray
+        :param N: Degree of the modulus polynomial; defaults to the number of coefficients.
+        :type N: int or None
+
+        :return: The sparse polynomial.
+        :rtype: SparseTernary
+
+        :raises ValueError: If a coefficient is not ternary or there are too many of them.
+        """
+        coefficients = _as_integers(coefficients)
+        N = len(coefficients) if N is None else N
+
+        if len(coefficients) > N or np.any(np.abs(coefficients) > 1):
+            raise ValueError(f"Expected at most {N} coefficients in {{-1, 0, 1}}.")
+
+        return cls(N, np.flatnonzero(coefficients == 1), np.flatnonzero(coefficients == -1))
+
+    @property
+    def weight(self):
+        """
+        Number of nonzero coefficients.
+        """
+        return len(self.plus) + len(self.minus)
+
+    def coefficients(self):
+        """
+        Returns the N dense coefficients (lowest degree first) as an int64 array.
+        """
+        result = np.zeros(self.N, dtype=np.int64)
+        result[self.plus] = 1
+        result[self.minus] = -1
+        return result
+
+    def multiply(self, dense, q=None):
+        """
+        Multiplies a dense polynomial, or a stack of them, by this polynomial.
+
+        Multiplying by ``x^i`` rotates the coefficients by i positions, so the product
+        is the sum of the rotations for the +1 positions minus the sum for the -1
+        positions. All rotations are read as windows of the operand repeated twice, so
+        every nonzero coefficient costs one vectorized addition over the whole stack.
+        With more than ``_SPARSE_THRESHOLD`` nonzero coefficients the dense engines
+        (:func:`ring_multiply`, or :func:`ring_multiply_many` for a stack) are faster
+        and are used instead.
+
+        :param dense: Coefficients of the dense polynomial (lowest degree first), or an
+                      array whose rows (last axis) are polynomials.
+        :type dense: list[int] or numpy.ndarray
+        :param q: Modulus for the coefficients, or None to compute over the integers.
+        :type q: int or None
+
+        :return: The product(s), with N coefficients each, reduced into ``[0, q)`` if q
+                 is given.
+        :rtype: numpy.ndarray
+        """
+        N = self.N
+        dense = _ring_operand(dense, N, q)
+        if dense.dtype != object and \
+                (self.weight + 1) * _max_abs(dense) >= _INT64_BOUND:
+            dense = dense.astype(object)
+
+        if self.weight > _SPARSE_THRESHOLD:
+            if dense.ndim == 1:
+                return ring_multiply(self.coefficients(), dense, N, q)
+            return ring_multiply_many(dense.reshape(-1, N), self.coefficients(), N, q) \
+                .reshape(dense.shape)
+
+        doubled = np.concatenate([dense, dense], axis=-1)
+        result = np.zeros(dense.shape, dtype=dense.dtype)
+        for start in ((N - self.plus) % N).tolist():
+            result += doubled[..., start:start + N]
+        for start in ((N - self.minus) % N).tolist():
+            result -= doubled[..., start:start + N]
+
+        if q is not None:
+            return _mod(result, q)
+
+        return _as_integers(result) if result.dtype == object else result
+
+    def __repr__(self):
+        return f"SparseTernary(N={self.N}, plus={self.plus.tolist()}, minus={self.minus.tolist()})"
+
+
+class ProductForm:
+    """
+    A polynomial ``f1 * f2 + f3`` in Z[x]/(x^N - 1) with sparse ternary factors.
+
+    A product-form polynomial has many more nonzero coefficients than its factors, but
+    multiplying by it costs only ``O((d1 + d2 + d3) N)``.
+
+    :param f1: First factor of the product.
+    :type f1: SparseTernary
+    :param f2: Second factor of the product.
+    :type f2: SparseTernary
+    :param f3: Summand.
+    :type f3: SparseTernary
+
+    :raises ValueError: If the factors belong to different rings.
+    """
+
+    __slots__ = ("f1", "f2", "f3")
+
+    def __init__(self, f1, f2, f3):
+        if not f1.N == f2.N == f3.N:
+            raise ValueError("All factors of a product-form polynomial must have the same N.")
+
+        self.f1 = f1
+        self.f2 = f2
+        self.f3 = f3
+
+    @property
+    def N(self):
+        """
+        Degree of the modulus polynomial ``x^N - 1``.
+        """
+        return self.f1.N
+
+    def coefficients(self):
+        """
+        Returns the N dense coefficients (lowest degree first) as an int64 array.
+        """
+        return self.f1.multiply(self.f2.coefficients()) + self.f3.coefficients()
+
+    def multiply(self, dense, q=None):
+        """
+        Multiplies a dense polynomial, or a stack of them, by this polynomial.
+
+        :param dense: Coefficients of the dense polynomial (lowest degree first), or an
+                      array whose rows (last axis) are polynomials.
+        :type dense: list[int] or numpy.ndarray
+        :param q: Modulus for the coefficients, or None to compute over the integers.
+        :type q: int or None
+
+        :return: The product(s), with N coefficients each, reduced into ``[0, q)`` if q
+                 is given.
+        :rtype: numpy.ndarray
+        """
+        dense = _ring_operand(dense, self.N, q)
+        result = self.f1.multiply(self.f2.multiply(dense, q), q) + self.f3.multiply(dense, q)
+
+        if q is not None:
+            return _mod(result, q)
+
+        return result
+
+    def __repr__(self):
+        return f"ProductForm({self.f1!r}, {self.f2!r}, {self.f3!r})"
@@ -0,0 +1,331 @@
+"""
+Compact binary format for NTRU keys and ciphertexts.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+Every object is stored as a fixed header (magic, format version, kind, N, p, q, number of
+polynomials and bits per coefficient) followed by the packed coefficients:
+
+- coefficients modulo q (public polynomial ``h``, ciphertexts) use ``ceil(log2 q)`` bits
+  each, stored as plain little-endian integers when that is a whole number of bytes,
+- ternary private polynomials are stored in base 3, five coefficients per byte
+  (1.6 bits per coefficient), and ``Fp`` uses ``ceil(log2 p)`` bits per coefficient.
+
+Loading reads the buffer in place with ``np.frombuffer`` on a memoryview; byte-aligned
+coefficients are returned as views without any copy, and a file of ciphertexts is mapped
+into memory instead of being read.
+"""
+
+import mmap
+import struct
+
+import numpy as np
+
+from lattice_methods.keys import NTRUPrivateKey, NTRUPublicKey, load_private_key, load_public_key
+from lattice_methods.ring import SparseTernary
+
+_FORMAT_MAGIC = b"NTRU"
+_FORMAT_VERSION = 1
+
+_PUBLIC_KEY = 1
+_PRIVATE_KEY = 2
+_CIPHERTEXTS = 3
+
+# Header: magic, version, kind, N, p, q, number of polynomials, bits per coefficient.
+_HEADER = struct.Struct("<4sBBIIQIB")
+
+# Ternary coefficients per byte (3^5 = 243 <= 256).
+_TRITS_PER_BYTE = 5
+
+
+def _bits(modulus):
+    """
+    Returns the number of bits needed for coefficients in ``[0, modulus)``.
+
+    :raises ValueError: If the modulus does not fit into 64 bits.
+    """
+    bits = max((modulus - 1).bit_length(), 1)
+    if bits > 64:
+        raise ValueError("The binary format supports moduli up to 2^64 only.")
+    return bits
+
+
+def _packed_size(count, bits):
+    return -(-count * bits // 8)
+
+
+def _pack(values, bits):
+    """
+    Packs non-negative integers with ``bits`` bits each (little-endian bit order).
+    """
+    values = np.asarray(values).ravel().astype("<u8")
+    if bits in (8, 16, 32, 64):
+        return values.astype(f"<u{bits // 8}").tobytes()
+
+    shifts = np.arange(bits, dtype=np.uint64)
+    bit_array = ((values[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+    return np.packbits(bit_array.ravel(), bitorder="little").tobytes()
+
+
+def _unpack(buffer, count, bits):
+    """
+    Unpacks ``count`` integers of ``bits`` bits each from a buffer.
+
+    Byte-aligned widths are returned as a read-only view of the buffer.
+    """
+    if bits in (8, 16, 32, 64):
+        return np.frombuffer(buffer, dtype=f"<u{bits // 8}", count=count)
+
+    raw = np.frombuffer(buffer, dtype=np.uint8, count=_packed_size(count, bits))
+    if bits > 56:
+        bit_array = np.unpackbits(raw, count=count * bits, bitorder="little").reshape(count, bits)
+        shifts = np.arange(bits, dtype=np.uint64)
+        return (bit_array.astype(np.uint64) << shifts).sum(axis=1)
+
+    # Every value lies within the bytes_per_value bytes starting at its first byte, so
+    # gather those bytes into one word and shift the value out of it.
+    bytes_per_value = (bits + 14) // 8
+    raw = np.concatenate([raw, np.zeros(bytes_per_value, dtype=np.uint8)])
+    offsets = np.arange(count, dtype=np.int64) * bits
+    first = offsets >> 3
+
+    words = np.zeros(count, dtype=np.uint64)
+    for k in range(bytes_per_value):
+        words |= raw[first + k].astype(np.uint64) << np.uint64(8 * k)
+
+    mask = np.uint64((1 << bits) - 1)
+    return ((words >> (offsets & 7).astype(np.uint64)) & mask).astype(np.int64)
+
+
+def _pack_ternary(coefficients):
+    """
+    Packs coefficients in {-1, 0, 1} in base 3, five per byte.
+    """
+    digits = np.asarray(coefficients, dtype=np.int64) + 1
+    padded = np.zeros(-(-len(digits) // _TRITS_PER_BYTE) * _TRITS_PER_BYTE, dtype=np.int64)
+    padded[:len(digits)] = digits
+    weights = 3 ** np.arange(_TRITS_PER_BYTE)
+    return (padded.reshape(-1, _TRITS_PER_BYTE) @ weights).astype(np.uint8).tobytes()
+
+
+def _unpack_ternary(buffer, count):
+    """
+    Unpacks ``count`` ternary coefficients written by :func:`_pack_ternary`.
+    """
+    raw = np.frombuffer(buffer, dtype=np.uint8, count=-(-count // _TRITS_PER_BYTE))
+    digits = (raw[:, None] // 3 ** np.arange(_TRITS_PER_BYTE, dtype=np.uint8)) % 3
+    return digits.ravel()[:count].astype(np.int64) - 1
+
+
+def _strip(coefficients):
+    """
+    Removes the leading zeros of a coefficient list (highest degree first).
+    """
+    start = next((i for i, c in enumerate(coefficients) if c != 0), len(coefficients) - 1)
+    return coefficients[start:]
+
+
+def _header(kind, N, p, q, count, bits):
+    return _HEADER.pack(_FORMAT_MAGIC, _FORMAT_VERSION, kind, N, p, q, count, bits)
+
+
+def _read_header(data, kind):
+    """
+    Parses and validates the header of a serialized object.
+
+    :return: Tuple (memoryview of the whole buffer, N, p, q, count, bits).
+
+    :raises ValueError: If the data is not an object of the expected kind.
+    """
+    view = memoryview(data).cast("B")
+    if len(view) < _HEADER.size:
+        raise ValueError("The data is too short for an NTRU object header.")
+
+    magic, version, found, N, p, q, count, bits = _HEADER.unpack(view[:_HEADER.size])
+    if magic != _FORMAT_MAGIC or version != _FORMAT_VERSION:
+        raise ValueError("The data is not in a supported NTRU binary format.")
+    if found != kind:
+        raise ValueError(f"Expected an NTRU object of kind {kind}, found kind {found}.")
+
+    return view, N, p, q, count, bits
+
+
+def _check_size(view, size):
+    """
+    :raises ValueError: If the buffer does not have the expected size.
+    """
+    if len(view) != size:
+        raise ValueError(f"Expected {size} bytes of NTRU data, found {len(view)}.")
+
+
+def public_key_to_bytes(pubkey):
+    """
+    Serializes an NTRU public key.
+
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+
+    :return: The header followed by the N coefficients of ``h`` (highest degree first)
+             with ``ceil(log2 q)`` bits each.
+    :rtype: bytes
+
+    :raises ValueError: If q does not fit into 64 bits.
+    """
+    key = load_public_key(pubkey)
+    bits = _bits(key.q)
+    return _header(_PUBLIC_KEY, key.N, key.p, key.q, 1, bits) + _pack(key.h_coeffs[::-1], bits)
+
+
+def public_key_from_bytes(data):
+    """
+    Loads an NTRU public key written by :func:`public_key_to_bytes`.
+
+    :param data: The serialized key.
+    :type data: bytes or memoryview or mmap.mmap
+
+    :return: The public key.
+    :rtype: NTRUPublicKey
+
+    :raises ValueError: If the data is not a serialized public key.
+    """
+    view, N, p, q, _, bits = _read_header(data, _PUBLIC_KEY)
+    _check_size(view, _HEADER.size + _packed_size(N, bits))
+
+    h = _unpack(view[_HEADER.size:], N, bits).tolist()
+    return NTRUPublicKey(N, p, q, _strip(h))
+
+
+def private_key_to_bytes(pubkey, prvkey):
+    """
+    Serializes an NTRU private key with a ternary private polynomial.
+
+    :param pubkey: The matching public key (object or list), which provides N, p and q.
+    :type pubkey: NTRUPublicKey or list
+    :param prvkey: Private key object, or a list `[polynomial_f, Fp]`.
+    :type prvkey: NTRUPrivateKey or list
+
+    :return: The header followed by the coefficients of ``f`` in base 3 (five per byte)
+             and those of ``Fp`` with ``ceil(log2 p)`` bits each.
+    :rtype: bytes
+
+    :raises ValueError: If the private polynomial is not ternary.
+    """
+    key = load_private_key(pubkey, prvkey)
+    f_coeffs = np.asarray(key.f_coeffs, dtype=np.int64)
+    if np.any(np.abs(f_coeffs) > 1):
+        raise ValueError("Only ternary private polynomials can be serialized.")
+
+    bits = _bits(key.p)
+    return (_header(_PRIVATE_KEY, key.N, key.p, key.q, 1, bits)
+            + _pack_ternary(f_coeffs) + _pack(key.Fp_coeffs, bits))
+
+
+def private_key_from_bytes(data):
+    """
+    Loads an NTRU private key written by :func:`private_key_to_bytes`.
+
+    :param data: The serialized key.
+    :type data: bytes or memoryview or mmap.mmap
+
+    :return: The private key; its private polynomial is a
+             :class:`lattice_methods.ring.SparseTernary`.
+    :rtype: NTRUPrivateKey
+
+    :raises ValueError: If the data is not a serialized private key.
+    """
+    view, N, p, q, _, bits = _read_header(data, _PRIVATE_KEY)
+    f_size = -(-N // _TRITS_PER_BYTE)
+    _check_size(view, _HEADER.size + f_size + _packed_size(N, bits))
+
+    f = SparseTernary.from_coefficients(_unpack_ternary(view[_HEADER.size:], N))
+    Fp = _unpack(view[_HEADER.size + f_size:], N, bits).astype(np.int64)
+    Fp = np.where(Fp > p // 2, Fp - p, Fp)
+
+    return NTRUPrivateKey(N, p, q, f, _strip(Fp[::-1].tolist()))
+
+
+def ciphertexts_to_bytes(pubkey, ciphertexts):
+    """
+    Serializes a batch of ciphertexts.
+
+    :param pubkey: Public key object or list `[N, p, q, h]` the ciphertexts belong to.
+    :type pubkey: NTRUPublicKey or list
+    :param ciphertexts: Array of shape (B, N) with one ciphertext per row, as returned by
+                        :func:`lattice_methods.ntru.ntru_encryption_many` (a single
+                        ciphertext list is padded to N coefficients).
+    :type ciphertexts: numpy.ndarray or list[int]
+
+    :return: The header followed by the B * N coefficients with ``ceil(log2 q)`` bits each.
+    :rtype: bytes
+
+    :raises ValueError: If the ciphertexts do not have N coefficients.
+    """
+    N, p, q, _ = pubkey
+    rows = np.array(ciphertexts, dtype=object if q > 2 ** 63 else np.int64)
+    if rows.ndim == 1:
+        rows = np.concatenate([np.zeros(N - len(rows), dtype=rows.dtype), rows])[None, :]
+    if rows.shape[1] != N:
+        raise ValueError(f"Expected ciphertexts with {N} coefficients.")
+
+    bits = _bits(q)
+    return _header(_CIPHERTEXTS, N, p, q, len(rows), bits) + _pack(rows % q, bits)
+
+
+def ciphertexts_from_bytes(data):
+    """
+    Loads a batch of ciphertexts written by :func:`ciphertexts_to_bytes`.
+
+    If the coefficients are byte-aligned (e.g. q = 2^16), the returned array is a
+    read-only view of ``data`` and nothing is copied.
+
+    :param data: The serialized ciphertexts.
+    :type data: bytes or memoryview or mmap.mmap
+
+    :return: Tuple ((N, p, q), ciphertexts) with an array of shape (B, N).
+    :rtype: tuple[tuple[int, int, int], numpy.ndarray]
+
+    :raises ValueError: If the data is not a serialized ciphertext batch.
+    """
+    view, N, p, q, count, bits = _read_header(data, _CIPHERTEXTS)
+    _check_size(view, _HEADER.size + _packed_size(count * N, bits))
+
+    rows = _unpack(view[_HEADER.size:], count * N, bits).reshape(count, N)
+    return (N, p, q), rows
+
+
+def write_ciphertexts(path, pubkey, ciphertexts):
+    """
+    Writes a batch of ciphertexts to a file in the binary format.
+
+    :param path: The output file.
+    :type path: str
+    :param pubkey: Public key object or list `[N, p, q, h]` the ciphertexts belong to.
+    :type pubkey: NTRUPublicKey or list
+    :param ciphertexts: Array of shape (B, N) with one ciphertext per row.
+    :type ciphertexts: numpy.ndarray
+
+    :return: Number of bytes written.
+    :rtype: int
+    """
+    data = ciphertexts_to_bytes(pubkey, ciphertexts)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def read_ciphertexts(path):
+    """
+    Reads a batch of ciphertexts from a file by mapping it into memory.
+
+    :param path: The input file.
+    :type path: str
+
+    :return: Tuple ((N, p, q), ciphertexts), as for :func:`ciphertexts_from_bytes`. For
+             byte-aligned coefficients the array reads directly from the mapped file.
+    :rtype: tuple[tuple[int, int, int], numpy.ndarray]
+
+    :raises ValueError: If the file is not a serialized ciphertext batch.
+    """
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return ciphertexts_from_bytes(data)
@@ -0,0 +1,177 @@
+"""
+Implementation of the Gauss sieve for the shortest vector problem.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+This module provides the Gauss sieve of Micciancio and Voulgaris, a sieving alternative
+to enumeration for lattices of medium dimension. The sieve keeps a list of lattice vectors
+that are pairwise Gauss-reduced; new vectors are sampled, reduced against the list, and
+in turn used to reduce the list. The list lives in one contiguous NumPy array together
+with its squared norms, so every reduction step is a single batched matrix-vector product.
+"""
+
+import numpy as np
+
+from lattice_methods.lll import lll_reduce
+
+# Lovász parameter used to preprocess the basis before sieving.
+_SIEVE_DELTA = 0.99
+
+
+def _to_int64(rows):
+    """
+    Converts a basis matrix into int64, checking that inner products cannot overflow.
+
+    :raises ValueError: If the basis is not integral or its entries are too large.
+    """
+    if rows.dtype.kind == "f" and np.any(rows != np.round(rows)):
+        raise ValueError("The Gauss sieve requires an integer basis.")
+
+    bound = max(abs(int(v)) for v in rows.flat) if rows.size else 0
+    if rows.shape[1] * bound * bound >= 2 ** 60:
+        raise ValueError("The basis entries are too large for the Gauss sieve; "
+                         "LLL-reduce the basis first.")
+
+    return rows.astype(np.int64)
+
+
+def _sample(rows, rng):
+    """
+    Samples a random lattice vector as a small random combination of the basis vectors.
+    """
+    return rng.integers(-2, 3, size=rows.shape[0]) @ rows
+
+
+def _reduce_by_list(p, vectors, norms):
+    """
+    Gauss-reduces ``p`` against every vector of the list until no vector shortens it.
+
+    :return: The reduced vector.
+    :rtype: numpy.ndarray
+    """
+    while len(vectors):
+        dots = vectors @ p
+        candidates = np.flatnonzero(2 * np.abs(dots) > norms)
+        if candidates.size == 0:
+            return p
+
+        i = candidates[0]
+        p = p - int(np.rint(dots[i] / norms[i])) * vectors[i]
+
+    return p
+
+
+def gauss_sieve(basis, max_list_size=None, max_collisions=None, reduce=True, seed=None,
+                verbose=False):
+    """
+    Finds a short (usually shortest) nonzero lattice vector with the Gauss sieve.
+
+    Each iteration takes a vector from the stack (or samples a new one), reduces it
+    against the list, and then reduces all list vectors that are longer than it; those
+    leave the list and are pushed onto the stack. A vector that is reduced to zero counts
+    as a collision, and the sieve stops once enough collisions have occurred.
+
+    The number of vectors held and the number of collisions are reported (``verbose``),
+    which helps to decide per instance between sieving and enumeration.
+
+    :param basis: A list of NumPy vectors or a 2-D array whose rows are the basis vectors.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+    :param max_list_size: Memory cap for the list. When it is full, the longest list
+                          vector is evicted to make room; evictions count towards
+                          ``max_collisions`` like collisions do. None means no cap.
+    :type max_list_size: int or None
+    :param max_collisions: Number of collisions after which the sieve stops. By default
+                           ``max(200, list size / 10)``, following Micciancio–Voulgaris.
+                           With 0 no vector is sieved and the first (reduced) basis
+                           vector is returned.
+    :type max_collisions: int or None
+    :param reduce: If True (default), LLL-reduces the basis first.
+    :type reduce: bool
+    :param seed: Seed for sampling new vectors.
+    :type seed: int or None
+    :param verbose: If True, also returns the sieve statistics.
+    :type verbose: bool
+
+    :return:
+        If verbose is False, the shortest vector found.
+        If verbose is True, a tuple (vector, stats), where stats is a dictionary with:
+
+            - 'list_size' (int): Number of vectors in the list at the end
+            - 'max_list_size' (int): Largest number of vectors held at the same time
+            - 'collisions' (int): Number of vectors reduced to zero
+            - 'samples' (int): Number of freshly sampled vectors
+            - 'iterations' (int): Number of vectors processed
+            - 'evictions' (int): Number of vectors dropped because of the memory cap
+    :rtype: numpy.ndarray or tuple[numpy.ndarray, dict]
+
+    :raises ValueError: If the basis is not integral or its entries are too large.
+    """
+    rows = np.array(basis)
+    if reduce:
+        rows = lll_reduce(rows, delta=_SIEVE_DELTA)
+    rows = _to_int64(np.array(rows))
+
+    rng = np.random.default_rng(seed)
+    n, dim = rows.shape
+
+    capacity = max(2 * n, 16) if max_list_size is None else min(max(2 * n, 16), max_list_size)
+    vectors = np.empty((capacity, dim), dtype=np.int64)
+    norms = np.empty(capacity, dtype=np.int64)
+    size = 0
+
+    stack = list(rows[::-1])
+    stats = dict(list_size=0, max_list_size=0, collisions=0, samples=0, iterations=0,
+                 evictions=0)
+
+    while stats["collisions"] + stats["evictions"] < (max(200, size // 10) if max_collisions is None
+                                                      else max_collisions):
+        if stack:
+            p = stack.pop()
+        else:
+            p = _sample(rows, rng)
+            stats["samples"] += 1
+        stats["iterations"] += 1
+
+        p = _reduce_by_list(p, vectors[:size], norms[:size])
+        p_norm = int(p @ p)
+
+        if p_norm == 0:
+            stats["collisions"] += 1
+            continue
+
+        # Reduce the longer list vectors by p; the ones that change leave the list.
+        dots = vectors[:size] @ p
+        moved = (norms[:size] > p_norm) & (2 * np.abs(dots) > p_norm)
+        if moved.any():
+            multipliers = np.rint(dots[moved] / p_norm).astype(np.int64)
+            reduced = vectors[:size][moved] - multipliers[:, None] * p
+            keep = ~moved
+            kept = int(keep.sum())
+            vectors[:kept] = vectors[:size][keep]
+            norms[:kept] = norms[:size][keep]
+            size = kept
+
+            nonzero = reduced.any(axis=1)
+            stats["collisions"] += int((~nonzero).sum())
+            stack.extend(reduced[nonzero])
+
+        if size == capacity:
+            if max_list_size is not None and capacity >= max_list_size:
+                longest = int(np.argmax(norms[:size]))
+                size -= 1
+                vectors[longest], norms[longest] = vectors[size], norms[size]
+                stats["evictions"] += 1
+            else:
+                capacity = 2 * capacity if max_list_size is None \
+                    else min(2 * capacity, max_list_size)
+                vectors = np.concatenate([vectors, np.empty((capacity - size, dim), np.int64)])
+                norms = np.concatenate([norms, np.empty(capacity - size, np.int64)])
+
+        vectors[size], norms[size] = p, p_norm
+        size += 1
+        stats["max_list_size"] = max(stats["max_list_size"], size)
+
+    stats["list_size"] = size
+    shortest = vectors[int(np.argmin(norms[:size]))].copy() if size else rows[0].copy()
+
+    return (shortest, stats) if verbose else shortest
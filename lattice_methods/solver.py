@@ -0,0 +1,386 @@
+"""
+Shortest and closest vector solvers for integer lattices.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+This module finds shortest (SVP) and closest (CVP) lattice vectors. The basis is first
+LLL-reduced with :func:`lattice_methods.lll.lll_reduce`; its Gram-Schmidt data then
+drives Babai's nearest-plane algorithm, which gives a good approximate closest vector
+very quickly, and Schnorr–Euchner enumeration, which finds an exact shortest or closest
+vector within a radius and optionally prunes the search tree. For many targets the
+reduction and the Gram-Schmidt data are computed once and shared.
+"""
+
+import numpy as np
+
+from lattice_methods.lll import _exact_rows, _gso_from_gram, lll_reduce
+
+# Lovász parameter used to preprocess the basis before solving.
+_SOLVER_DELTA = 0.99
+
+# Relative slack added to the Babai distance when it is used as enumeration radius, so
+# that the Babai vector itself stays inside the (strict) search radius.
+_RADIUS_SLACK = 1e-9
+
+# Upper bound on the Babai refinement rounds for far targets; every round gains about
+# 50 bits, so this covers targets with entries of several thousand bits.
+_BABAI_ROUNDS = 64
+
+
+def _gso(rows):
+    """
+    Computes floating-point Gram-Schmidt coefficients and squared norms of a basis matrix.
+    """
+    rows = _exact_rows(rows)
+    return _gso_from_gram((rows @ rows.T).astype(float))
+
+
+def _enumerate(mu, B, radius, center=None, pruning=None):
+    """
+    Finds a shortest (or closest) lattice vector by Schnorr–Euchner enumeration.
+
+    The lattice is given by its Gram-Schmidt data; the search visits the coefficient
+    vectors in zig-zag order around the projected centers and shrinks the search radius
+    every time a better vector is found.
+
+    Without ``center`` the shortest nonzero vector is searched, and only one of ``x`` and
+    ``-x`` is visited. With ``center`` (the target's coordinates with respect to the
+    orthogonalized vectors) the vector closest to the target is searched.
+
+    :param mu: Gram-Schmidt coefficients (m × m).
+    :type mu: numpy.ndarray
+    :param B: Squared Gram-Schmidt norms.
+    :type B: numpy.ndarray
+    :param radius: Squared search radius; only vectors strictly closer are returned.
+    :type radius: float
+    :param center: Coordinates ``<t, b*_i> / B_i`` of the target, or None for SVP.
+    :type center: numpy.ndarray or None
+    :param pruning: Non-decreasing factors in (0, 1]; the projection onto the last
+                    ``j + 1`` orthogonalized vectors is only explored while its squared
+                    distance is below ``pruning[j] * radius``. None disables pruning.
+    :type pruning: list[float] or None
+
+    :return: Tuple (coefficients, squared distance) of the best vector found, or None
+             if no vector lies within the radius.
+    :rtype: tuple[list[int], float] or None
+    """
+    n = len(B)
+    mu = mu.tolist()
+    B = B.tolist()
+    symmetric = center is None
+    tau = [0.0] * n if symmetric else [float(x) for x in center]
+    bound = [1.0] * n if pruning is None else [float(p) for p in pruning[::-1]]
+
+    v = [0] * n
+    c = [0.0] * n
+    w = [0] * n
+    rho = [0.0] * (n + 1)
+    sigma = [[0.0] * n for _ in range(n + 1)]
+    # r[k]: highest row of sigma[:, k] that may be stale because a coefficient changed.
+    r = list(range(n))
+
+    if symmetric:
+        v[0] = 1
+        last_nonzero = 0
+        k = 0
+    else:
+        k = n - 1
+        c[k] = tau[k]
+        v[k] = round(c[k])
+        w[k] = 1
+    best = None
+
+    while True:
+        diff = v[k] - c[k]
+        rho[k] = rho[k + 1] + diff * diff * B[k]
+
+        if rho[k] < bound[k] * radius:
+            if k > 0:
+                k -= 1
+                if k > 0:
+                    r[k - 1] = max(r[k - 1], r[k])
+                for i in range(r[k], k, -1):
+                    sigma[i][k] = sigma[i + 1][k] + v[i] * mu[i][k]
+                c[k] = tau[k] - sigma[k + 1][k]
+                v[k] = round(c[k])
+                w[k] = 1
+                continue
+
+            best = (list(v), rho[0])
+            radius = rho[0]
+        else:
+            k += 1
+            if k == n:
+                return best
+            r[k - 1] = k
+
+        # Next candidate on level k: zig-zag around the center, or (for SVP) only
+        # upwards on the highest nonzero level so that x and -x are not both visited.
+        if symmetric and k >= last_nonzero:
+            last_nonzero = k
+            v[k] += 1
+        else:
+            v[k] = v[k] - w[k] if v[k] > c[k] else v[k] + w[k]
+            w[k] += 1
+
+
+def _prepare(basis, reduce):
+    """
+    Returns the (optionally LLL-reduced) basis matrix and its Gram-Schmidt data.
+    """
+    rows = np.array(basis)
+    if reduce:
+        rows = lll_reduce(rows, delta=_SOLVER_DELTA)
+
+    mu, B = _gso(rows)
+    return rows, mu, B
+
+
+def _check_pruning(pruning, n):
+    """
+    Validates pruning coefficients for an n-dimensional enumeration.
+
+    :raises ValueError: If there are not n factors in (0, 1] in non-decreasing order.
+    """
+    if pruning is None:
+        return
+
+    pruning = np.asarray(pruning, dtype=float)
+    if (pruning.shape != (n,) or np.any(pruning <= 0) or np.any(pruning > 1)
+            or np.any(np.diff(pruning) < 0)):
+        raise ValueError(f"Expected {n} non-decreasing pruning coefficients in (0, 1].")
+
+
+def _target_coordinates(rows, mu, B, targets):
+    """
+    Computes ``<t, b*_i> / B_i`` for every target (one per row of ``targets``).
+
+    Uses ``<t, b_i> = sum_j mu_ij <t, b*_j>``, i.e. one triangular solve for all targets.
+    """
+    exact_rows = _exact_rows(rows)
+    if exact_rows.dtype == object:
+        targets = targets.astype(object)
+
+    products = np.array(exact_rows @ targets.T, dtype=float)
+    M = mu + np.eye(len(B))
+    return np.linalg.solve(M, products).T / B
+
+
+def _nearest_plane(mu, B, tau):
+    """
+    Babai's nearest-plane algorithm on a batch of target coordinates.
+
+    :param tau: Target coordinates (T × n) as returned by :func:`_target_coordinates`.
+
+    :return: Tuple (coefficients, squared distances) with the integer coefficients of the
+             Babai vectors (T × n, Python integers) and their squared distances to the
+             targets within the span of the basis.
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    tau = tau.copy()
+    n = len(B)
+    coefficients = np.zeros(tau.shape, dtype=object)
+    distances = np.zeros(tau.shape[0])
+
+    for i in range(n - 1, -1, -1):
+        rounded = np.rint(tau[:, i])
+        distances += (tau[:, i] - rounded) ** 2 * B[i]
+        tau[:, :i] -= rounded[:, None] * mu[i, :i]
+        coefficients[:, i] = [int(x) for x in rounded]
+
+    return coefficients, distances
+
+
+def _combine(coefficients, rows):
+    """
+    Computes the lattice vectors ``coefficients @ rows`` exactly.
+
+    Integer bases use int64 arithmetic when the result provably fits and Python integers
+    otherwise, e.g. for the huge coefficients of targets far away from the origin.
+    """
+    coefficients = np.array(coefficients, dtype=object)
+    if rows.dtype.kind == "f":
+        return coefficients.astype(rows.dtype) @ rows
+
+    if rows.dtype != object and rows.size:
+        largest = max((abs(int(c)) for c in coefficients.flat), default=0)
+        if largest * int(np.abs(rows).max()) * rows.shape[0] < 2 ** 63:
+            return coefficients.astype(np.int64) @ rows
+    return coefficients @ rows.astype(object)
+
+
+def _refine(rows, mu, B, residual, coefficients):
+    """
+    Repeats the Babai step on the exact remainders ``target - v`` of far targets.
+
+    Targets far away from the origin have coordinates beyond the float64 precision, so a
+    single nearest-plane pass leaves a remainder that is still far from the origin; every
+    further round gains about 50 bits. A step is only kept for the targets whose remainder
+    it shortens (e.g. a rounding tie would otherwise flip between two equally close
+    vectors forever). ``residual`` and ``coefficients`` are updated in place.
+
+    :return: Tuple (tau, distances) of the final remainders, as for :func:`_nearest_plane`.
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    norms = (residual * residual).sum(axis=1)
+
+    for _ in range(_BABAI_ROUNDS):
+        tau = _target_coordinates(rows, mu, B, residual)
+        step, distances = _nearest_plane(mu, B, tau)
+        if not step.any():
+            return tau, distances
+
+        moved = residual - _combine(step, rows)
+        moved_norms = (moved * moved).sum(axis=1)
+        shorter = np.array(moved_norms < norms, dtype=bool)
+        if not shorter.any():
+            return tau, distances
+
+        step[~shorter] = 0
+        coefficients += step
+        residual[shorter] = moved[shorter]
+        norms[shorter] = moved_norms[shorter]
+
+    tau = _target_coordinates(rows, mu, B, residual)
+    return tau, _nearest_plane(mu, B, tau)[1]
+
+
+def babai_nearest_plane(basis, target, reduce=True):
+    """
+    Approximates the lattice vector closest to a target with Babai's nearest-plane algorithm.
+
+    The coefficients are determined one Gram-Schmidt direction at a time, from the last
+    to the first, by rounding the target's remaining coordinate along that direction.
+    For an LLL-reduced basis the result is within a factor ``2^(n/2)`` of the closest
+    vector and usually much closer. The coordinates are computed in float64; for targets
+    far away from the origin use :func:`closest_vectors` with ``refine=True``.
+
+    :param basis: A list of NumPy vectors or a 2-D array whose rows are the basis vectors.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+    :param target: The target vector.
+    :type target: numpy.ndarray
+    :param reduce: If True (default), LLL-reduces the basis first.
+    :type reduce: bool
+
+    :return: A lattice vector close to the target.
+    :rtype: numpy.ndarray
+    """
+    return closest_vectors(basis, [target], exact=False, reduce=reduce)[0]
+
+
+def shortest_vector(basis, pruning=None, reduce=True):
+    """
+    Finds a shortest nonzero vector of a lattice by Schnorr–Euchner enumeration.
+
+    The search starts with the length of the first vector of the (LLL-reduced) basis as
+    radius and shrinks it every time a shorter vector is found, so the result is exact
+    unless pruning is used.
+
+    :param basis: A list of NumPy vectors or a 2-D array whose rows are the basis vectors.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+    :param pruning: Optional non-decreasing factors in (0, 1], one per dimension;
+                    ``pruning[j]`` bounds the squared length of the projection onto the
+                    last ``j + 1`` Gram-Schmidt directions relative to the radius.
+                    Pruning trades the guarantee of finding a shortest vector for speed.
+    :type pruning: list[float] or None
+    :param reduce: If True (default), LLL-reduces the basis first.
+    :type reduce: bool
+
+    :return: A shortest nonzero lattice vector (or the first basis vector, if pruning
+             cut off every shorter one).
+    :rtype: numpy.ndarray
+
+    :raises ValueError: If the pruning coefficients are malformed.
+    """
+    rows, mu, B = _prepare(basis, reduce)
+    _check_pruning(pruning, len(B))
+
+    found = _enumerate(mu, B, B[0] * (1 + _RADIUS_SLACK), pruning=pruning)
+    if found is None:
+        return rows[0].copy()
+
+    return _combine(found[0], rows)
+
+
+def closest_vector(basis, target, pruning=None, reduce=True):
+    """
+    Finds a lattice vector closest to a target by Schnorr–Euchner enumeration.
+
+    The Babai vector provides the initial search radius, which then shrinks every time
+    a closer vector is found.
+
+    :param basis: A list of NumPy vectors or a 2-D array whose rows are the basis vectors.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+    :param target: The target vector.
+    :type target: numpy.ndarray
+    :param pruning: Optional pruning coefficients, as for :func:`shortest_vector`.
+    :type pruning: list[float] or None
+    :param reduce: If True (default), LLL-reduces the basis first.
+    :type reduce: bool
+
+    :return: A lattice vector closest to the target.
+    :rtype: numpy.ndarray
+
+    :raises ValueError: If the pruning coefficients are malformed.
+    """
+    return closest_vectors(basis, [target], exact=True, pruning=pruning, reduce=reduce)[0]
+
+
+def closest_vectors(basis, targets, exact=False, pruning=None, reduce=True, refine=False):
+    """
+    Solves CVP for many targets against one lattice.
+
+    The basis is reduced and its Gram-Schmidt data computed once. The coordinates of all
+    targets and their Babai vectors are then computed together with array operations; in
+    exact mode every target is additionally refined by enumeration, starting from the
+    radius given by its Babai vector.
+
+    Targets far away from the origin have coordinates beyond the float64 precision. With
+    ``refine=True`` (always in exact mode) the Babai step is repeated on the exact
+    remainder ``target - v`` as long as it shortens the remainder; every round gains
+    about 50 bits. The result is then no longer the plain Babai vector, but at least as
+    close to the target.
+
+    :param basis: A list of NumPy vectors or a 2-D array whose rows are the basis vectors.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+    :param targets: The target vectors, one per row.
+    :type targets: list[numpy.ndarray] or numpy.ndarray
+    :param exact: If False (default), returns the Babai vectors; if True, the closest
+                  vectors found by enumeration.
+    :type exact: bool
+    :param pruning: Optional pruning coefficients for the exact mode, as for
+                    :func:`shortest_vector`.
+    :type pruning: list[float] or None
+    :param reduce: If True (default), LLL-reduces the basis first.
+    :type reduce: bool
+    :param refine: If True, refines the Babai vectors of far targets on their exact
+                   remainders. Default is False.
+    :type refine: bool
+
+    :return: Array with one lattice vector per target.
+    :rtype: numpy.ndarray
+
+    :raises ValueError: If the pruning coefficients are malformed.
+    """
+    rows, mu, B = _prepare(basis, reduce)
+    _check_pruning(pruning, len(B))
+
+    residual = np.array(targets)
+    if residual.dtype.kind in "iu":
+        residual = residual.astype(object)
+    coefficients = np.zeros((len(residual), len(B)), dtype=object)
+
+    if not (refine or exact):
+        coefficients, _ = _nearest_plane(mu, B, _target_coordinates(rows, mu, B, residual))
+        return _combine(coefficients, rows)
+
+    tau, distances = _refine(rows, mu, B, residual, coefficients)
+
+    if exact:
+        for i in range(len(residual)):
+            radius = distances[i] * (1 + _RADIUS_SLACK) + _RADIUS_SLACK
+            found = _enumerate(mu, B, radius, center=tau[i], pruning=pruning)
+            if found is not None:
+                coefficients[i] += np.array(found[0], dtype=object)
+
+    return _combine(coefficients, rows)
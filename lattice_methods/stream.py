@@ -0,0 +1,339 @@
+"""
+Streaming NTRU encryption of byte data.
+
+Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
+
+This module encrypts arbitrary byte streams with NTRU. The input is cut into blocks; the
+bytes of a block are written in base p and the digits (centered around zero) form the
+coefficients of one message polynomial. Blocks are encrypted and decrypted in batches
+with the vectorized functions of :mod:`lattice_methods.ntru`, so memory use is bounded
+by the batch size no matter how large the input is; files are read through ``mmap``.
+
+The encrypted stream starts with a header carrying the parameters (N, p, q) and
+continues with one fixed-size frame per block: the number of plaintext bytes in the
+block followed by the N ciphertext coefficients as little-endian integers.
+"""
+
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from lattice_methods.keygen import _RandomStream
+from lattice_methods.keys import load_private_key, load_public_key
+from lattice_methods.ntru import ntru_decryption_many, ntru_encryption_many
+
+_STREAM_MAGIC = b"NTRS"
+_STREAM_VERSION = 1
+
+# Header: magic, version, N, p, q, bytes per ciphertext coefficient.
+_HEADER = struct.Struct("<4sBIIQB")
+
+# Frame prefix: number of plaintext bytes in the block.
+_FRAME = struct.Struct("<I")
+
+# Number of blocks encrypted or decrypted together.
+_BATCH_BLOCKS = 256
+
+
+def _layout(N, p):
+    """
+    Chooses how bytes are written as base-p digits.
+
+    Groups of ``unit`` bytes (at most 7, so that a group fits into 64 bits) are written
+    with ``digits`` base-p digits each; the group size with the best ratio of bytes to
+    digits is used. A block holds as many groups as fit into N digits.
+
+    :return: Tuple (unit, digits, bytes per block).
+    :rtype: tuple[int, int, int]
+
+    :raises ValueError: If N is too small to hold a single byte.
+    """
+    best = None
+    for unit in range(1, 8):
+        digits = 1
+        while p ** digits < 256 ** unit:
+            digits += 1
+        if digits <= N and (best is None or unit * best[1] > best[0] * digits):
+            best = (unit, digits)
+
+    if best is None:
+        raise ValueError(f"N = {N} is too small to encode bytes in base {p}.")
+
+    unit, digits = best
+    return unit, digits, unit * (N // digits)
+
+
+def _coefficient_dtype(q):
+    """
+    Returns the smallest little-endian unsigned dtype holding coefficients modulo q.
+
+    :raises ValueError: If q does not fit into 64 bits.
+    """
+    for dtype in ("<u1", "<u2", "<u4", "<u8"):
+        if q - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError("Streaming encryption supports moduli q < 2^64 only.")
+
+
+def _encode(data, N, p, unit, digits):
+    """
+    Encodes whole blocks of bytes as message polynomials (one per row, centered digits).
+    """
+    groups = np.frombuffer(data, dtype=np.uint8).reshape(-1, unit)
+    padded = np.zeros((len(groups), 8), dtype=np.uint8)
+    padded[:, :unit] = groups
+    values = padded.view("<u8").ravel()
+
+    base = np.uint64(p)
+    coefficients = np.empty((len(values), digits), dtype=np.int64)
+    for j in range(digits):
+        coefficients[:, j] = values % base
+        values = values // base
+
+    per_block = N // digits
+    messages = np.zeros((len(values) // per_block, N), dtype=np.int64)
+    messages[:, :per_block * digits] = coefficients.reshape(len(messages), -1)
+
+    return np.where(messages > p // 2, messages - p, messages)
+
+
+def _decode(messages, N, p, unit, digits):
+    """
+    Decodes message polynomials (one per row) back into the bytes of whole blocks.
+    """
+    per_block = N // digits
+    coefficients = (messages[:, :per_block * digits] % p).astype(np.uint64).reshape(-1, digits)
+
+    values = np.zeros(len(coefficients), dtype=np.uint64)
+    for j in range(digits - 1, -1, -1):
+        values = values * np.uint64(p) + coefficients[:, j]
+
+    return values.astype("<u8").view(np.uint8).reshape(-1, 8)[:, :unit].tobytes()
+
+
+def _blinding(stream, count, N, d):
+    """
+    Samples ``count`` blinding polynomials with d coefficients 1 and d coefficients -1.
+    """
+    keys = np.frombuffer(stream.read(8 * count * N), dtype="<u8").reshape(count, N)
+    order = np.argpartition(keys, (d, 2 * d), axis=1) if 0 < d and 2 * d < N \
+        else np.argsort(keys, axis=1)
+    rows = np.arange(count)[:, None]
+
+    phis = np.zeros((count, N), dtype=np.int64)
+    phis[rows, order[:, :d]] = 1
+    phis[rows, order[:, d:2 * d]] = -1
+    return phis
+
+
+def _reader(source):
+    """
+    Returns a function reading up to n bytes from a binary file object or a bytes-like
+    object (e.g. an mmap).
+    """
+    if hasattr(source, "read") and not isinstance(source, mmap.mmap):
+        return source.read
+
+    view = memoryview(source).cast("B")
+    position = 0
+
+    def read(n):
+        nonlocal position
+        chunk = view[position:position + n]
+        position += len(chunk)
+        return chunk
+
+    return read
+
+
+def ntru_encrypt_stream(pubkey, source, d=None, seed=None, batch_blocks=_BATCH_BLOCKS):
+    """
+    Encrypts a byte stream block by block and yields the encrypted stream in pieces.
+
+    The first piece is the header, every further piece holds the frames of one batch
+    of blocks. Each block gets its own blinding polynomial with ``d`` coefficients 1 and
+    ``d`` coefficients -1.
+
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+    :param source: The plaintext, as a binary file object or a bytes-like object.
+    :type source: typing.BinaryIO or bytes or memoryview or mmap.mmap
+    :param d: Weight of the blinding polynomials. Default is ``N // 3``.
+    :type d: int or None
+    :param seed: Seed of the random stream for the blinding polynomials, or None for a
+                 fresh secret seed. A seed must never be reused for real data.
+    :type seed: int or str or bytes or None
+    :param batch_blocks: Number of blocks encrypted together (bounds the memory use).
+    :type batch_blocks: int
+
+    :return: Generator of byte strings forming the encrypted stream.
+    :rtype: Iterator[bytes]
+
+    :raises ValueError: If N is too small, q does not fit into 64 bits or d is not in
+                        ``1 <= d <= N / 2``.
+    """
+    key = load_public_key(pubkey)
+    N, p, q = key.N, key.p, key.q
+    unit, digits, block_size = _layout(N, p)
+    dtype = _coefficient_dtype(q)
+    d = N // 3 if d is None else d
+    if d < 1 or 2 * d > N:
+        raise ValueError(f"The blinding weight must satisfy 1 <= d and 2 d <= N (d = {d}, N = {N}).")
+
+    read = _reader(source)
+    randomness = _RandomStream(seed)
+
+    yield _HEADER.pack(_STREAM_MAGIC, _STREAM_VERSION, N, p, q, dtype.itemsize)
+
+    while True:
+        data = bytes(read(batch_blocks * block_size))
+        if not data:
+            return
+
+        blocks = -(-len(data) // block_size)
+        lengths = [block_size] * (blocks - 1) + [len(data) - (blocks - 1) * block_size]
+        data += bytes(blocks * block_size - len(data))
+
+        messages = _encode(data, N, p, unit, digits)
+        ciphertexts = ntru_encryption_many(key, _blinding(randomness, blocks, N, d), messages)
+        ciphertexts = np.asarray(ciphertexts, dtype=dtype)
+
+        yield b"".join(_FRAME.pack(length) + row.tobytes()
+                       for length, row in zip(lengths, ciphertexts))
+
+
+def ntru_decrypt_stream(pubkey, prvkey, source, batch_blocks=_BATCH_BLOCKS):
+    """
+    Decrypts a stream written by :func:`ntru_encrypt_stream` and yields the plaintext in
+    pieces, one per batch of blocks.
+
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+    :param prvkey: Private key object, or a list `[polynomial_f, Fp]`.
+    :type prvkey: NTRUPrivateKey or list
+    :param source: The encrypted stream, as a binary file object or a bytes-like object.
+    :type source: typing.BinaryIO or bytes or memoryview or mmap.mmap
+    :param batch_blocks: Number of blocks decrypted together (bounds the memory use).
+    :type batch_blocks: int
+
+    :return: Generator of plaintext byte strings.
+    :rtype: Iterator[bytes]
+
+    :raises ValueError: If the header is invalid or does not match the key, or if the
+                        stream is truncated.
+    """
+    key = load_private_key(pubkey, prvkey)
+    N, p, q = key.N, key.p, key.q
+    unit, digits, block_size = _layout(N, p)
+    dtype = _coefficient_dtype(q)
+
+    read = _reader(source)
+    header = bytes(read(_HEADER.size))
+    if len(header) != _HEADER.size:
+        raise ValueError("The stream is too short for an NTRU stream header.")
+
+    magic, version, *parameters = _HEADER.unpack(header)
+    if magic != _STREAM_MAGIC or version != _STREAM_VERSION:
+        raise ValueError("The data is not a supported NTRU stream.")
+    if parameters != [N, p, q, dtype.itemsize]:
+        raise ValueError("The stream was encrypted with different parameters (N, p, q).")
+
+    frame_size = _FRAME.size + N * dtype.itemsize
+
+    while True:
+        data = bytes(read(batch_blocks * frame_size))
+        if not data:
+            return
+        if len(data) % frame_size:
+            raise ValueError("The NTRU stream is truncated.")
+
+        frames = np.frombuffer(data, dtype=np.uint8).reshape(-1, frame_size)
+        lengths = frames[:, :_FRAME.size].copy().view("<u4").ravel()
+        ciphertexts = frames[:, _FRAME.size:].copy().view(dtype).astype(np.int64)
+
+        plaintext = _decode(ntru_decryption_many(pubkey, key, ciphertexts), N, p, unit, digits)
+
+        yield b"".join(plaintext[i * block_size:i * block_size + int(length)]
+                       for i, length in enumerate(lengths))
+
+
+def _process_file(pipeline, input_path, output_path, encrypting):
+    """
+    Runs a streaming pipeline from one file into another and measures its throughput
+    in plaintext megabytes per second.
+    """
+    start = time.perf_counter()
+    written = 0
+    size = os.path.getsize(input_path)
+
+    with open(input_path, "rb") as fin, open(output_path, "wb") as fout:
+        source = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            for piece in pipeline(source):
+                fout.write(piece)
+                written += len(piece)
+        finally:
+            if size:
+                source.close()
+
+    seconds = time.perf_counter() - start
+    plaintext = size if encrypting else written
+    return dict(bytes_in=size, bytes_out=written, seconds=seconds,
+                mb_per_s=plaintext / 1e6 / seconds if seconds > 0 else float("inf"))
+
+
+def ntru_encrypt_file(pubkey, input_path, output_path, d=None, seed=None,
+                      batch_blocks=_BATCH_BLOCKS):
+    """
+    Encrypts a file with :func:`ntru_encrypt_stream`, reading it through ``mmap``.
+
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+    :param input_path: File to encrypt.
+    :type input_path: str
+    :param output_path: File to write the encrypted stream to.
+    :type output_path: str
+    :param d: Weight of the blinding polynomials. Default is ``N // 3``.
+    :type d: int or None
+    :param seed: Seed for the blinding polynomials, or None for a fresh secret seed.
+    :type seed: int or str or bytes or None
+    :param batch_blocks: Number of blocks encrypted together.
+    :type batch_blocks: int
+
+    :return: Statistics with the keys 'bytes_in', 'bytes_out', 'seconds' and
+             'mb_per_s' (plaintext megabytes per second).
+    :rtype: dict
+    """
+    return _process_file(
+        lambda source: ntru_encrypt_stream(pubkey, source, d=d, seed=seed,
+                                           batch_blocks=batch_blocks),
+        input_path, output_path, encrypting=True)
+
+
+def ntru_decrypt_file(pubkey, prvkey, input_path, output_path, batch_blocks=_BATCH_BLOCKS):
+    """
+    Decrypts a file written by :func:`ntru_encrypt_file`, reading it through ``mmap``.
+
+    :param pubkey: Public key object, or a list `[N, p, q, h]`.
+    :type pubkey: NTRUPublicKey or list
+    :param prvkey: Private key object, or a list `[polynomial_f, Fp]`.
+    :type prvkey: NTRUPrivateKey or list
+    :param input_path: File with the encrypted stream.
+    :type input_path: str
+    :param output_path: File to write the plaintext to.
+    :type output_path: str
+    :param batch_blocks: Number of blocks decrypted together.
+    :type batch_blocks: int
+
+    :return: Statistics with the keys 'bytes_in', 'bytes_out', 'seconds' and
+             'mb_per_s' (plaintext megabytes per second).
+    :rtype: dict
+
+    :raises ValueError: If the file is not a valid NTRU stream for the key.
+    """
+    return _process_file(
+        lambda source: ntru_decrypt_stream(pubkey, prvkey, source, batch_blocks=batch_blocks),
+        input_path, output_path, encrypting=False)
@@ -10,8 +10,126 @@ Module author: Aleksandr Lebedev <alebede1@hs-mittweida.de>
 Date: 2025-05-28
 """
 
+import math
+from fractions import Fraction
+from functools import lru_cache
+
 import numpy as np
 
+from lattice_methods.lll import _integral_gso
+
+
+def _integer_keys(basis1, basis2):
+    """
+    Converts two bases into hashable integer matrices (tuples of rows, one per vector).
+
+    Integer bases are taken as they are; bases with non-integer entries are both scaled by
+    the common denominator of all entries, which does not change whether they generate
+    the same lattice.
+    """
+    rows1 = np.array(basis1)
+    rows2 = np.array(basis2)
+
+    if rows1.shape != rows2.shape or rows1.ndim != 2 or rows1.shape[0] != rows1.shape[1]:
+        raise ValueError("Both bases must be square matrices (n vectors of dim n).")
+
+    if all(rows.dtype.kind in "iu" or all(isinstance(v, int) for v in rows.flat)
+           for rows in (rows1, rows2)):
+        return tuple(tuple(map(tuple, rows.tolist())) for rows in (rows1, rows2))
+
+    values = [np.vectorize(Fraction, otypes=[object])(rows) for rows in (rows1, rows2)]
+    scale = math.lcm(*(v.denominator for rows in values for v in rows.flat))
+
+    return tuple(tuple(tuple(int(v * scale) for v in row) for row in rows) for rows in values)
+
+
+@lru_cache(maxsize=256)
+def _determinant(key):
+    """
+    Computes the determinant of an integer matrix exactly (fraction-free Bareiss elimination).
+
+    :param key: The matrix as a tuple of integer rows.
+    :type key: tuple[tuple[int, ...], ...]
+
+    :rtype: int
+    """
+    M = np.array(key, dtype=object).reshape(len(key), -1)
+    n = M.shape[0]
+    sign, previous = 1, 1
+
+    for k in range(n - 1):
+        if M[k, k] == 0:
+            pivots = np.flatnonzero(M[k + 1:, k]) + k + 1
+            if pivots.size == 0:
+                return 0
+            M[[k, pivots[0]]] = M[[pivots[0], k]]
+            sign = -sign
+
+        M[k + 1:, k + 1:] = (M[k, k] * M[k + 1:, k + 1:]
+                             - np.outer(M[k + 1:, k], M[k, k + 1:])) // previous
+        previous = M[k, k]
+
+    return sign * int(M[n - 1, n - 1]) if n else 1
+
+
+@lru_cache(maxsize=256)
+def _hermite_normal_form(key):
+    """
+    Computes the row-style Hermite normal form of a nonsingular integer matrix.
+
+    Uses the modular method (Domich, Kannan and Trotter; Cohen, Algorithm 2.4.8): the
+    lattice contains ``D * Z^n`` for ``D = |det|``, so all row operations can be carried
+    out modulo a bound that starts at ``D`` and shrinks with every pivot found, which
+    keeps the intermediate entries small.
+
+    :param key: The matrix as a tuple of integer rows; its rows generate the lattice.
+    :type key: tuple[tuple[int, ...], ...]
+
+    :return: The upper-triangular Hermite normal form as a tuple of rows, with positive
+             pivots and the entries above each pivot reduced into ``[0, pivot)``.
+    :rtype: tuple[tuple[int, ...], ...]
+    """
+    R = abs(_determinant(key))
+    W = np.array(key, dtype=object).reshape(len(key), -1) % R
+    n = W.shape[0]
+    H = np.zeros((n, n), dtype=object)
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            if W[j, i] == 0:
+                continue
+            g, u, v = _extended_gcd(W[i, i], W[j, i])
+            a, b = W[i, i] // g, W[j, i] // g
+            W[i], W[j] = (u * W[i] + v * W[j]) % R, (a * W[j] - b * W[i]) % R
+
+        g, u, _ = _extended_gcd(W[i, i], R)
+        H[i] = (u * W[i]) % R
+        H[i, i] = g
+
+        R //= g
+        W[i + 1:] %= R
+
+    for i in range(1, n):
+        for j in range(i):
+            H[j] -= (H[j, i] // H[i, i]) * H[i]
+
+    return tuple(tuple(int(v) for v in row) for row in H)
+
+
+def _extended_gcd(a, b):
+    """
+    Returns (g, s, t) with ``s * a + t * b = g = gcd(a, b) >= 0``.
+    """
+    s0, s1, t0, t1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        s0, s1 = s1, s0 - q * s1
+        t0, t1 = t1, t0 - q * t1
+
+    if a < 0:
+        return -a, -s0, -t0
+    return a, s0, t0
+
 
 def are_bases_equivalent(basis1, basis2):
     """
@@ -20,6 +138,13 @@ def are_bases_equivalent(basis1, basis2):
     Determines whether there exists an integer matrix T with determinant ±1 such that:
     ``basis2 = basis1 @ T``
 
+    The check is exact and uses integer arithmetic only: two bases generate the same
+    lattice if and only if their Hermite normal forms coincide. The absolute values of
+    the determinants are compared first, and the Hermite normal form is computed modulo
+    the determinant, so the check also works for big entries and in high dimension.
+    Determinants and Hermite normal forms are cached, so comparing one reference basis
+    against many candidates computes the reference form only once.
+
     :param basis1: First basis, as a list of NumPy vectors.
     :type basis1: list[numpy.ndarray]
     :param basis2: Second basis, as a list of NumPy vectors.
@@ -31,61 +156,114 @@ def are_bases_equivalent(basis1, basis2):
     :raises ValueError: If the input bases are not square (i.e., n vectors in ℝⁿ).
 
     .. note::
-       This function checks for a unimodular transformation between the two bases.
+       Bases with non-integer entries are scaled by a common denominator first; the
+       entries are taken at their exact (binary) floating-point values. Linearly
+       dependent vectors do not form a basis and always yield False.
     """
+    key1, key2 = _integer_keys(basis1, basis2)
 
-    basis1 = np.column_stack(basis1)
-    basis2 = np.column_stack(basis2)
-
-    if basis1.shape != basis2.shape or basis1.shape[0] != basis1.shape[1]:
-        raise ValueError("Both bases must be square matrices (n vectors of dim n).")
-
-    try:
-        T = np.linalg.solve(basis1, basis2)
-    except np.linalg.LinAlgError:
+    det1, det2 = abs(_determinant(key1)), abs(_determinant(key2))
+    if det1 == 0 or det1 != det2:
         return False
 
+    return _hermite_normal_form(key1) == _hermite_normal_form(key2)
 
-    return np.allclose(T, np.round(T)) and round(abs(np.linalg.det(T))) == 1
 
-def gram_schmidt(basis):
+def _float_gso(rows):
     """
-    Applies Gram-Schmidt orthogonalization to a lattice basis.
+    Gram-Schmidt data of a (stack of) basis matrices from a QR decomposition.
 
-    This function computes an orthogonal basis from the given list of lattice vectors
-    using the classical Gram-Schmidt process. It also returns the matrix of Gram-Schmidt
-    coefficients used in the process.
+    With ``rows^T = Q R`` the orthogonalized vectors are ``R[i, i] * q_i``, the
+    coefficients are ``mu[i, j] = R[j, i] / R[j, j]`` and the squared norms are ``R[i, i]^2``.
+    """
+    q, r = np.linalg.qr(np.swapaxes(rows, -1, -2))
+    diag = np.diagonal(r, axis1=-2, axis2=-1)
 
-    :param basis: List of NumPy vectors representing the lattice basis.
-    :type basis: list[numpy.ndarray]
+    ortho = np.swapaxes(q * diag[..., None, :], -1, -2)
+    mu = np.tril(np.swapaxes(r / diag[..., :, None], -1, -2), -1)
 
-    :return: A tuple (ortho, mu), where:
-             - ortho: List of orthogonalized basis vectors.
-             - mu: Matrix of Gram-Schmidt coefficients.
-    :rtype: tuple[list[numpy.ndarray], numpy.ndarray]
+    return ortho, mu, diag ** 2
 
-    .. note::
-       The orthogonalized vectors are not necessarily part of the lattice;
-       they span the same space but are not required to have integer coordinates.
+
+def _exact_gso(rows):
     """
+    Gram-Schmidt data of one basis matrix in exact rational arithmetic.
 
-    n = len(basis)
-    dim = len(basis[0])
+    The basis is scaled to an integer matrix by the common denominator of its entries,
+    the fraction-free Gram-Schmidt data of the scaled basis is computed with integers
+    only, and the results are returned as :class:`fractions.Fraction` objects.
+    """
+    n = rows.shape[0]
+    values = np.vectorize(Fraction, otypes=[object])(rows)
+    scale = math.lcm(*(v.denominator for v in values.flat))
+    integers = np.vectorize(lambda v: int(v * scale), otypes=[object])(values)
 
-    ortho = [np.zeros(dim) for _ in range(n)]
-    mu = np.zeros((n, n))
+    d, lam = _integral_gso(integers @ integers.T)
 
-    for i in range(n):
-        b_i = basis[i]
-        projection = np.zeros(dim,  dtype=object)
+    mu = np.full((n, n), Fraction(0), dtype=object)
+    B = np.empty(n, dtype=object)
+    ortho = values.copy()
 
+    for i in range(n):
         for j in range(i):
-            mu[i, j] = np.dot(b_i, ortho[j]) / np.dot(ortho[j], ortho[j])
-            projection += mu[i, j] * ortho[j]
+            mu[i, j] = Fraction(lam[i, j], d[j + 1])
+        B[i] = Fraction(d[i + 1], d[i] * scale * scale)
+        if i > 0:
+            ortho[i] = values[i] - mu[i, :i] @ ortho[:i]
 
-        ortho[i] = b_i - projection
+    return ortho, mu, B
 
-    return ortho, mu
+
+def gram_schmidt(basis, exact=False, return_norms=False):
+    """
+    Applies Gram-Schmidt orthogonalization to a lattice basis or a stack of bases.
+
+    The floating-point mode works on the whole basis matrix at once: the orthogonalized
+    vectors, the coefficients and the squared norms are all read off a single QR
+    decomposition, which is numerically stable and handles a stack of bases in one call.
+    The exact mode computes everything in rational arithmetic (via the fraction-free
+    integral Gram-Schmidt data also used by the exact LLL mode).
+
+    :param basis: List of NumPy vectors, a 2-D array whose rows are the basis vectors, or
+                  a 3-D array holding a stack of such bases.
+    :type basis: list[numpy.ndarray] or numpy.ndarray
+    :param exact: If True, returns :class:`fractions.Fraction` values computed exactly;
+                  requires integer or rational entries. Default is False.
+    :type exact: bool
+    :param return_norms: If True, also returns the squared norms of the orthogonalized
+                         vectors. Default is False.
+    :type return_norms: bool
+
+    :return: A tuple (ortho, mu), or (ortho, mu, B) if ``return_norms`` is True, where:
+             - ortho: Orthogonalized basis vectors, in the same form as the input
+               (list of vectors or array).
+             - mu: Matrix of Gram-Schmidt coefficients (zero on and above the diagonal).
+             - B: Squared norms of the orthogonalized vectors.
+             For a stack of bases every result has the stack as leading axis.
+    :rtype: tuple[list[numpy.ndarray] or numpy.ndarray, numpy.ndarray] or
+            tuple[list[numpy.ndarray] or numpy.ndarray, numpy.ndarray, numpy.ndarray]
+
+    .. note::
+       The orthogonalized vectors are not necessarily part of the lattice;
+       they span the same space but are not required to have integer coordinates.
+    """
+    rows = np.array(basis)
+
+    if not exact:
+        ortho, mu, B = _float_gso(rows.astype(float))
+    elif rows.ndim == 2:
+        ortho, mu, B = _exact_gso(rows)
+    else:
+        ortho = np.empty(rows.shape, dtype=object)
+        mu = np.empty(rows.shape[:-1] + rows.shape[-2:-1], dtype=object)
+        B = np.empty(rows.shape[:-1], dtype=object)
+        for index in np.ndindex(rows.shape[:-2]):
+            ortho[index], mu[index], B[index] = _exact_gso(rows[index])
+
+    if not isinstance(basis, np.ndarray):
+        ortho = list(ortho)
+
+    return (ortho, mu, B) if return_norms else (ortho, mu)
 
 
 def are_bases_equal_2d(basis1, basis2):
@@ -1,5 +1,15 @@
-from .tests_br2d import tests_br2d
-from .utils import generate_random_bases
-from .tests_lll import tests_brlll
+from .tests_br2d import tests_br2d, tests_br2d_batch
+from .utils import generate_random_bases, is_lattice_vector, is_lll_reduced, lattice_points
+from .tests_lll import (tests_brlll, tests_lll_budgeted, tests_lll_exact, tests_lll_fp, tests_lll_many, tests_lll_progress,
+                        tests_lll_reference, tests_lll_transform)
+from .tests_ring import tests_ring_inverse, tests_ring_multiply, tests_sparse_ternary
+from .tests_ntru import (tests_ntru_keys, tests_ntru_many, tests_ntru_random_keys, tests_ntru_stream,
+                         tests_ntru_attack, tests_ntru_failure, tests_serialization)
+from .tests_utils import tests_bases_equivalence, tests_gram_schmidt
+from .tests_bkz import tests_bkz
+from .tests_coppersmith import tests_rsa_stereotyped, tests_small_roots
+from .tests_sieve import tests_sieve
+from .tests_solver import tests_cvp, tests_svp, CVP_REGRESSION_CASES
+from .benchmarks import run_benchmarks, compare_benchmarks
 
 __version__ = "0.1.0"
\ No newline at end of file
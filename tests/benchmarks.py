@@ -0,0 +1,327 @@
+"""
+Benchmark suite for the hot paths of lattice_methods.
+
+Every benchmark runs one function on seeded random inputs for a grid of parameters
+(dimension, entry bit-size, ring degree N) and records the best and median time per
+call and the peak memory allocated by one call (tracemalloc). Results are stored as a
+JSON baseline; the compare mode reruns the benchmarks of a baseline and fails if a
+function got slower than the baseline times a threshold.
+
+Usage::
+
+    python -m tests.benchmarks record benchmarks.json
+    python -m tests.benchmarks compare benchmarks.json --threshold 1.25
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+import zlib
+
+import numpy as np
+from sympy import Poly
+
+from lattice_methods.basis_reduction_2d import reduce_2d_basis
+from lattice_methods.keygen import ntru_random_keys
+from lattice_methods.lll import lll_reduce
+from lattice_methods.ntru import (ntru_decryption, ntru_encryption, ntru_generate_keys,
+                                  poly_inv_mod_ring, poly_mult_mod_ring, x)
+from lattice_methods.utils import _determinant, _hermite_normal_form, are_bases_equivalent, gram_schmidt
+
+BASELINE_VERSION = 1
+
+# NTRU moduli used by the polynomial benchmarks.
+NTRU_P = 3
+NTRU_Q = 2048
+
+
+def _random_basis(rng, dim, bits):
+    """
+    Returns a random square integer basis with entries of the given bit-size.
+    """
+    bound = 2 ** bits
+    return [rng.integers(-bound, bound + 1, size=dim) for _ in range(dim)]
+
+
+def _ternary(rng, N):
+    return [int(c) for c in rng.integers(-1, 2, size=N)]
+
+
+def _keys(N, seed):
+    """
+    Returns a seeded NTRU key pair with the private polynomial as SymPy Poly.
+    """
+    pubkey, prvkey = ntru_random_keys(N, NTRU_P, NTRU_Q, seed=seed)
+    f = Poly([int(c) for c in prvkey.f.coefficients()[::-1]], x)
+    return pubkey, [f, prvkey.Fp]
+
+
+def _setup_reduce_2d_basis(rng, bits):
+    b1, b2 = _random_basis(rng, 2, bits)
+    return lambda: reduce_2d_basis(b1, b2)
+
+
+def _setup_lll_reduce(rng, dim, bits):
+    basis = _random_basis(rng, dim, bits)
+    return lambda: lll_reduce(basis)
+
+
+def _setup_gram_schmidt(rng, dim, bits):
+    basis = _random_basis(rng, dim, bits)
+    return lambda: gram_schmidt(basis)
+
+
+def _setup_are_bases_equivalent(rng, dim, bits):
+    basis = _random_basis(rng, dim, bits)
+    reduced = lll_reduce(basis)
+
+    def call():
+        # Determinants and Hermite normal forms are cached per basis; without clearing
+        # the caches every call after the first would only measure cache hits.
+        _determinant.cache_clear()
+        _hermite_normal_form.cache_clear()
+        return are_bases_equivalent(basis, reduced)
+
+    return call
+
+
+def _setup_poly_mult_mod_ring(rng, N):
+    a = [int(c) for c in rng.integers(0, NTRU_Q, size=N)]
+    b = _ternary(rng, N)
+    return lambda: poly_mult_mod_ring(a, b, N, NTRU_Q)
+
+
+def _setup_poly_inv_mod_ring(rng, N):
+    _, (f, _) = _keys(N, int(rng.integers(2 ** 32)))
+    return lambda: poly_inv_mod_ring(f, N, NTRU_Q)
+
+
+def _setup_ntru_generate_keys(rng, N):
+    _, (f, _) = _keys(N, int(rng.integers(2 ** 32)))
+    g = Poly(_ternary(rng, N), x)
+    return lambda: ntru_generate_keys(N, NTRU_P, NTRU_Q, g, f)
+
+
+def _setup_ntru_encryption(rng, N):
+    pubkey, _ = _keys(N, int(rng.integers(2 ** 32)))
+    phi, m = Poly(_ternary(rng, N), x), Poly(_ternary(rng, N), x)
+    return lambda: ntru_encryption(pubkey, phi, m)
+
+
+def _setup_ntru_decryption(rng, N):
+    pubkey, prvkey = _keys(N, int(rng.integers(2 ** 32)))
+    ciphertext = ntru_encryption(pubkey, Poly(_ternary(rng, N), x), Poly(_ternary(rng, N), x))
+    return lambda: ntru_decryption(pubkey, prvkey, ciphertext)
+
+
+# Benchmarked functions: name -> (setup, parameter grid). A setup receives a seeded
+# generator and the parameters and returns the call to time.
+BENCHMARKS = {
+    "reduce_2d_basis": (_setup_reduce_2d_basis, [dict(bits=b) for b in (16, 48)]),
+    "lll_reduce": (_setup_lll_reduce, [dict(dim=d, bits=b) for d in (10, 20, 30) for b in (8, 32)]),
+    "gram_schmidt": (_setup_gram_schmidt, [dict(dim=d, bits=16) for d in (20, 80)]),
+    "are_bases_equivalent": (_setup_are_bases_equivalent, [dict(dim=d, bits=8) for d in (10, 30)]),
+    "poly_mult_mod_ring": (_setup_poly_mult_mod_ring, [dict(N=N) for N in (107, 509, 821)]),
+    "poly_inv_mod_ring": (_setup_poly_inv_mod_ring, [dict(N=N) for N in (107, 509)]),
+    "ntru_generate_keys": (_setup_ntru_generate_keys, [dict(N=N) for N in (107, 509)]),
+    "ntru_encryption": (_setup_ntru_encryption, [dict(N=N) for N in (107, 509, 821)]),
+    "ntru_decryption": (_setup_ntru_decryption, [dict(N=N) for N in (107, 509, 821)]),
+}
+
+
+def _case_key(name, params):
+    return f"{name}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+
+
+def _measure(call, repeat, min_time):
+    """
+    Times a call (best and median time per call over ``repeat`` rounds, each round
+    running it often enough to last at least ``min_time`` seconds) and measures the
+    peak memory allocated by one call.
+    """
+    timer = timeit.Timer(call)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    times = [t / number for t in timer.repeat(repeat, number)]
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "time_min": min(times),
+        "time_median": float(np.median(times)),
+        "number": number,
+        "repeat": repeat,
+        "peak_memory": peak,
+    }
+
+
+def run_benchmarks(names=None, keys=None, seed=0, repeat=5, min_time=0.05, verbose=False):
+    """
+    Runs the benchmarks.
+
+    :param names: Names of the functions to benchmark; all if None.
+    :type names: list[str] or None
+    :param keys: Keys of single cases (as in a baseline) to run instead of whole functions.
+    :type keys: list[str] or None
+    :param seed: Seed of the inputs; every case derives its own generator from it.
+    :type seed: int
+    :param repeat: Number of timing rounds per case.
+    :type repeat: int
+    :param min_time: Minimum duration of a timing round in seconds.
+    :type min_time: float
+    :param verbose: Whether to print a line per case.
+    :type verbose: bool
+
+    :return: Baseline dictionary with the entries ``'version'``, ``'seed'``, ``'meta'``
+             (Python, NumPy and platform) and ``'results'``, mapping every case key to a
+             dictionary with ``'function'``, ``'params'``, ``'time_min'``,
+             ``'time_median'``, ``'number'``, ``'repeat'`` and ``'peak_memory'`` (bytes).
+    :rtype: dict
+
+    :raises KeyError: If an unknown function name is given.
+    """
+    results = {}
+
+    for name in names or BENCHMARKS:
+        setup, grid = BENCHMARKS[name]
+        for params in grid:
+            key = _case_key(name, params)
+            if keys is not None and key not in keys:
+                continue
+
+            rng = np.random.default_rng([seed, zlib.crc32(key.encode())])
+            entry = _measure(setup(rng, **params), repeat, min_time)
+            results[key] = dict(function=name, params=params, **entry)
+
+            if verbose:
+                print(f"{key:45s} {entry['time_min'] * 1e3:10.3f} ms "
+                      f"{entry['peak_memory'] / 1024:10.1f} KiB")
+
+    return {
+        "version": BASELINE_VERSION,
+        "seed": seed,
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def save_baseline(baseline, path):
+    """
+    Writes benchmark results to a JSON file.
+    """
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def load_baseline(path):
+    """
+    Reads benchmark results from a JSON file.
+
+    :raises ValueError: If the file has an unsupported version.
+    """
+    with open(path) as f:
+        baseline = json.load(f)
+
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported benchmark baseline version: {baseline.get('version')}.")
+    return baseline
+
+
+def compare_benchmarks(baseline, current, threshold=1.25):
+    """
+    Compares benchmark results with a baseline.
+
+    :param baseline: Results of :func:`run_benchmarks` (or :func:`load_baseline`).
+    :type baseline: dict
+    :param current: Results to check.
+    :type current: dict
+    :param threshold: Largest accepted ratio of the current to the baseline best time.
+    :type threshold: float
+
+    :return: One dictionary per case present in both, with ``'key'``, ``'baseline'`` and
+             ``'current'`` best times, their ``'ratio'``, the ``'memory_ratio'`` and the
+             flag ``'regression'``.
+    :rtype: list[dict]
+    """
+    comparison = []
+    for key, old in baseline["results"].items():
+        new = current["results"].get(key)
+        if new is None:
+            continue
+
+        ratio = new["time_min"] / old["time_min"]
+        comparison.append({
+            "key": key,
+            "baseline": old["time_min"],
+            "current": new["time_min"],
+            "ratio": ratio,
+            "memory_ratio": new["peak_memory"] / max(old["peak_memory"], 1),
+            "regression": ratio > threshold,
+        })
+
+    return comparison
+
+
+def main(argv=None):
+    """
+    Command line interface: ``record`` writes a baseline, ``compare`` reruns the cases
+    of a baseline and exits with status 1 if any of them regressed.
+    """
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks", description=__doc__.split("\n\n")[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="run the benchmarks and write a JSON baseline")
+    record.add_argument("output", help="path of the baseline file")
+    record.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="functions to run")
+    record.add_argument("--seed", type=int, default=0)
+    record.add_argument("--repeat", type=int, default=5)
+
+    compare = commands.add_parser("compare", help="rerun a baseline and report regressions")
+    compare.add_argument("baseline", help="path of the baseline file")
+    compare.add_argument("--threshold", type=float, default=1.25,
+                         help="fail if a case is slower than threshold * baseline (default 1.25)")
+    compare.add_argument("--output", help="also write the new results to this file")
+    compare.add_argument("--repeat", type=int, default=5)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        save_baseline(run_benchmarks(args.only, seed=args.seed, repeat=args.repeat, verbose=True),
+                      args.output)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    current = run_benchmarks(sorted({r["function"] for r in baseline["results"].values()}),
+                             keys=set(baseline["results"]), seed=baseline["seed"],
+                             repeat=args.repeat)
+    if args.output:
+        save_baseline(current, args.output)
+
+    failed = 0
+    for entry in compare_benchmarks(baseline, current, args.threshold):
+        status = "REGRESSION" if entry["regression"] else "ok"
+        failed += entry["regression"]
+        print(f"{entry['key']:45s} {entry['baseline'] * 1e3:10.3f} -> {entry['current'] * 1e3:10.3f} ms "
+              f"x{entry['ratio']:5.2f}  mem x{entry['memory_ratio']:5.2f}  {status}")
+
+    print(f"{failed} regression(s) with threshold {args.threshold}.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+from lattice_methods.bkz import bkz_reduce
+from lattice_methods.lll import lll_reduce
+from lattice_methods.utils import are_bases_equivalent
+from .utils import is_lll_reduced
+from itertools import product
+import numpy as np
+
+
+def _block_minimum(block, radius2):
+    """
+        Returns the smallest squared norm of a nonzero vector of the lattice spanned by the rows
+        of ``block`` that is at most ``radius2``, by trying every coefficient vector in a box.
+
+        A vector ``v = x B`` satisfies ``x = v B^+``, so ``|x_i| <= ||v|| * ||B^+ e_i||``.
+    """
+    rows = np.array(block, dtype=np.int64)
+    bounds = np.floor(np.sqrt(radius2) * np.linalg.norm(np.linalg.pinv(rows.astype(float)), axis=0) + 1e-6)
+
+    best = radius2
+    for x in product(*(range(-int(b), int(b) + 1) for b in bounds)):
+        if any(x):
+            v = np.array(x, dtype=np.int64) @ rows
+            best = min(best, int(v @ v))
+    return best
+
+
+def tests_bkz(basis_list, block_size=4, delta=0.99, verbose=False):
+    """
+        Performs batch testing of BKZ lattice basis reduction.
+
+        This function takes a list of lattice bases, applies BKZ reduction to each and
+        verifies that:
+          1. The reduced basis is equivalent to the original one, and the returned
+             transformation maps the original basis onto it.
+          2. The reduced basis is LLL-reduced (size-reduced with the Lovász condition).
+          3. The first vector is a shortest vector of the first block up to the factor
+             ``delta`` (checked by exhaustive search in a box of coefficients).
+          4. The first vector is at most as long as the first vector of the LLL-reduced basis.
+
+        :param basis_list: List of lattice bases to test. Each basis is a list of NumPy arrays or a 2-D array.
+        :type basis_list: list[list[np.ndarray]]
+
+        :param block_size: BKZ block size.
+        :type block_size: int
+
+        :param delta: Lovász parameter and insertion threshold.
+        :type delta: float
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the reduced basis and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        reduced, U = bkz_reduce(basis, block_size, delta=delta, return_transform=True)
+        reduced = np.array(reduced)
+
+        same = are_bases_equivalent(basis, reduced) and np.array_equal(U @ np.array(basis), reduced)
+        lll = is_lll_reduced(reduced, delta)
+
+        b1 = int(np.dot(reduced[0], reduced[0]))
+        strong = delta * b1 <= _block_minimum(reduced[:block_size], b1)
+
+        first = np.array(lll_reduce(basis, delta=delta))[0]
+        better = b1 <= int(np.dot(first, first))
+
+        result = int(same and lll and strong and better)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Dimension: {len(reduced)}, block size: {block_size}")
+            print(f"First reduced vector: {reduced[0].tolist()}")
+            print(f"Squared length: {b1} (LLL: {int(np.dot(first, first))})")
+            print()
+
+        results.append({
+            "basis": reduced.tolist(),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
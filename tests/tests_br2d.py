@@ -1,4 +1,4 @@
-from lattice_methods.basis_reduction_2d import reduce_2d_basis
+from lattice_methods.basis_reduction_2d import reduce_2d_bases, reduce_2d_basis
 from lattice_methods.utils import are_bases_equivalent
 import numpy as np
 
@@ -64,4 +64,52 @@ def tests_br2d(basis_list, verbose=False):
     if verbose:
         print(f"\n📊 {tests_amount}/{tests_passed} tests passed.")
 
-    return results
\ No newline at end of file
+    return results
+
+
+def tests_br2d_batch(basis_list, verbose=False):
+    """
+        Performs batch testing of the batched 2D lattice basis reduction.
+
+        All bases are reduced together with `reduce_2d_bases`, and each result is
+        compared with the reduction of the same basis by `reduce_2d_basis`, which has to
+        give exactly the same pair of vectors.
+
+        :param basis_list: List of 2D lattice bases. Each element is a pair of vectors (b1, b2), where b1 and b2 are NumPy arrays.
+        :type basis_list: list[tuple[np.ndarray, np.ndarray]]
+
+        :param verbose: Whether to print detailed output for each test.
+        :type verbose: bool
+
+        :return: List of test results. Each result is a dict with the reduced vectors and a pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    reduced = reduce_2d_bases(np.array(basis_list))
+
+    for i, (b1, b2) in enumerate(basis_list):
+        expected = reduce_2d_basis(b1, b2)
+
+        result = int(np.array_equal(reduced[i], np.array(expected)))
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Initial basis: b1 = {b1}, b2 = {b2}")
+            print(f"Reduced basis: b1 = {reduced[i][0]}, b2 = {reduced[i][1]}")
+
+        results.append({
+            "b1": reduced[i][0],
+            "b2": reduced[i][1],
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
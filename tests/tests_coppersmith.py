@@ -0,0 +1,171 @@
+from lattice_methods import coppersmith
+from lattice_methods.coppersmith import coppersmith_lattice, rsa_stereotyped_roots, small_roots
+from sympy import nextprime
+import math
+import numpy as np
+import random
+
+
+def _evaluate(coefficients, x0):
+    """
+        Evaluates a polynomial given by its coefficients (highest degree first) at an integer.
+    """
+    value = 0
+    for c in coefficients:
+        value = value * x0 + int(c)
+    return value
+
+
+def _random_instance(rng, bits, degree, X):
+    """
+        Returns a modulus n (product of two random primes), a polynomial of the given degree
+        (highest degree first) with a known root x0, |x0| <= X, modulo n, and x0.
+    """
+    n = nextprime(rng.randrange(2 ** (bits // 2 - 1), 2 ** (bits // 2))) \
+        * nextprime(rng.randrange(2 ** (bits // 2 - 1), 2 ** (bits // 2)))
+    x0 = rng.randint(-X, X)
+
+    # f(x) = (x - x0) * u(x) mod n with a random cofactor u of degree - 1.
+    u = [rng.randrange(n) for _ in range(degree)]
+    coefficients = [0] * (degree + 1)
+    for k, c in enumerate(u):
+        coefficients[k] += c
+        coefficients[k + 1] -= c * x0
+    return n, [c % n for c in coefficients], x0
+
+
+def tests_small_roots(cases, seed=0, verbose=False):
+    """
+        Performs batch testing of Coppersmith's method for small roots modulo n.
+
+        For every case (bits, degree, X) this function builds a random modulus of the given size
+        and a polynomial of the given degree with a known root below X, and verifies that:
+          1. The lattice of `coppersmith_lattice` is lower triangular with dimension
+             ``degree * m + t``, and every row vanishes at the root modulo ``n^m``.
+          2. `small_roots` returns exactly the roots found by trying every integer in [-X, X].
+
+        :param cases: List of (bits, degree, X) triples; X must stay below about ``n^(1 / degree)``
+                      and be small enough for the exhaustive search.
+        :type cases: list[tuple[int, int, int]]
+
+        :param seed: Seed of the random instances.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the roots and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = random.Random(seed)
+
+    tests_amount = len(cases)
+    tests_passed = 0
+
+    results = []
+
+    for i, (bits, degree, X) in enumerate(cases):
+        n, polynomial, x0 = _random_instance(rng, bits, degree, X)
+
+        basis, (m, t) = coppersmith_lattice(polynomial, n, X)
+        rows = np.array(basis, dtype=object)
+        dimension = len(rows)
+        lattice = dimension == degree * m + t and not np.triu(rows, 1).any() \
+            and all(sum(int(c) // X ** k * x0 ** k for k, c in enumerate(row)) % n ** m == 0 for row in rows)
+
+        roots = small_roots(polynomial, n, X)
+        expected = [r for r in range(-X, X + 1) if _evaluate(polynomial, r) % n == 0]
+
+        result = int(lattice and roots == expected and x0 in roots)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"n: {n.bit_length()} bits, degree {degree}, X = {X}, lattice {dimension} x {dimension} "
+                  f"(m = {m}, t = {t}), roots: {roots}")
+            print()
+
+        results.append({
+            "roots": roots,
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_rsa_stereotyped(n, e, B, X, count=6, seed=0, verbose=False):
+    """
+        Performs batch testing of the attack on stereotyped RSA messages.
+
+        Messages ``B + x`` with random unknown parts ``0 <= x <= X`` are encrypted as
+        ``c = (B + x)^e mod n``. The test verifies that `rsa_stereotyped_roots` recovers every
+        message with one and with two workers, that each message equals ``B + x0`` for the
+        root x0 that `small_roots` finds for the polynomial ``(B + x)^e - c``, and that the
+        lattice built with the shared layout equals the one of `coppersmith_lattice`.
+
+        :param n: RSA modulus.
+        :type n: int
+
+        :param e: Public exponent.
+        :type e: int
+
+        :param B: Known part of the messages.
+        :type B: int
+
+        :param X: Bound on the unknown part.
+        :type X: int
+
+        :param count: Number of messages.
+        :type count: int
+
+        :param seed: Seed of the unknown parts.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per message. Each result is a dict with the recovered message and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = random.Random(seed)
+    unknowns = [rng.randint(0, X) for _ in range(count)]
+    instances = [(pow(B + x, e, n), B) for x in unknowns]
+
+    batch = [rsa_stereotyped_roots(n, e, instances, X, workers=workers) for workers in (1, 2)]
+    m, t = coppersmith._choose_parameters(e, n, X, None, None)
+    layout = coppersmith._layout(e, n, X, m, t)
+
+    tests_passed = 0
+    results = []
+
+    for i, ((c, known), x) in enumerate(zip(instances, unknowns)):
+        polynomial = [0] * (e + 1)
+        for k in range(e + 1):
+            polynomial[e - k] = math.comb(e, k) * known ** (e - k)
+        polynomial[e] -= c
+        single = [known + r for r in small_roots(polynomial, n, X) if pow(known + r, e, n) == c]
+        shared = np.array_equal(coppersmith._lattice(coppersmith._stereotyped_polynomial(c, known, n, e), n, X, m, t,
+                                                     layout), coppersmith_lattice(polynomial, n, X, m, t)[0])
+
+        result = int(batch[0][i] == batch[1][i] == known + x and single == [known + x] and shared)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Unknown part: {x}, recovered message: {batch[0][i]}")
+            print()
+
+        results.append({
+            "message": batch[0][i],
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{count} tests passed.")
+
+    return results
@@ -1,7 +1,54 @@
-from lattice_methods.lll import lll_reduce
+from lattice_methods.checkpoint import lll_reduce_budgeted, lll_resume
+from lattice_methods.lll import basis_quality, lll_reduce, lll_reduce_fp
+from lattice_methods.parallel import lll_reduce_many
 from lattice_methods.utils import are_bases_equivalent
+from .utils import exact_gram_schmidt, is_lll_reduced
+from fractions import Fraction
+import math
+import os
+import tempfile
+from sympy import Matrix
 import numpy as np
 
+
+def _reference_lll(basis, delta=0.75):
+    """
+        Textbook LLL in exact rational arithmetic, recomputing the Gram-Schmidt data after
+        every change of the basis. Slow, but it takes the same decisions as the original
+        implementation and serves as reference for the incremental engines.
+    """
+    basis = [[int(c) for c in v] for v in basis]
+    delta = Fraction(delta)
+    n = len(basis)
+
+    def gso():
+        ortho, mu = [], [[Fraction(0)] * n for _ in range(n)]
+        for i, v in enumerate(basis):
+            w = [Fraction(c) for c in v]
+            for j in range(i):
+                mu[i][j] = sum(Fraction(a) * b for a, b in zip(v, ortho[j])) / sum(b * b for b in ortho[j])
+                w = [a - mu[i][j] * b for a, b in zip(w, ortho[j])]
+            ortho.append(w)
+        return mu, [sum(c * c for c in w) for w in ortho]
+
+    k = 1
+    while k < n:
+        for j in range(k - 1, -1, -1):
+            mu, B = gso()
+            if abs(mu[k][j]) > Fraction(1, 2):
+                r = round(mu[k][j])
+                basis[k] = [a - r * b for a, b in zip(basis[k], basis[j])]
+
+        mu, B = gso()
+        if delta * B[k - 1] > B[k] + mu[k][k - 1] ** 2 * B[k - 1]:
+            basis[k], basis[k - 1] = basis[k - 1], basis[k]
+            k = max(k - 1, 1)
+        else:
+            k += 1
+
+    return basis
+
+
 def tests_brlll(basis_list, verbose=False):
     """
         Performs batch testing of LLL lattice basis reduction.
@@ -58,4 +105,428 @@ def tests_brlll(basis_list, verbose=False):
     if verbose:
         print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
 
-    return results
\ No newline at end of file
+    return results
+
+
+def tests_lll_reference(basis_list, delta=0.75, verbose=False):
+    """
+        Compares `lll_reduce` with a textbook LLL reduction in exact rational arithmetic.
+
+        `lll_reduce` keeps its Gram-Schmidt data incrementally instead of recomputing it
+        after every step. For every basis this function verifies that:
+          1. The result is exactly the basis computed by the textbook reference.
+          2. The result is LLL-reduced, checked in exact rational arithmetic.
+
+        :param basis_list: List of lattice bases to test (small dimension, up to about 10).
+        :type basis_list: list[list[np.ndarray]]
+
+        :param delta: Lovász parameter.
+        :type delta: float
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the reduced basis and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        reduced = lll_reduce(basis, delta=delta)
+        expected = _reference_lll(basis, delta)
+
+        same = [[int(c) for c in v] for v in reduced] == expected
+        result = int(same and is_lll_reduced(reduced, delta))
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Dimension: {len(reduced)}, first reduced vector: {reduced[0].tolist()}")
+            print()
+
+        results.append({
+            "basis": [v.tolist() for v in reduced],
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_lll_exact(basis_list, delta=0.75, verbose=False):
+    """
+        Performs batch testing of the fraction-free integral mode of `lll_reduce`.
+
+        For every basis (typically with entries far beyond the float64 precision) this
+        function verifies that:
+          1. ``lll_reduce(basis, exact=True)`` is exactly the basis computed by the textbook
+             reduction in rational arithmetic.
+          2. The automatic mode selection gives the same result.
+          3. The result is LLL-reduced, checked in exact rational arithmetic.
+
+        :param basis_list: List of lattice bases to test (small dimension, up to about 8).
+        :type basis_list: list[list[np.ndarray]]
+
+        :param delta: Lovász parameter.
+        :type delta: float
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the reduced basis and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        reduced = [[int(c) for c in v] for v in lll_reduce(basis, delta=delta, exact=True)]
+        automatic = [[int(c) for c in v] for v in lll_reduce(basis, delta=delta)]
+
+        same = reduced == _reference_lll(basis, delta) and automatic == reduced
+        result = int(same and is_lll_reduced(reduced, delta))
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Dimension: {len(reduced)}, largest initial entry: {max(abs(int(c)) for v in basis for c in v).bit_length()} bits")
+            print(f"First reduced vector: {reduced[0]}")
+            print()
+
+        results.append({
+            "basis": reduced,
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_lll_many(basis_list, workers=2, verbose=False):
+    """
+        Performs batch testing of the parallel reduction `lll_reduce_many`.
+
+        The whole list is reduced in a pool of worker processes, once in input order and
+        once streamed in completion order, and every result has to be identical to
+        `lll_reduce` applied to the same basis in the calling process.
+
+        :param basis_list: List of lattice bases to test. Each basis is a list of NumPy arrays.
+        :type basis_list: list[list[np.ndarray]]
+
+        :param workers: Number of worker processes.
+        :type workers: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the reduced basis and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    reduced_list = lll_reduce_many(basis_list, workers=workers, chunksize=2)
+    streamed = dict(lll_reduce_many(basis_list, workers=workers, stream=True))
+
+    for i, basis in enumerate(basis_list):
+        expected = lll_reduce(basis)
+
+        result = int(np.array_equal(reduced_list[i], expected) and np.array_equal(streamed[i], expected))
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Dimension: {len(expected)}, first reduced vector: {expected[0].tolist()}")
+            print()
+
+        results.append({
+            "basis": [v.tolist() for v in reduced_list[i]],
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_lll_transform(basis_list, verbose=False):
+    """
+        Performs batch testing of the unimodular transformation returned by `lll_reduce`.
+
+        Every basis is reduced as a list of vectors and as a 2-D array, in both modes
+        (floating-point and exact), with ``return_transform=True``. The test verifies that:
+          1. ``U @ basis`` equals the reduced basis and ``U`` is unimodular (``det U = ±1``).
+          2. The result has the form of the input (list or array) and the input is unchanged.
+          3. All four runs give the same reduced basis.
+
+        :param basis_list: List of lattice bases to test. Each basis is a list of NumPy arrays.
+        :type basis_list: list[list[np.ndarray]]
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the transformation and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        matrix = np.array(basis)
+        copy = matrix.copy()
+
+        runs = []
+        for form in (list(matrix), matrix):
+            for exact in (False, True):
+                reduced, U = lll_reduce(form, exact=exact, return_transform=True)
+                same_form = isinstance(reduced, list) == isinstance(form, list)
+                unimodular = abs(Matrix(np.array(U, dtype=object).tolist()).det()) == 1
+                runs.append((np.array(reduced, dtype=object), same_form and unimodular
+                             and np.array_equal(np.array(U, dtype=object) @ matrix.astype(object), np.array(reduced))))
+
+        consistent = all(np.array_equal(runs[0][0], r) for r, _ in runs)
+        unchanged = np.array_equal(matrix, copy)
+
+        result = int(all(ok for _, ok in runs) and consistent and unchanged)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print("Transformation:")
+            for v in U:
+                print(" ", v)
+            print()
+
+        results.append({
+            "transform": np.array(U).tolist(),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_lll_budgeted(basis_list, max_iterations=20, verbose=False):
+    """
+        Performs batch testing of budgeted LLL runs with checkpoints.
+
+        Every basis is reduced in slices of ``max_iterations`` iterations: the first slice
+        by `lll_reduce_budgeted`, which writes a checkpoint file, and all further ones by
+        `lll_resume` from that file. The test verifies that:
+          1. The run reports completion only at the end, and the final basis is exactly
+             the result of an uninterrupted `lll_reduce`.
+          2. The transformation tracked across the interruptions maps the input onto it.
+
+        :param basis_list: List of lattice bases to test. Each basis is a list of NumPy arrays or a 2-D array.
+        :type basis_list: list[list[np.ndarray]]
+
+        :param max_iterations: Iteration budget of every slice.
+        :type max_iterations: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the reduced basis, the number of slices and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "checkpoint.json")
+
+        for i, basis in enumerate(basis_list):
+            reduced, U, done = lll_reduce_budgeted(basis, return_transform=True, max_iterations=max_iterations,
+                                                   checkpoint_path=path)
+            slices = 1
+            while not done:
+                reduced, U, done = lll_resume(path, return_transform=True, max_iterations=max_iterations)
+                slices += 1
+
+            expected = lll_reduce(basis)
+            same = np.array_equal(np.array(reduced), np.array(expected))
+            transform = np.array_equal(np.array(U) @ np.array(basis), np.array(reduced))
+
+            result = int(same and transform)
+            if result:
+                tests_passed += 1
+
+            if verbose:
+                print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+                print(f"Dimension: {len(reduced)}, slices of {max_iterations} iterations: {slices}")
+                print()
+
+            results.append({
+                "basis": np.array(reduced).tolist(),
+                "slices": slices,
+                "result": result
+            })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def _reference_quality(basis):
+    """
+        Computes the metrics of `basis_quality` directly from their definitions, using the
+        exact Gram-Schmidt data and the exact volume of the lattice.
+    """
+    _, _, B = exact_gram_schmidt(basis)
+    n = len(B)
+    log_norms = np.array([0.5 * (math.log2(b.numerator) - math.log2(b.denominator)) for b in B])
+    log_volume = math.log2(abs(int(Matrix(np.array(basis, dtype=object).tolist()).det())))
+    log_lengths = [0.5 * math.log2(sum(int(c) ** 2 for c in v)) for v in basis]
+
+    return {
+        "b1_norm": 2 ** log_lengths[0],
+        "root_hermite_factor": 2 ** ((log_lengths[0] - log_volume / n) / n),
+        "gsa_slope": float(np.polyfit(np.arange(n), log_norms, 1)[0]),
+        "log_potential": float(sum(2 * (n - i) * log_norms[i] for i in range(n))),
+        "log_orthogonality_defect": sum(log_lengths) - log_volume,
+    }
+
+
+def tests_lll_progress(basis_list, callback_interval=10, verbose=False):
+    """
+        Performs batch testing of the progress reports of `lll_reduce` and of `basis_quality`.
+
+        Every basis is reduced with a callback that records the reports. The test verifies that:
+          1. The result is the same as without a callback.
+          2. Reports arrive during the run with non-decreasing counters, and the final
+             report has ``k == n`` and describes the reduced basis.
+          3. The metrics of `basis_quality` (for the input and the reduced basis) agree with
+             their definitions evaluated in exact arithmetic.
+
+        :param basis_list: List of lattice bases to test. Each basis is a list of NumPy arrays or a 2-D array.
+        :type basis_list: list[list[np.ndarray]]
+
+        :param callback_interval: Number of iterations between two reports.
+        :type callback_interval: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the final report and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        reports = []
+        reduced = lll_reduce(basis, callback=reports.append, callback_interval=callback_interval)
+        final = reports[-1]
+
+        same = np.array_equal(np.array(reduced), np.array(lll_reduce(basis)))
+        counters = all(a["iterations"] <= b["iterations"] and a["swaps"] <= b["swaps"]
+                       for a, b in zip(reports, reports[1:]))
+        finished = len(reports) >= 2 and final["k"] == final["n"] == len(reduced) \
+            and final["swaps"] <= final["iterations"]
+
+        quality = basis_quality(reduced)
+        agrees = all(math.isclose(final[key], quality[key], rel_tol=1e-9, abs_tol=1e-9) for key in quality)
+        for matrix in (basis, reduced):
+            metrics, expected = basis_quality(matrix), _reference_quality(matrix)
+            agrees &= all(math.isclose(metrics[key], expected[key], rel_tol=1e-6, abs_tol=1e-6) for key in expected)
+
+        result = int(same and counters and finished and agrees)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Reports: {len(reports)}, iterations: {final['iterations']}, swaps: {final['swaps']}, "
+                  f"root Hermite factor: {quality['root_hermite_factor']:.5f}")
+            print()
+
+        results.append({
+            "report": final,
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_lll_fp(basis_list, delta=0.75, eta=0.51, verbose=False):
+    """
+        Performs batch testing of the floating-point L2 reduction `lll_reduce_fp`.
+
+        For every basis this function verifies that:
+          1. The reduced basis is equivalent to the original one, and the returned
+             transformation maps the original basis onto it.
+          2. The reduced basis is size-reduced up to ``eta`` and satisfies the Lovász
+             condition, checked in exact rational arithmetic.
+
+        :param basis_list: List of lattice bases to test. Each basis is a list of NumPy arrays or a 2-D array.
+        :type basis_list: list[list[np.ndarray]]
+
+        :param delta: Lovász parameter.
+        :type delta: float
+
+        :param eta: Size-reduction parameter.
+        :type eta: float
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the reduced basis and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        reduced, U = lll_reduce_fp(basis, delta=delta, eta=eta, return_transform=True)
+        reduced = np.array(reduced)
+
+        same = are_bases_equivalent(basis, reduced) and np.array_equal(U @ np.array(basis), reduced)
+        result = int(same and is_lll_reduced(reduced, delta, eta))
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Dimension: {len(reduced)}, largest initial entry: {max(abs(int(c)) for v in basis for c in v).bit_length()} bits")
+            print(f"First reduced vector: {reduced[0].tolist()}")
+            print()
+
+        results.append({
+            "basis": reduced.tolist(),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
@@ -0,0 +1,713 @@
+from lattice_methods import keygen, keys
+from lattice_methods import serialization, stream
+from lattice_methods.attack import ntru_attack, ntru_attack_sweep, ntru_lattice_basis
+from lattice_methods.failure import _wilson_interval, ntru_failure_estimate
+from lattice_methods.keygen import _child_seed, ntru_random_keys, ntru_random_keys_many
+from lattice_methods.keys import NTRUPrivateKey, NTRUPublicKey, clear_key_cache, load_private_key, load_public_key
+from lattice_methods.ntru import (ntru_decryption, ntru_decryption_many, ntru_encryption, ntru_encryption_many,
+                                  ntru_generate_keys, pad_left, x)
+from lattice_methods.ring import SparseTernary, ring_inverse
+from lattice_methods.serialization import (ciphertexts_from_bytes, ciphertexts_to_bytes, private_key_from_bytes,
+                                           private_key_to_bytes, public_key_from_bytes, public_key_to_bytes,
+                                           read_ciphertexts, write_ciphertexts)
+from lattice_methods.stream import ntru_decrypt_file, ntru_decrypt_stream, ntru_encrypt_file, ntru_encrypt_stream
+from sympy import Poly, primefactors
+from .tests_ring import _schoolbook
+from .utils import is_lattice_vector
+import io
+import numpy as np
+import os
+import tempfile
+
+
+def _as_list(polynomial, N):
+    """
+        Returns the N coefficients of a Poly or coefficient list, highest degree first.
+    """
+    coeffs = polynomial.all_coeffs() if isinstance(polynomial, Poly) else polynomial
+    return pad_left([int(c) for c in coeffs], N)
+
+
+def tests_ntru_many(parameters, batch=8, seed=0, verbose=False):
+    """
+        Performs batch testing of the batch NTRU encryption and decryption.
+
+        For every parameter set (N, p, q) this function generates a seeded key pair and a batch
+        of random ternary blinding polynomials and messages, and verifies that:
+          1. Every row of `ntru_encryption_many` equals the ciphertext of `ntru_encryption`.
+          2. Every row of `ntru_decryption_many` equals the message of `ntru_decryption`, with
+             the sparse private key and with the same key given as the list ``[Poly f, Fp]``.
+          3. The decrypted messages equal the original ones (the parameters are chosen without
+             decryption failures).
+
+        :param parameters: List of (N, p, q) parameter sets.
+        :type parameters: list[tuple[int, int, int]]
+
+        :param batch: Number of messages per parameter set.
+        :type batch: int
+
+        :param seed: Seed of the keys and of the random polynomials.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the parameters and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(parameters)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, p, q) in enumerate(parameters):
+        pubkey, prvkey = ntru_random_keys(N, p, q, seed=seed + i)
+        dense_prvkey = [Poly([int(c) for c in prvkey.f.coefficients()[::-1]], x), prvkey.Fp]
+
+        phis = rng.integers(-1, 2, size=(batch, N))
+        messages = rng.integers(-1, 2, size=(batch, N))
+
+        ciphertexts = ntru_encryption_many(pubkey, phis, messages)
+        expected = [_as_list(ntru_encryption(pubkey, Poly(phi.tolist(), x), Poly(m.tolist(), x)), N)
+                    for phi, m in zip(phis, messages)]
+        encryption = ciphertexts.tolist() == expected
+
+        decryption = True
+        for key in (prvkey, dense_prvkey):
+            decrypted = ntru_decryption_many(pubkey, key, ciphertexts)
+            scalar = [_as_list(ntru_decryption(pubkey, key, c), N) for c in expected]
+            decryption &= decrypted.tolist() == scalar and np.array_equal(decrypted, messages)
+
+        result = int(encryption and decryption)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"N = {N}, p = {p}, q = {q}, messages: {batch}")
+            print()
+
+        results.append({
+            "parameters": (N, p, q),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_ntru_keys(parameters, seed=0, verbose=False):
+    """
+        Performs batch testing of the NTRU key objects and of the cache of loaded keys.
+
+        For every parameter set (N, p, q) this function generates a key pair with `ntru_generate_keys`
+        from random ternary polynomials f (redrawn until invertible modulo p and q) and g, and verifies that:
+          1. The keys unpack like the lists ``[N, p, q, h]`` and ``[f, Fp]``, with ``f * h = p * g``
+             modulo q and ``f * Fp = 1`` modulo p (schoolbook products), and the precomputed
+             coefficient arrays and centering constants match them.
+          2. Loading the keys from lists gives objects with the same fingerprints, a second load
+             returns the cached objects, and after `clear_key_cache` new objects are built.
+          3. The cache holds at most its size of keys; a recently used key stays cached while
+             other keys are loaded, and is evicted once that many other keys have been used since.
+          4. Loading the same lists again finds the keys by identity, without converting the
+             coefficients.
+          5. Encryption and decryption with the lists give the same results as with the objects.
+
+        :param parameters: List of (N, p, q) parameter sets.
+        :type parameters: list[tuple[int, int, int]]
+
+        :param seed: Seed of the random polynomials.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the key fingerprints and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(parameters)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, p, q) in enumerate(parameters):
+        f = rng.integers(-1, 2, size=N).tolist()
+        while ring_inverse(f[::-1], N, p) is None or ring_inverse(f[::-1], N, q) is None:
+            f = rng.integers(-1, 2, size=N).tolist()
+        g = rng.integers(-1, 2, size=N).tolist()
+        pubkey, prvkey = ntru_generate_keys(N, p, q, Poly(g, x), Poly(f, x))
+
+        N_, p_, q_, h = pubkey
+        f_, Fp = prvkey
+        f_low, g_low = pad_left(f, N)[::-1], pad_left(g, N)[::-1]
+        h_low, Fp_low = pad_left(h, N)[::-1], pad_left(Fp, N)[::-1]
+
+        unpacked = (N_, p_, q_) == (N, p, q) and len(pubkey) == 4 and len(prvkey) == 2 \
+            and pubkey[3] == h and prvkey[1] == Fp and f_ == Poly(f, x)
+        algebra = _schoolbook(f_low, h_low, N, q) == [p * c % q for c in g_low] \
+            and _schoolbook(f_low, Fp_low, N, p) == [1] + [0] * (N - 1)
+        precomputed = pubkey.h_coeffs.tolist() == [c % q for c in h_low] \
+            and prvkey.f_coeffs.tolist() == f_low and prvkey.Fp_coeffs.tolist() == [c % p for c in Fp_low] \
+            and (prvkey.q_half, prvkey.p_half) == (q // 2, p // 2)
+
+        clear_key_cache()
+        public, private = load_public_key([N, p, q, h]), load_private_key([N, p, q, h], [f_, Fp])
+        cache = isinstance(public, NTRUPublicKey) and isinstance(private, NTRUPrivateKey) \
+            and (public.fingerprint, private.fingerprint) == (pubkey.fingerprint, prvkey.fingerprint) \
+            and load_public_key([N, p, q, h]) is public and load_private_key([N, p, q, h], [f_, Fp]) is private \
+            and load_public_key(pubkey) is pubkey and load_private_key(pubkey, prvkey) is prvkey
+        clear_key_cache()
+        public = load_public_key([N, p, q, h])
+        cache &= public is not load_public_key(pubkey) and public.fingerprint == pubkey.fingerprint
+
+        others = [[N, p, q, rng.integers(0, q, size=N).tolist()] for _ in range(keys._KEY_CACHE_SIZE)]
+        for other in others[1:]:
+            load_public_key(other)
+        cache &= load_public_key([N, p, q, h]) is public and len(keys._key_cache) == keys._KEY_CACHE_SIZE
+        for other in others:
+            load_public_key(other)
+        cache &= load_public_key([N, p, q, h]) is not public
+
+        pubkey_list, prvkey_list = [N, p, q, h], [f_, Fp]
+        public, private = load_public_key(pubkey_list), load_private_key(pubkey_list, prvkey_list)
+        conversion, keys._coefficients = keys._coefficients, None
+        try:
+            identity = load_public_key(pubkey_list) is public \
+                and load_private_key(pubkey_list, prvkey_list) is private
+        except TypeError:
+            identity = False
+        finally:
+            keys._coefficients = conversion
+
+        phi, m = Poly(rng.integers(-1, 2, size=N).tolist(), x), Poly(rng.integers(-1, 2, size=N).tolist(), x)
+        ciphertext = ntru_encryption(pubkey, phi, m)
+        lists = ntru_encryption([N, p, q, h], phi, m) == ciphertext \
+            and ntru_decryption([N, p, q, h], [f_, Fp], ciphertext) == ntru_decryption(pubkey, prvkey, ciphertext)
+
+        result = int(unpacked and algebra and precomputed and cache and identity and lists)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"{pubkey!r}")
+            print(f"{prvkey!r}")
+            print()
+
+        results.append({
+            "fingerprints": (pubkey.fingerprint, prvkey.fingerprint),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_ntru_random_keys(parameters, count=3, seed=0, verbose=False):
+    """
+        Performs batch testing of the random NTRU key generation.
+
+        For every parameter set (N, p, q) this function generates seeded key pairs and verifies that:
+          1. The same seed gives the same keys and another seed gives other keys.
+          2. f has ``d + 1`` coefficients equal to 1 and ``d`` equal to -1, ``f * Fp = 1`` modulo p,
+             and ``g = f * h / p`` modulo q is ternary with ``d`` coefficients of each sign.
+          3. A random message is recovered by decryption.
+          4. `ntru_random_keys_many` returns the keys of the derived seeds in order, with one
+             and with two workers.
+          5. Parameters with p and q not coprime are rejected with ValueError.
+          6. The pre-filter of f rejects the low-degree factors of ``x^N - 1`` over GF(2) and
+             GF(3) (ternary after centering), and every random candidate it rejects is
+             really not invertible modulo p or q.
+
+        :param parameters: List of (N, p, q) parameter sets.
+        :type parameters: list[tuple[int, int, int]]
+
+        :param count: Number of key pairs generated with `ntru_random_keys_many`.
+        :type count: int
+
+        :param seed: Seed of the key pairs.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the public key fingerprint and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(parameters)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, p, q) in enumerate(parameters):
+        d = N // 3
+        pubkey, prvkey = ntru_random_keys(N, p, q, seed=seed + i)
+
+        reproducible = ntru_random_keys(N, p, q, seed=seed + i)[0].fingerprint == pubkey.fingerprint \
+            and ntru_random_keys(N, p, q, seed=seed + i + 1)[0].fingerprint != pubkey.fingerprint
+
+        f_low = prvkey.f.coefficients().tolist()
+        g_low = [c * pow(p, -1, q) % q for c in _schoolbook(f_low, pubkey.h_coeffs, N, q)]
+        g_low = [c - q if c > q // 2 else c for c in g_low]
+        weights = (f_low.count(1), f_low.count(-1)) == (d + 1, d) \
+            and (g_low.count(1), g_low.count(-1), g_low.count(0)) == (d, d, N - 2 * d) \
+            and _schoolbook(f_low, prvkey.Fp_coeffs, N, p) == [1] + [0] * (N - 1)
+
+        phi, m = rng.integers(-1, 2, size=(2, N))
+        ciphertext = ntru_encryption(pubkey, Poly(phi.tolist(), x), Poly(m.tolist(), x))
+        decrypts = _as_list(ntru_decryption(pubkey, prvkey, ciphertext), N) == m.tolist()
+
+        expected = [ntru_random_keys(N, p, q, seed=_child_seed(seed, j))[0].fingerprint for j in range(count)]
+        parallel = all([pair[0].fingerprint for pair in ntru_random_keys_many(count, N, p, q, seed=seed,
+                                                                              workers=workers)] == expected
+                       for workers in (1, 2))
+
+        try:
+            ntru_random_keys(N, 2, 2 * q, seed=seed)
+            rejects = False
+        except ValueError:
+            rejects = True
+
+        primes = primefactors(p * q)
+        prefilter = True
+        for r in (r for r in primes if r <= 3):
+            for factor, _ in Poly(x ** N - 1, x, modulus=r).factor_list()[1]:
+                if factor.degree() <= keygen._FILTER_DEGREE:
+                    f = SparseTernary.from_coefficients([int(c) for c in factor.all_coeffs()[::-1]], N)
+                    prefilter &= not keygen._maybe_invertible(f, N, primes) \
+                        and ring_inverse(f.coefficients(), N, r) is None
+
+        stream = keygen._RandomStream(seed)
+        rejected = 0
+        for _ in range(200):
+            f = keygen._sample_ternary(stream, N, d + 1, d)
+            if not keygen._maybe_invertible(f, N, primes):
+                rejected += 1
+                prefilter &= any(ring_inverse(f.coefficients(), N, r) is None for r in primes)
+
+        result = int(reproducible and weights and decrypts and parallel and rejects and prefilter)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"N = {N}, p = {p}, q = {q}, d = {d}: {pubkey!r}")
+            print(f"Candidates for f rejected by the pre-filter: {rejected}/200")
+            print()
+
+        results.append({
+            "fingerprint": pubkey.fingerprint,
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def _rejects(function, *args):
+    """
+        Returns True if the call raises ValueError.
+    """
+    try:
+        function(*args)
+    except ValueError:
+        return True
+    return False
+
+
+def tests_ntru_stream(parameters, batch_blocks=4, seed=0, verbose=False):
+    """
+        Performs batch testing of the streaming NTRU encryption.
+
+        For every parameter set (N, p, q) this function encrypts random byte strings of several
+        lengths (empty, shorter than a block, whole blocks, several batches) and verifies that:
+          1. Decryption returns the plaintext, for bytes and file-object sources and with
+             different batch sizes for encryption and decryption.
+          2. A seeded encryption is reproducible and has one fixed-size frame per block.
+          3. Every frame decrypted with the scalar `ntru_decryption` gives the encoded block.
+          4. Files round-trip through `ntru_encrypt_file` / `ntru_decrypt_file`.
+          5. Truncated streams, streams for other parameters and blinding weights outside
+             ``1 <= d <= N / 2`` are rejected with ValueError.
+
+        :param parameters: List of (N, p, q) parameter sets without decryption failures.
+        :type parameters: list[tuple[int, int, int]]
+
+        :param batch_blocks: Number of blocks per batch when encrypting.
+        :type batch_blocks: int
+
+        :param seed: Seed of the keys, the plaintexts and the blinding polynomials.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the parameters and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(parameters)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, p, q) in enumerate(parameters):
+        pubkey, prvkey = ntru_random_keys(N, p, q, seed=seed + i)
+        unit, digits, block_size = stream._layout(N, p)
+        frame_size = stream._FRAME.size + N * stream._coefficient_dtype(q).itemsize
+
+        lengths = [0, 1, block_size - 1, block_size, 3 * block_size + 5, (2 * batch_blocks + 1) * block_size + 7]
+        round_trips = True
+        frames = True
+        for length in lengths:
+            data = rng.bytes(length)
+            encrypted = b"".join(ntru_encrypt_stream(pubkey, data, seed=seed, batch_blocks=batch_blocks))
+
+            round_trips &= b"".join(ntru_decrypt_stream(pubkey, prvkey, encrypted)) == data \
+                and b"".join(ntru_decrypt_stream(pubkey, prvkey, io.BytesIO(encrypted), batch_blocks=1)) == data \
+                and b"".join(ntru_encrypt_stream(pubkey, io.BytesIO(data), seed=seed,
+                                                 batch_blocks=batch_blocks)) == encrypted
+
+            blocks = -(-length // block_size)
+            frames &= len(encrypted) == stream._HEADER.size + blocks * frame_size
+
+            padded = data + bytes(blocks * block_size - length)
+            body = encrypted[stream._HEADER.size:]
+            for j in range(min(blocks, 3)):
+                frame = np.frombuffer(body[j * frame_size + stream._FRAME.size:(j + 1) * frame_size],
+                                      dtype=stream._coefficient_dtype(q))
+                message = stream._encode(padded[j * block_size:(j + 1) * block_size], N, p, unit, digits)[0]
+                frames &= _as_list(ntru_decryption(pubkey, prvkey, frame.tolist()), N) == message.tolist()
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, name) for name in ("plain", "encrypted", "decrypted")]
+            data = rng.bytes(5 * block_size + 3)
+            with open(paths[0], "wb") as f:
+                f.write(data)
+            encryption = ntru_encrypt_file(pubkey, paths[0], paths[1], seed=seed, batch_blocks=batch_blocks)
+            decryption = ntru_decrypt_file(pubkey, prvkey, paths[1], paths[2])
+            with open(paths[2], "rb") as f:
+                files = f.read() == data and encryption["bytes_in"] == decryption["bytes_out"] == len(data) \
+                    and encryption["bytes_out"] == decryption["bytes_in"] == os.path.getsize(paths[1])
+
+        encrypted = b"".join(ntru_encrypt_stream(pubkey, data, seed=seed))
+        other_pubkey, other_prvkey = ntru_random_keys(N + 2, p, q, seed=seed)
+        rejects = True
+        for source, keypair in ((encrypted[:-1], (pubkey, prvkey)), (encrypted, (other_pubkey, other_prvkey))):
+            try:
+                b"".join(ntru_decrypt_stream(*keypair, source))
+                rejects = False
+            except ValueError:
+                pass
+        for d in (0, -1, N // 2 + 1):
+            rejects &= _rejects(lambda: b"".join(ntru_encrypt_stream(pubkey, data, d=d, seed=seed)))
+
+        result = int(round_trips and frames and files and rejects)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"N = {N}, p = {p}, q = {q}: {block_size} bytes per block, {frame_size} bytes per frame")
+            print()
+
+        results.append({
+            "parameters": (N, p, q),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_serialization(parameters, batch=5, seed=0, verbose=False):
+    """
+        Performs batch testing of the binary format for NTRU keys and ciphertexts.
+
+        For every parameter set (N, p, q) this function serializes a seeded key pair and a batch
+        of ciphertexts and verifies that:
+          1. Public and private keys round-trip to keys with the same fingerprints and
+             polynomials, and a dense private key ``[Poly f, Fp]`` gives the same bytes as the sparse one.
+          2. The packed sizes are ``ceil(N * bits / 8)`` bytes per polynomial after the header.
+          3. Ciphertext batches (and a single scalar ciphertext) round-trip in memory and
+             through `write_ciphertexts` / `read_ciphertexts`, and the loaded keys decrypt them.
+          4. Byte-aligned coefficients (q = 2^8k) are loaded as read-only views without a copy.
+          5. Objects of the wrong kind, truncated data and non-ternary private keys are rejected.
+
+        :param parameters: List of (N, p, q) parameter sets.
+        :type parameters: list[tuple[int, int, int]]
+
+        :param batch: Number of ciphertexts per parameter set.
+        :type batch: int
+
+        :param seed: Seed of the keys and of the random polynomials.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the sizes in bytes and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(parameters)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, p, q) in enumerate(parameters):
+        pubkey, prvkey = ntru_random_keys(N, p, q, seed=seed + i)
+        dense_prvkey = [Poly([int(c) for c in prvkey.f.coefficients()[::-1]], x), prvkey.Fp]
+        header = serialization._HEADER.size
+        q_bits, p_bits = (q - 1).bit_length(), (p - 1).bit_length()
+
+        public_bytes = public_key_to_bytes(pubkey)
+        private_bytes = private_key_to_bytes(pubkey, prvkey)
+        public, private = public_key_from_bytes(public_bytes), private_key_from_bytes(private_bytes)
+
+        keys_round_trip = public.fingerprint == pubkey.fingerprint and public.h == pubkey.h \
+            and private.fingerprint == prvkey.fingerprint and private.Fp == prvkey.Fp \
+            and np.array_equal(private.f.coefficients(), prvkey.f.coefficients()) \
+            and private_key_to_bytes(pubkey, dense_prvkey) == private_bytes
+        sizes = len(public_bytes) == header + -(-N * q_bits // 8) \
+            and len(private_bytes) == header + -(-N // 5) + -(-N * p_bits // 8)
+
+        phis, messages = rng.integers(-1, 2, size=(2, batch, N))
+        ciphertexts = ntru_encryption_many(pubkey, phis, messages)
+        ciphertext_bytes = ciphertexts_to_bytes(pubkey, ciphertexts)
+        (N_, p_, q_), loaded = ciphertexts_from_bytes(ciphertext_bytes)
+
+        scalar = ntru_encryption(pubkey, Poly(phis[0].tolist(), x), Poly(messages[0].tolist(), x))
+        _, single = ciphertexts_from_bytes(ciphertexts_to_bytes([N, p, q, pubkey.h], scalar))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ciphertexts.ntru")
+            written = write_ciphertexts(path, pubkey, ciphertexts)
+            (_, _, _), from_file = read_ciphertexts(path)
+            from_file = np.array(from_file)
+
+        ciphertexts_round_trip = (N_, p_, q_) == (N, p, q) and np.array_equal(loaded, ciphertexts) \
+            and np.array_equal(single[0], ciphertexts[0]) and written == len(ciphertext_bytes) \
+            and np.array_equal(from_file, ciphertexts) \
+            and np.array_equal(ntru_decryption_many(public, private, loaded), messages) \
+            and len(ciphertext_bytes) == header + -(-batch * N * q_bits // 8)
+
+        zero_copy = q_bits % 8 != 0 or (not loaded.flags.writeable and loaded.base is not None)
+
+        non_ternary = [Poly([2] + [int(c) for c in prvkey.f.coefficients()[-2::-1]], x), prvkey.Fp]
+        rejects = _rejects(public_key_from_bytes, private_bytes) \
+            and _rejects(private_key_from_bytes, public_bytes) \
+            and _rejects(ciphertexts_from_bytes, ciphertext_bytes[:-1]) \
+            and _rejects(public_key_from_bytes, b"NTRU") \
+            and _rejects(private_key_to_bytes, pubkey, non_ternary)
+
+        result = int(keys_round_trip and sizes and ciphertexts_round_trip and zero_copy and rejects)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"N = {N}, p = {p}, q = {q}: public key {len(public_bytes)} B, private key {len(private_bytes)} B, "
+                  f"{batch} ciphertexts {len(ciphertext_bytes)} B")
+            print()
+
+        results.append({
+            "sizes": (len(public_bytes), len(private_bytes), len(ciphertext_bytes)),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_ntru_attack(parameters, seed=0, verbose=False):
+    """
+        Performs batch testing of the lattice key-recovery attack on NTRU.
+
+        For every parameter set (N, p, q) (small N, so that LLL suffices) this function generates a
+        seeded key pair and verifies that:
+          1. The rows of `ntru_lattice_basis` are ``(x^i, x^i * h / p)`` and ``(0, q x^i)``, and the
+             private pair ``(f, g)`` is a lattice vector.
+          2. `ntru_attack` succeeds, and the recovered pair satisfies ``f * h = p * g`` modulo q.
+          3. The recovered private key decrypts fresh messages encrypted with the scalar `ntru_encryption`.
+          4. `ntru_attack_sweep` breaks a key for the same N.
+
+        :param parameters: List of (N, p, q) parameter sets.
+        :type parameters: list[tuple[int, int, int]]
+
+        :param seed: Seed of the keys and of the messages.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the recovered f and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(parameters)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, p, q) in enumerate(parameters):
+        pubkey, prvkey = ntru_random_keys(N, p, q, seed=seed + i)
+        basis = ntru_lattice_basis(pubkey)
+
+        h = [c * pow(p, -1, q) % q for c in pubkey.h_coeffs.tolist()]
+        unit = np.eye(N, dtype=np.int64)
+        rows = [list(unit[j]) + _schoolbook(unit[j], h, N, q) for j in range(N)] \
+            + [[0] * N + list(q * unit[j]) for j in range(N)]
+        f_low = prvkey.f.coefficients().tolist()
+        g_low = [c - q if c > q // 2 else c for c in _schoolbook(f_low, h, N, q)]
+        structure = basis.tolist() == rows and is_lattice_vector(basis, f_low + g_low)
+
+        attack = ntru_attack(pubkey, seed=seed)
+        recovered = attack["success"] and attack["dimension"] == 2 * N
+        if recovered:
+            f, g = attack["f"].tolist(), attack["g"].tolist()
+            recovered = _schoolbook(f, pubkey.h_coeffs, N, q) == [p * c % q for c in g]
+
+            messages = rng.integers(-1, 2, size=(4, N))
+            for m in messages:
+                ciphertext = ntru_encryption(pubkey, Poly(rng.integers(-1, 2, size=N).tolist(), x), Poly(m.tolist(), x))
+                recovered &= _as_list(ntru_decryption(pubkey, attack["private_key"], ciphertext), N) == m.tolist()
+
+        sweep = ntru_attack_sweep([N], p, q, seed=seed, workers=1)[0]
+        swept = sweep["successes"] == sweep["trials"] == 1
+
+        result = int(structure and recovered and swept)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"N = {N}, p = {p}, q = {q}: key recovered: {attack['success']}, "
+                  f"candidate rows tried: {attack['candidates']}")
+            print()
+
+        results.append({
+            "f": None if attack["f"] is None else attack["f"].tolist(),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def _decryption_failures(N, p, q, trials, seed):
+    """
+        Counts the failed decryptions of random messages, each under a fresh key pair and blinding
+        polynomial, with the scalar `ntru_encryption` and `ntru_decryption`.
+    """
+    rng = np.random.default_rng(seed)
+    d = N // 3
+
+    failures = 0
+    for pubkey, prvkey in ntru_random_keys_many(trials, N, p, q, seed=seed, workers=1):
+        phi = np.zeros(N, dtype=np.int64)
+        phi[rng.choice(N, size=2 * d, replace=False)] = [1] * d + [-1] * d
+        m = rng.integers(0, p, size=N) - p // 2
+
+        ciphertext = ntru_encryption(pubkey, Poly(phi.tolist(), x), Poly(m.tolist(), x))
+        failures += _as_list(ntru_decryption(pubkey, prvkey, ciphertext), N) != m.tolist()
+
+    return failures
+
+
+def tests_ntru_failure(parameters, samples=20000, trials=400, seed=0, verbose=False):
+    """
+        Performs batch testing of the Monte Carlo estimate of the NTRU decryption failure rate.
+
+        For every parameter set (N, p, q) this function estimates the failure rate and verifies that:
+          1. A seeded estimate is reproducible and does not depend on the number of workers.
+          2. The streamed partial estimates grow by one batch at a time and end with the full estimate.
+          3. The coefficient distribution covers ``samples * N`` coefficients and the interval
+             contains the observed probability.
+          4. The rate of real decryption failures (scalar encryption and decryption under fresh
+             keys) is compatible with the estimate: its 99.9% Wilson interval overlaps the
+             99.9% interval of the estimate.
+
+        :param parameters: List of (N, p, q) parameter sets with noticeable failure rates.
+        :type parameters: list[tuple[int, int, int]]
+
+        :param samples: Number of samples of the estimator.
+        :type samples: int
+
+        :param trials: Number of real encryptions and decryptions.
+        :type trials: int
+
+        :param seed: Seed of the estimator and of the real decryptions.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with both failure rates and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(parameters)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, p, q) in enumerate(parameters):
+        batch_size = samples // 8
+        estimate = ntru_failure_estimate(N, p, q, samples=samples, batch_size=batch_size, seed=seed + i,
+                                         workers=1, confidence=0.999)
+        parallel = ntru_failure_estimate(N, p, q, samples=samples, batch_size=batch_size, seed=seed + i,
+                                         workers=2, confidence=0.999)
+        partial = list(ntru_failure_estimate(N, p, q, samples=samples, batch_size=batch_size, seed=seed + i,
+                                             workers=1, confidence=0.999, stream=True))
+
+        reproducible = estimate == parallel == partial[-1]
+        streamed = [e["samples"] for e in partial] == [batch_size * (j + 1) for j in range(8)]
+
+        low, high = estimate["interval"]
+        consistent = sum(estimate["coefficient_counts"].values()) == samples * N \
+            and sum(estimate["max_counts"].values()) == samples and low <= estimate["probability"] <= high
+
+        failures = _decryption_failures(N, p, q, trials, seed + i)
+        empirical_low, empirical_high = _wilson_interval(failures, trials, 0.999)
+        agrees = empirical_low <= high and low <= empirical_high
+
+        result = int(reproducible and streamed and consistent and agrees)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"N = {N}, p = {p}, q = {q}: estimated {estimate['probability']:.4f} "
+                  f"[{low:.4f}, {high:.4f}], observed {failures}/{trials} = {failures / trials:.4f}")
+            print()
+
+        results.append({
+            "estimate": estimate["probability"],
+            "observed": failures / trials,
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
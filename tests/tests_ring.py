@@ -0,0 +1,265 @@
+from lattice_methods.ntru import (_poly_mult_schoolbook, ntru_encryption, pad_left, poly_inv_mod_ring,
+                                  poly_mult_mod_ring, x)
+from lattice_methods.ring import (ProductForm, SparseTernary, ring_inverse, ring_multiply, ring_multiply_many,
+                                  ring_spectrum)
+from sympy import GF, Poly, factorint, gcd, invert, isprime
+import numpy as np
+
+
+def _schoolbook(a, b, N, q=None):
+    """
+        Product in Z[x]/(x^N - 1) (or Z_q[x]/(x^N - 1)) with one multiplication per pair of
+        coefficients. Coefficients are lowest degree first.
+    """
+    result = [0] * N
+    for i, u in enumerate(a):
+        for j, v in enumerate(b):
+            result[(i + j) % N] += int(u) * int(v)
+    return [c % q for c in result] if q is not None else result
+
+
+def _random_polynomial(rng, N, bits):
+    bound = 2 ** bits
+    return [int.from_bytes(rng.bytes(bits // 8 + 2), "little") % (2 * bound + 1) - bound for _ in range(N)]
+
+
+def _random_ternary(rng, N, weight):
+    coefficients = np.zeros(N, dtype=np.int64)
+    coefficients[rng.choice(N, size=weight, replace=False)] = rng.choice([-1, 1], size=weight)
+    return coefficients
+
+
+def _is_invertible(f, N, q):
+    """
+        Reference invertibility check with SymPy: f is a unit modulo q exactly if it is coprime
+        to x^N - 1 modulo every prime dividing q.
+    """
+    for p in factorint(q):
+        modulus = Poly(x ** N - 1, x, domain=GF(p))
+        if gcd(Poly([int(c) for c in f[::-1]], x, domain=GF(p)), modulus).degree() != 0:
+            return False
+    return True
+
+
+def tests_ring_multiply(cases, seed=0, verbose=False):
+    """
+        Performs batch testing of the multiplication in Z_q[x]/(x^N - 1).
+
+        For every case (N, q, bits) this function draws random polynomials with coefficients of
+        the given bit-size and compares every engine with the schoolbook product:
+          1. `ring_multiply` (direct, FFT or big-integer engine, chosen by size).
+          2. `ring_multiply_many` for a stack of polynomials, with and without a precomputed spectrum.
+          3. `poly_mult_mod_ring` against the scalar `_poly_mult_schoolbook` (highest degree first).
+
+        :param cases: List of (N, q, bits) triples; q may be None to multiply over the integers.
+        :type cases: list[tuple[int, int or None, int]]
+
+        :param seed: Seed of the random polynomials.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the case and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(cases)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, q, bits) in enumerate(cases):
+        a, b = _random_polynomial(rng, N, bits), _random_polynomial(rng, N, bits)
+        stack = [_random_polynomial(rng, N, bits) for _ in range(3)]
+
+        expected = _schoolbook(a, b, N, q)
+        single = [int(c) for c in ring_multiply(a, b, N, q)] == expected
+
+        rows = [_schoolbook(row, b, N, q) for row in stack]
+        operand = np.array(stack, dtype=object if bits >= 62 else np.int64)
+        many = ring_multiply_many(operand, b, N, q).tolist() == rows
+        if bits < 62:
+            many &= ring_multiply_many(operand, b, N, q, spectrum=ring_spectrum(b, N)).tolist() == rows
+
+        modulus = q if q is not None else 2 ** 128
+        ntru = poly_mult_mod_ring(a[::-1], b[::-1], N, modulus) == _poly_mult_schoolbook(a[::-1], b[::-1], N, modulus)
+
+        result = int(single and many and ntru)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"N = {N}, q = {q}, coefficient bits: {bits}")
+            print()
+
+        results.append({
+            "case": (N, q, bits),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_sparse_ternary(cases, q=2048, seed=0, verbose=False):
+    """
+        Performs batch testing of the sparse ternary and product-form polynomials.
+
+        For every case (N, weight) this function draws random sparse ternary polynomials and a
+        dense polynomial modulo q, and verifies that:
+          1. `SparseTernary` round-trips its dense coefficients.
+          2. `SparseTernary.multiply` equals the schoolbook product, over Z and modulo q,
+             for one dense polynomial and for a stack of them.
+          3. `ProductForm` (f1 * f2 + f3) has the coefficients and products of its dense expansion.
+          4. NTRU encryption with a sparse blinding polynomial equals encryption with the dense one.
+
+        :param cases: List of (N, weight) pairs; weights above 64 use the dense fallback.
+        :type cases: list[tuple[int, int]]
+
+        :param q: Modulus of the dense polynomials.
+        :type q: int
+
+        :param seed: Seed of the random polynomials.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the case and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(cases)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, weight) in enumerate(cases):
+        f1, f2, f3 = (_random_ternary(rng, N, weight) for _ in range(3))
+        sparse = SparseTernary.from_coefficients(f1)
+        dense = rng.integers(0, q, size=N)
+        stack = rng.integers(0, q, size=(2, 3, N))
+
+        coefficients = np.array_equal(sparse.coefficients(), f1) and sparse.weight == weight
+        products = [int(c) for c in sparse.multiply(dense)] == _schoolbook(f1, dense, N) \
+            and [int(c) for c in sparse.multiply(dense, q)] == _schoolbook(f1, dense, N, q) \
+            and sparse.multiply(stack, q).tolist() == [[_schoolbook(f1, row, N, q) for row in rows] for rows in stack]
+
+        product_form = ProductForm(sparse, SparseTernary.from_coefficients(f2), SparseTernary.from_coefficients(f3))
+        expansion = [u + v for u, v in zip(_schoolbook(f1, f2, N), f3)]
+        products &= [int(c) for c in product_form.coefficients()] == expansion \
+            and [int(c) for c in product_form.multiply(dense, q)] == _schoolbook(expansion, dense, N, q)
+
+        h = [int(c) for c in rng.integers(0, q, size=N)]
+        m = Poly([int(c) for c in _random_ternary(rng, N, N // 3)], x)
+        pubkey = [N, 3, q, h[::-1]]
+        encryption = pad_left(ntru_encryption(pubkey, sparse, m), N) == \
+            pad_left(ntru_encryption(pubkey, Poly([int(c) for c in f1[::-1]], x), m), N)
+
+        result = int(coefficients and products and encryption)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"N = {N}, nonzero coefficients: {weight}, product form: {product_form.coefficients()[:8].tolist()}...")
+            print()
+
+        results.append({
+            "case": (N, weight),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_ring_inverse(cases, seed=0, verbose=False):
+    """
+        Performs batch testing of the inversion in Z_q[x]/(x^N - 1).
+
+        For every case (N, q) this function draws an NTRU-style ternary polynomial (one more +1
+        than -1, usually invertible) and a balanced one (f(1) = 0, never invertible), and verifies that:
+          1. `ring_inverse` returns None exactly when the SymPy reference says the polynomial is
+             not invertible modulo some prime dividing q.
+          2. Every returned inverse F satisfies f * F = 1 in Z_q[x]/(x^N - 1), and for prime q it
+             equals the inverse computed by SymPy over GF(q).
+          3. `poly_inv_mod_ring` returns the same inverse (highest degree first, centered).
+
+        :param cases: List of (N, q) pairs; q may be prime, a prime power or composite.
+        :type cases: list[tuple[int, int]]
+
+        :param seed: Seed of the random polynomials.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the case, whether the
+                 NTRU-style polynomial was invertible and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(cases)
+    tests_passed = 0
+
+    results = []
+
+    for i, (N, q) in enumerate(cases):
+        d = N // 3
+        f = _random_ternary(rng, N, 2 * d + 1)
+        f[f != 0] = rng.permutation([1] * (d + 1) + [-1] * d)
+        balanced = _random_ternary(rng, N, 2 * d)
+        balanced[balanced != 0] = rng.permutation([1] * d + [-1] * d)
+
+        result = True
+        invertible = None
+        for polynomial in (f, balanced):
+            inverse = ring_inverse(polynomial, N, q)
+            expected = _is_invertible(polynomial, N, q)
+            result &= (inverse is not None) == expected
+
+            ntru_inverse = poly_inv_mod_ring([int(c) for c in polynomial[::-1]], N, q)
+            if inverse is None:
+                result &= ntru_inverse is None
+            else:
+                inverse = [int(c) for c in inverse]
+                result &= _schoolbook(polynomial, inverse, N, q) == [1] + [0] * (N - 1)
+                result &= [c % q for c in pad_left(ntru_inverse, N)[::-1]] == inverse
+
+                if isprime(q):
+                    modulus = Poly(x ** N - 1, x, domain=GF(q))
+                    reference = invert(Poly([int(c) for c in polynomial[::-1]], x, domain=GF(q)), modulus)
+                    result &= [int(c) % q for c in pad_left(reference.all_coeffs(), N)[::-1]] == inverse
+
+            if invertible is None:
+                invertible = expected
+
+        result = int(result)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"N = {N}, q = {q}, NTRU-style polynomial invertible: {invertible}")
+            print()
+
+        results.append({
+            "case": (N, q),
+            "invertible": invertible,
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
@@ -0,0 +1,63 @@
+from lattice_methods.lll import lll_reduce
+from lattice_methods.sieve import gauss_sieve
+from lattice_methods.solver import shortest_vector
+from .utils import is_lattice_vector
+import numpy as np
+
+def tests_sieve(basis_list, seed=0, verbose=False):
+    """
+        Performs batch testing of the Gauss sieve.
+
+        For every basis this function runs `gauss_sieve` with a fixed seed and verifies that
+        the result is a nonzero lattice vector as short as the one found by exact
+        enumeration (`shortest_vector`). A run with ``max_collisions=0`` must stop
+        immediately and return the first vector of the reduced basis.
+
+        :param basis_list: List of lattice bases to test. Each basis is a list of NumPy arrays or a 2-D array.
+        :type basis_list: list[list[np.ndarray]]
+
+        :param seed: Seed of the sieve.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the sieved vector and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        vector, stats = gauss_sieve(basis, seed=seed, verbose=True)
+        length = int(np.dot(vector, vector))
+
+        shortest = shortest_vector(basis)
+        shortest_length = int(np.dot(shortest, shortest))
+
+        found = length == shortest_length and is_lattice_vector(basis, vector)
+
+        first, no_sieve = gauss_sieve(basis, max_collisions=0, verbose=True)
+        stopped = no_sieve["iterations"] == 0 and np.array_equal(first, lll_reduce(np.array(basis), delta=0.99)[0])
+
+        result = int(found and stopped)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Sieved vector: {vector.tolist()} (squared length {length}, shortest {shortest_length})")
+            print(f"List size: {stats['max_list_size']}, collisions: {stats['collisions']}")
+            print()
+
+        results.append({
+            "vector": vector.tolist(),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
@@ -0,0 +1,167 @@
+from lattice_methods.lll import lll_reduce
+from lattice_methods.solver import babai_nearest_plane, closest_vector, closest_vectors, shortest_vector
+from .utils import exact_gram_schmidt, is_lattice_vector, lattice_points
+from fractions import Fraction
+import numpy as np
+
+# CVP instances that broke earlier versions of the solver: targets whose Babai
+# coordinates end on a rounding tie (the refinement flipped between two vectors forever)
+# and a target with entries around 2^70 (int64 overflow when combining the coefficients).
+CVP_REGRESSION_CASES = [
+    ([[17, 31, -48, 31, -3, 2], [13, -22, 48, -45, -22, -12], [7, -9, -37, -46, -50, -46],
+      [-35, 50, -31, 15, 25, -27], [-22, -7, -24, 48, -33, 40], [30, 35, -39, -11, 13, -1]],
+     [-527, -914, 959, 60, -23, -46]),
+    ([[-6, 4, 2, -16, 45, -13], [16, -13, -5, 49, -32, 13], [-7, 18, 26, -17, 17, 18],
+      [-5, -38, 12, -45, 39, 35], [35, -50, 48, 48, 9, 33], [27, 29, -35, -46, -24, -30]],
+     [-651, 833, -649, 738, -431, 296]),
+    ([[17, 31, -48, 31, -3, 2], [13, -22, 48, -45, -22, -12], [7, -9, -37, -46, -50, -46],
+      [-35, 50, -31, 15, 25, -27], [-22, -7, -24, 48, -33, 40], [30, 35, -39, -11, 13, -1]],
+     [2 ** 70 + 3, -2 ** 70, 5, 2 ** 69, 7, -1]),
+]
+
+
+def _squared_distance(u, v):
+    return sum((int(a) - int(b)) ** 2 for a, b in zip(u, v))
+
+
+def _nearest_plane_reference(basis, target):
+    """
+        Babai's nearest-plane algorithm in exact rational arithmetic. Returns the vector and
+        whether a coordinate ended exactly on a rounding tie (where either choice is valid).
+    """
+    rows = [[int(c) for c in v] for v in basis]
+    ortho, _, B = exact_gram_schmidt(rows)
+
+    remainder = [Fraction(int(c)) for c in target]
+    tie = False
+    for i in range(len(rows) - 1, -1, -1):
+        coordinate = sum(a * b for a, b in zip(remainder, ortho[i])) / B[i]
+        tie |= coordinate.denominator == 2
+        r = round(coordinate)
+        remainder = [a - r * b for a, b in zip(remainder, rows[i])]
+
+    return [int(t - a) for t, a in zip(target, remainder)], tie
+
+
+def tests_cvp(cases, verbose=False):
+    """
+        Performs batch testing of the closest vector solvers.
+
+        For every (basis, target) pair this function computes the Babai vector, the exact
+        closest vector and the closest vector of the batch solver, and verifies that:
+          1. All results are lattice vectors.
+          2. The batch solver agrees with the Babai vector of the single-target function,
+             which is the vector of the nearest-plane algorithm in exact arithmetic on the
+             reduced basis (unless a coordinate ends on a rounding tie or the target is
+             beyond the float64 precision).
+          3. The refined Babai vector (``refine=True``) is at least as close as the Babai vector.
+          4. The closest vector is at least as close as the refined Babai vector and as every
+             lattice vector whose coefficients (with respect to the reduced basis) differ
+             from the Babai vector's by at most 2.
+
+        :param cases: List of (basis, target) pairs; the bases should be small (up to dimension 6).
+        :type cases: list[tuple[list[np.ndarray], np.ndarray]]
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the closest vector and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(cases)
+    tests_passed = 0
+
+    results = []
+
+    for i, (basis, target) in enumerate(cases):
+        babai = babai_nearest_plane(basis, target)
+        refined = closest_vectors(basis, [target], refine=True)[0]
+        closest = closest_vector(basis, target)
+        batch = closest_vectors(basis, [target])[0]
+
+        members = all(is_lattice_vector(basis, v) for v in (babai, refined, closest))
+        agrees = [int(c) for c in batch] == [int(c) for c in babai]
+
+        reduced = lll_reduce(basis, delta=0.99)
+        reference, tie = _nearest_plane_reference(reduced, target)
+        if not tie and max(abs(int(c)) for c in target) < 2 ** 40:
+            agrees &= [int(c) for c in babai] == reference
+
+        candidates = lattice_points(reduced).astype(object) + babai.astype(object)
+        best = min(_squared_distance(v, target) for v in candidates)
+        distance = _squared_distance(closest, target)
+        refinement = _squared_distance(refined, target) <= _squared_distance(babai, target)
+        optimal = distance <= min(best, _squared_distance(refined, target))
+
+        result = int(members and agrees and refinement and optimal)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Target:         {list(target)}")
+            print(f"Babai vector:   {babai.tolist()}")
+            print(f"Refined Babai:  {refined.tolist()}")
+            print(f"Closest vector: {closest.tolist()} (squared distance {distance})")
+            print()
+
+        results.append({
+            "vector": closest.tolist(),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_svp(basis_list, verbose=False):
+    """
+        Performs batch testing of the shortest vector solver.
+
+        For every basis this function verifies that the vector returned by `shortest_vector`
+        is a nonzero lattice vector which is no longer than the shortest reduced basis
+        vector and than every nonzero lattice vector with coefficients (with respect to
+        the reduced basis) in [-2, 2].
+
+        :param basis_list: List of lattice bases to test (small dimension, up to 6).
+        :type basis_list: list[list[np.ndarray]]
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the shortest vector and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        shortest = shortest_vector(basis)
+        length = int(np.dot(shortest, shortest))
+
+        points = lattice_points(lll_reduce(basis, delta=0.99))
+        lengths = np.einsum("ij,ij->i", points, points)
+        best = int(lengths[lengths > 0].min())
+
+        result = int(length > 0 and is_lattice_vector(basis, shortest) and length <= best)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Shortest vector: {shortest.tolist()} (squared length {length})")
+            print()
+
+        results.append({
+            "vector": shortest.tolist(),
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
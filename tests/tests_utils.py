@@ -0,0 +1,168 @@
+from lattice_methods.utils import are_bases_equivalent, gram_schmidt
+from sympy import Matrix
+from .utils import exact_gram_schmidt
+import numpy as np
+
+
+def _unimodular(rng, n, steps=30):
+    """
+        Returns a random integer matrix with determinant ±1 as a product of elementary row operations.
+    """
+    U = np.eye(n, dtype=object)
+    for _ in range(steps):
+        i, j = rng.choice(n, size=2, replace=False)
+        U[i] += int(rng.integers(-3, 4)) * U[j]
+        if rng.random() < 0.2:
+            U[[i, j]] = U[[j, i]]
+    return U
+
+
+def _generate_same_lattice(basis1, basis2):
+    """
+        Reference equivalence check: ``basis2 = T basis1`` with an integer matrix T of determinant ±1.
+    """
+    A = Matrix([[int(c) for c in v] for v in basis1])
+    C = Matrix([[int(c) for c in v] for v in basis2])
+    if A.det() == 0 or C.det() == 0:
+        return False
+
+    T = C * A.inv()
+    return all(t.is_integer for t in T) and abs(T.det()) == 1
+
+
+def tests_gram_schmidt(basis_list, verbose=False):
+    """
+        Performs batch testing of the Gram-Schmidt orthogonalization.
+
+        For every basis this function compares `gram_schmidt` with the classical one-projection-at-a-time
+        process in exact arithmetic and verifies that:
+          1. The exact mode returns exactly the same vectors, coefficients and squared norms
+             (the norms only with ``return_norms=True``; by default the result is ``(ortho, mu)``
+             with the vectors as a list for a list input).
+          2. The floating-point mode agrees with them up to rounding.
+          3. The exact orthogonalized vectors are pairwise orthogonal.
+          4. A stack of bases (the basis and its rows reversed) gives the same results as the
+             single bases in both modes.
+
+        :param basis_list: List of square integer bases to test. Each basis is a list of NumPy arrays or a 2-D array.
+        :type basis_list: list[list[np.ndarray]]
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the squared norms and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        rows = np.array(basis, dtype=object)
+        n = len(rows)
+        ortho_ref, mu_ref, B_ref = exact_gram_schmidt(rows)
+
+        ortho, mu, B = gram_schmidt(rows, exact=True, return_norms=True)
+        exact = ortho.tolist() == ortho_ref and mu.tolist() == mu_ref and list(B) == B_ref
+        pair = gram_schmidt(list(rows), exact=True)
+        exact &= len(pair) == 2 and [v.tolist() for v in pair[0]] == ortho_ref and pair[1].tolist() == mu_ref
+        orthogonal = all(np.dot(ortho[j], ortho[k]) == 0 for j in range(n) for k in range(j))
+
+        ortho_f, mu_f, B_f = gram_schmidt(rows, return_norms=True)
+        scale = max(float(b) for b in B_ref)
+        close = np.allclose(B_f, np.array(B_ref, dtype=float), rtol=1e-9, atol=1e-9 * scale) \
+            and np.allclose(mu_f, np.array(mu_ref, dtype=float), rtol=1e-7, atol=1e-7) \
+            and np.allclose(ortho_f, np.array(ortho_ref, dtype=float), rtol=1e-7, atol=1e-7 * scale ** 0.5)
+
+        stack = np.stack([rows, rows[::-1]])
+        stacked = True
+        for mode in (False, True):
+            batch = gram_schmidt(stack, exact=mode, return_norms=True)
+            for index in range(2):
+                single = gram_schmidt(stack[index], exact=mode, return_norms=True)
+                for got, expected in zip(batch, single):
+                    stacked &= (np.array_equal(got[index], expected) if mode else
+                                np.allclose(np.array(got[index], dtype=float), np.array(expected, dtype=float)))
+
+        result = int(exact and orthogonal and close and stacked)
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Dimension: {n}, squared GSO norms: {[float(b) for b in B_ref][:4]}...")
+            print()
+
+        results.append({
+            "B": [str(b) for b in B_ref],
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
+
+
+def tests_bases_equivalence(basis_list, seed=0, verbose=False):
+    """
+        Performs batch testing of the lattice equivalence check.
+
+        For every basis this function builds three other bases and compares the answer of
+        `are_bases_equivalent` with an exact reference check (``basis2 = T basis1`` with an
+        integer T of determinant ±1, in SymPy rational arithmetic):
+          1. The basis transformed by a random unimodular matrix (equivalent).
+          2. The basis with one vector doubled (a sublattice of index 2).
+          3. The basis with one entry changed by 1 (usually a different lattice).
+
+        :param basis_list: List of square integer bases to test. Each basis is a list of NumPy arrays or a 2-D array.
+        :type basis_list: list[list[np.ndarray]]
+
+        :param seed: Seed of the random unimodular transformations.
+        :type seed: int
+
+        :param verbose: Whether to print step-by-step output for each test.
+        :type verbose: bool
+
+        :return: List of results per test. Each result is a dict with the three answers and pass/fail flag.
+        :rtype: list[dict[str, Any]]
+    """
+    rng = np.random.default_rng(seed)
+
+    tests_amount = len(basis_list)
+    tests_passed = 0
+
+    results = []
+
+    for i, basis in enumerate(basis_list):
+        rows = np.array(basis, dtype=object)
+        n = len(rows)
+
+        transformed = _unimodular(rng, n) @ rows
+        sublattice = rows.copy()
+        sublattice[int(rng.integers(n))] *= 2
+        perturbed = rows.copy()
+        perturbed[int(rng.integers(n)), int(rng.integers(n))] += 1
+
+        answers = [are_bases_equivalent(basis, other) for other in (transformed, sublattice, perturbed)]
+        expected = [_generate_same_lattice(rows, other) for other in (transformed, sublattice, perturbed)]
+
+        result = int(answers == expected and answers[:2] == [True, False])
+        if result:
+            tests_passed += 1
+
+        if verbose:
+            print(f"{'✅' if result else '❌'} Test {i + 1}: {'PASSED' if result else 'FAILED'}")
+            print(f"Dimension: {n}, equivalent / sublattice / perturbed: {answers}")
+            print()
+
+        results.append({
+            "answers": answers,
+            "result": result
+        })
+
+    if verbose:
+        print(f"\n📊 {tests_passed}/{tests_amount} tests passed.")
+
+    return results
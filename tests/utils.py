@@ -1,4 +1,8 @@
+from fractions import Fraction
+from itertools import product
+
 import numpy as np
+from sympy import Matrix
 
 
 def generate_random_bases(n=10, dim=2, min_abs=10, max_val=50):
@@ -16,4 +20,99 @@ def generate_random_bases(n=10, dim=2, min_abs=10, max_val=50):
         if np.linalg.matrix_rank(matrix) == dim:
             bases.append(tuple(basis))
 
-    return bases
\ No newline at end of file
+    return bases
+
+
+def is_lattice_vector(basis, vector):
+    """
+        Checks exactly whether a vector is an integer combination of the basis vectors.
+
+        :param basis: Linearly independent basis vectors.
+        :type basis: list[np.ndarray] or np.ndarray
+        :param vector: The vector to check.
+        :type vector: np.ndarray
+
+        :return: True if the vector lies in the lattice.
+        :rtype: bool
+    """
+    rows = Matrix([[int(c) for c in v] for v in basis])
+    target = Matrix([int(c) for c in vector])
+
+    try:
+        solution, params = rows.T.gauss_jordan_solve(target)
+    except ValueError:
+        return False
+
+    return not params and all(c.is_integer for c in solution)
+
+
+def lattice_points(basis, radius=2):
+    """
+        Enumerates the lattice vectors with all coefficients in [-radius, radius].
+
+        :param basis: Basis vectors (small dimension; there are (2 * radius + 1)^n points).
+        :type basis: list[np.ndarray] or np.ndarray
+        :param radius: Largest absolute value of a coefficient.
+        :type radius: int
+
+        :return: The lattice vectors, one per row, including the zero vector.
+        :rtype: np.ndarray
+    """
+    rows = np.array(basis, dtype=np.int64)
+    coefficients = np.array(list(product(range(-radius, radius + 1), repeat=len(rows))), dtype=np.int64)
+    return coefficients @ rows
+
+
+def exact_gram_schmidt(basis):
+    """
+        Textbook Gram-Schmidt process with one projection at a time, in exact rational arithmetic.
+
+        :param basis: Basis vectors with integer entries.
+        :type basis: list[np.ndarray] or np.ndarray
+
+        :return: A tuple (ortho, mu, B) of lists of :class:`fractions.Fraction` values: the
+                 orthogonalized vectors, the coefficients (zero on and above the diagonal)
+                 and the squared norms of the orthogonalized vectors.
+        :rtype: tuple[list[list[Fraction]], list[list[Fraction]], list[Fraction]]
+    """
+    rows = [[Fraction(int(c)) for c in v] for v in basis]
+    n = len(rows)
+
+    ortho = []
+    mu = [[Fraction(0)] * n for _ in range(n)]
+    B = []
+
+    for i in range(n):
+        vector = list(rows[i])
+        for j in range(i):
+            mu[i][j] = sum(a * b for a, b in zip(rows[i], ortho[j])) / B[j]
+            vector = [a - mu[i][j] * b for a, b in zip(vector, ortho[j])]
+        ortho.append(vector)
+        B.append(sum(a * a for a in vector))
+
+    return ortho, mu, B
+
+
+def is_lll_reduced(basis, delta=0.75, eta=0.5):
+    """
+        Checks exactly whether a basis is size-reduced and satisfies the Lovász condition.
+
+        :param basis: Basis vectors with integer entries.
+        :type basis: list[np.ndarray] or np.ndarray
+        :param delta: Lovász parameter.
+        :type delta: float
+        :param eta: Size-reduction parameter.
+        :type eta: float
+
+        :return: True if ``|mu_ij| <= eta`` for all j < i and
+                 ``B_k >= (delta - mu_k,k-1^2) * B_k-1`` for all k.
+        :rtype: bool
+    """
+    _, mu, B = exact_gram_schmidt(basis)
+    n = len(B)
+    delta = Fraction(delta)
+    eta = Fraction(eta)
+
+    size_reduced = all(abs(mu[i][j]) <= eta for i in range(n) for j in range(i))
+    lovasz = all(B[k] >= (delta - mu[k][k - 1] ** 2) * B[k - 1] for k in range(1, n))
+    return size_reduced and lovasz